@@ -0,0 +1,269 @@
+"""
+Benchmark de la boucle de lecture série (SerialReaderThread.run) contre le port simulé.
+
+Mesure le nombre de cycles par seconde, les percentiles des allers-retours par commande,
+le temps passé dans reset_input_buffer et dans les lectures expirées, et la latence entre
+un changement de DI côté appareil et l'appel à update_DI sur le widget.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/poll_loop.py --duration 10 --mode both --output bench.json
+
+Sans --output, le résultat JSON est le seul contenu de la sortie standard : les messages du Logger
+et des threads du banc sont renvoyés sur la sortie d'erreur.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+from PyQt5.QtCore import Qt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sources"))
+
+from internal.config import Config
+from internal.constant import Cmd
+from internal.rs485 import RS485
+from internal.serial_reader import SerialReader, SerialReaderThread
+from internal.simulator import SimulatedDevice, SimulatedSerial
+from internal.widget_refresher import WidgetRefresher
+from internal.translator import Translator
+
+
+def percentiles(values):
+    """
+    Renvoie les percentiles usuels d'une liste de durées, en millisecondes.
+    """
+    if not values:
+        return {}
+    values = sorted(values)
+    result = {}
+    for name, q in [("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)]:
+        result[name] = round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3)
+    result["count"] = len(values)
+    return result
+
+
+class InstrumentedSerial:
+    """
+    Enveloppe d'un port série qui mesure le temps passé dans reset_input_buffer et dans les lectures expirées.
+    """
+    def __init__(self, ser):
+        self.ser = ser
+        self.reset_time = 0.0
+        self.timeout_time = 0.0
+        self.timeouts = 0
+
+    def __getattr__(self, name):
+        return getattr(self.ser, name)
+
+    def __setattr__(self, name, value):
+        if name in ("timeout", "baudrate"): # délais par commande et négociation du débit
+            setattr(self.ser, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    def reset_input_buffer(self):
+        start = time.perf_counter()
+        self.ser.reset_input_buffer()
+        self.reset_time += time.perf_counter() - start
+
+    def read(self, size=1):
+        start = time.perf_counter()
+        data = self.ser.read(size)
+        if len(data) < size:
+            self.timeouts += 1
+            self.timeout_time += time.perf_counter() - start
+        return data
+
+    def read_until(self, expected=b"\n", size=None):
+        start = time.perf_counter()
+        data = self.ser.read_until(expected, size)
+        if not data.endswith(expected):
+            self.timeouts += 1
+            self.timeout_time += time.perf_counter() - start
+        return data
+
+
+class ProbeWidget:
+    """
+    Widget factice qui enregistre l'instant de chaque mise à jour reçue de la boucle de lecture.
+    """
+    def __init__(self, key, bench):
+        self.key = key
+        self.bench = bench
+        self.last_position = None
+
+    def update_DI(self, *values):
+        if self.key == "wafer_lift1":
+            position = bool(values[0])
+            if position != self.last_position:
+                self.last_position = position
+                self.bench.on_DI_change(position)
+
+    def __getattr__(self, name):
+        # update_AI, update_sensors, update_interlock, update_sensor, update_position, update_pressure
+        return lambda *args, **kwargs: None
+
+
+class Harness:
+    """
+    Environnement minimal attendu par SerialReader, RS485 et SerialReaderThread.
+    """
+    def __init__(self, args):
+        self.config = Config(self)
+        self.config.value["telemetry"] = {"enabled": False} # pas de fichier de télémétrie pendant le benchmark
+        self.config.value.setdefault("serial", {})["framed"] = args.framed
+        self.config.value["serial"]["window"] = args.window
+        self.config.value["serial"]["timeout"] = args.timeout
+        if args.no_command_timeouts:
+            self.config.value["serial"]["timeouts"] = {}
+        self.translator = Translator(self.config)
+        self.translator.load_translations()
+        self.custom_widgets = {}
+        self.serial_reader = SerialReader(self, port=SimulatedSerial.port_name)
+        self.RS485 = RS485(self)
+
+        addresses = {key: self.config[key]["address"] for key in ["chamber_pressure", "pump_pressure"]}
+        self.device = SimulatedDevice(addresses)
+        self.ser = InstrumentedSerial(SimulatedSerial(baudrate=args.baudrate, timeout=args.timeout, latency=args.latency, jitter=args.jitter, drop_rate=args.drop_rate, device=self.device, seed=args.seed))
+        if args.negotiate:
+            self.serial_reader.negotiate_baudrate(self.ser)
+        self.serial_reader.ser = self.ser
+
+        self.command_times = {}
+        execute = self.serial_reader.execute
+        def timed_execute(command):
+            start = time.perf_counter()
+            result = execute(command)
+            self.command_times.setdefault(str(command.type), []).append(time.perf_counter() - start)
+            return result
+        self.serial_reader.execute = timed_execute
+
+        self.cycles = 0
+        self.DI_changed_at = None
+        self.DI_latencies = []
+        self.DI_event = threading.Event()
+        for key in ["wafer_lift1", "wafer_lift2", "wafer_lift3", "slit_valve", "roughing_pump", "turbo_pump_rga", "turbo_pump_ch",
+                    "turbo_pump_gate", "interlock", "MFC1", "MFC2", "baratron1", "baratron2", "generator1", "generator2",
+                    "chamber_pressure", "pump_pressure", "throttle_valve"]:
+            self.custom_widgets[key] = ProbeWidget(key, self)
+
+    def show_error_message(self, message):
+        print(message, file=sys.stderr)
+
+    def update_AI(self):
+        pass
+
+    def on_snapshot(self, snapshot):
+        self.cycles += 1
+
+    def on_DI_change(self, position):
+        if self.DI_changed_at is not None:
+            self.DI_latencies.append(time.perf_counter() - self.DI_changed_at)
+            self.DI_changed_at = None
+            self.DI_event.set()
+
+    def toggle_DI(self):
+        """
+        Bascule instantanément le capteur de la wafer lift 1 côté appareil.
+        """
+        with self.device.lock:
+            self.device.step()
+            state = 0 if self.device.travel.get(Cmd.wafer_lift1.DO, 0.0) >= 1.0 else 1
+            self.device.outputs[Cmd.wafer_lift1.DO] = state
+            self.device.travel[Cmd.wafer_lift1.DO] = float(state)
+            self.DI_event.clear()
+            self.DI_changed_at = time.perf_counter()
+
+
+def run(args, batched):
+    """
+    Exécute un scénario et renvoie ses résultats.
+
+    Args:
+        args: Arguments de la ligne de commande.
+        batched (bool): True pour la lecture groupée, False pour la lecture commande par commande.
+    """
+    harness = Harness(args)
+    thread = SerialReaderThread(harness)
+    thread.startup_delay = 0
+    thread.poll_interval = args.poll_interval
+    thread.batched_poll_interval = args.poll_interval
+    thread.batched_read = None if batched else False
+    thread.connection = harness.serial_reader.connections # le mode choisi n'est pas remis à zéro par check_connection
+    # pas de boucle d'événements Qt : les instantanés sont appliqués directement dans le thread de lecture
+    refresher = WidgetRefresher(harness)
+    thread.snapshot_ready.connect(harness.on_snapshot, Qt.DirectConnection)
+    thread.snapshot_ready.connect(refresher.apply_snapshot, Qt.DirectConnection)
+    worker = threading.Thread(target=thread.run, daemon=True)
+
+    start = time.perf_counter()
+    worker.start()
+    rng = random.Random(args.seed)
+    while time.perf_counter() - start < args.duration:
+        time.sleep(rng.uniform(0.05, 0.2))
+        harness.toggle_DI()
+        harness.DI_event.wait(1.0)
+    thread.stop()
+    worker.join(5)
+    elapsed = time.perf_counter() - start
+    harness.serial_reader.scheduler.stop()
+
+    return {
+        "mode": "batched" if thread.batched_read else "per_command",
+        "duration_s": round(elapsed, 3),
+        "cycles": harness.cycles,
+        "cycles_per_s": round(harness.cycles / elapsed, 2),
+        "round_trip_ms": {command: percentiles(times) for command, times in sorted(harness.command_times.items(), key=lambda item: int(item[0]))},
+        "reset_input_buffer_s": round(harness.ser.reset_time, 4),
+        "timeouts": harness.ser.timeouts,
+        "timeout_s": round(harness.ser.timeout_time, 4),
+        "DI_to_update_DI_ms": percentiles(harness.DI_latencies),
+        "baudrate": harness.ser.baudrate,
+        "framed": harness.serial_reader.framed,
+        "crc_errors": harness.serial_reader.frame_decoder.crc_errors,
+        "skipped_bytes": harness.serial_reader.frame_decoder.skipped,
+        "late_frames": harness.serial_reader.late_frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la boucle de lecture série contre le port simulé.")
+    parser.add_argument("--duration", type=float, default=10, help="durée de chaque scénario en secondes")
+    parser.add_argument("--mode", choices=["batched", "per_command", "both"], default="both")
+    parser.add_argument("--poll-interval", type=int, default=0, help="pause entre deux cycles en ms")
+    parser.add_argument("--latency", type=float, default=0.002, help="latence de l'appareil en secondes")
+    parser.add_argument("--jitter", type=float, default=0.001, help="gigue de l'appareil en secondes")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probabilité de perte de chaque octet de réponse")
+    parser.add_argument("--timeout", type=float, default=0.3, help="timeout de lecture du port en secondes")
+    parser.add_argument("--no-command-timeouts", action="store_true", help="ignore les délais par commande de la configuration")
+    parser.add_argument("--baudrate", type=int, default=115200, help="débit à l'ouverture du port")
+    parser.add_argument("--negotiate", action="store_true", help="négocie le débit le plus rapide (Cmd.Baud)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--framed", action="store_true", help="utilise le protocole tramé (Cmd.Frame)")
+    parser.add_argument("--window", type=int, default=4, help="requêtes tramées en vol au plus (1 : sans pipeline)")
+    parser.add_argument("--output", help="fichier JSON de sortie (sortie standard par défaut)")
+    args = parser.parse_args()
+
+    # Logger affiche aussi ses messages avec print : la sortie standard est réservée au résultat
+    output = sys.stdout
+    sys.stdout = sys.stderr
+
+    modes = [True, False] if args.mode == "both" else [args.mode == "batched"]
+    results = {
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "runs": [run(args, batched) for batched in modes],
+    }
+    text = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text, file=output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark de Translator.translate : coût par appel pour les cas rencontrés lors d'un rafraîchissement de l'écran,
+comparé à l'implémentation sans modèles compilés ni cache (legacy_translate).
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/translator.py --calls 100000 --output translator.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sources"))
+
+from internal.translator import Translator
+
+
+def legacy_translate(translator, key, **kwargs):
+    """
+    Traduction telle qu'elle était faite avant la compilation des modèles : deux recherches avec exception
+    et str.format à chaque appel, traduction récursive des arguments.
+    """
+    if not isinstance(key, str):
+        key = str(key)
+    for k, v in kwargs.items():
+        kwargs[k] = legacy_translate(translator, v)
+    try:
+        translation = translator.translations[translator.current_language][key]
+    except KeyError:
+        translation = translator.translations["en"].get(key, key)
+    try:
+        return translation.format(**kwargs)
+    except:
+        return key
+
+
+# (nom, clé, fonction qui renvoie les arguments du i-ème appel)
+SCENARIOS = [
+    ("static_key", "open", lambda i: {}),
+    ("same_arguments", "di_up", lambda i: {"state": "true"}),
+    ("two_states", "position", lambda i: {"state": "up" if i % 2 else "down"}),
+    ("new_value_each_call", "actual", lambda i: {"value": i, "unit": "sccm"}),
+    ("missing_key", "not_a_key", lambda i: {}),
+]
+
+
+def measure(function, key, arguments, calls):
+    """
+    Renvoie le coût moyen d'un appel en microsecondes.
+    """
+    start = time.perf_counter()
+    for i in range(calls):
+        function(key, **arguments(i))
+    return round((time.perf_counter() - start) / calls * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de Translator.translate.")
+    parser.add_argument("--calls", type=int, default=100000, help="nombre d'appels par scénario")
+    parser.add_argument("--lang", default="fr")
+    parser.add_argument("--output", help="fichier JSON de sortie (sortie standard par défaut)")
+    args = parser.parse_args()
+
+    translator = Translator({"gui": {"lang": args.lang}})
+    translator.load_translations()
+
+    results = {"parameters": vars(args), "per_call_us": {}}
+    for name, key, arguments in SCENARIOS:
+        results["per_call_us"][name] = {
+            "legacy": measure(lambda key, **kwargs: legacy_translate(translator, key, **kwargs), key, arguments, args.calls),
+            "translate": measure(translator.translate, key, arguments, args.calls),
+        }
+    text = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
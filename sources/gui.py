@@ -7,6 +7,8 @@ import os
 
 from internal.translator import Translator
 from internal.serial_reader import *
+from internal.di_watcher import DIWatcher
+from internal.widget_refresher import WidgetRefresher
 from internal.custom_widget import CustomWidget
 
 from scene.auto import Auto
@@ -71,8 +73,13 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self.resize_widgets)
 
         self.thread = SerialReaderThread(self)  # type: ignore
+        self.widget_refresher = WidgetRefresher(self)
+        self.thread.snapshot_ready.connect(self.widget_refresher.push)
         self.thread.start()
 
+        self.DI_watcher = DIWatcher(self)
+        self.DI_watcher.start()
+
 
 
     def show_error_message(self, message):
@@ -273,9 +280,11 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.close_all_windows()
+        self.thread.telemetry.close()
         super().closeEvent(event)
 
     def close_all_windows(self):
+        self.menu_manager.trend_window.close()
         for _, custom_widget in self.custom_widgets.items():
             try:
                 custom_widget.window.close()
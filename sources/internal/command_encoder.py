@@ -0,0 +1,138 @@
+"""
+Ce module encode les commandes du protocole historique, tramées ou non (voir Cmd.Frame), dans un buffer alloué
+une seule fois : chaque commande est envoyée en une seule écriture sur le port.
+"""
+import struct
+
+from internal.constant import Cmd
+from internal.serial_frame import CRC_SIZE, HEADER_SIZE, frame_crc
+
+
+def encode_bytes(buffer, offset, data, other_data):
+    """
+    Encode l'octet de donnée suivi des octets de other_data (bytes, ou liste d'entiers de 0 à 255).
+
+    Args:
+        buffer (bytearray): Buffer d'envoi.
+        offset (int): Position de la donnée dans le buffer.
+        data (int): Donnée principale.
+        other_data: Autres données.
+
+    Returns:
+        int: Position qui suit la commande.
+    """
+    buffer[offset] = data
+    end = offset + 1 + len(other_data)
+    buffer[offset + 1:end] = other_data
+    return end
+
+
+def encode_float(buffer, offset, data, other_data):
+    """
+    Encode une consigne analogique en float32 little-endian.
+    """
+    struct.pack_into('<f', buffer, offset, data)
+    return offset + 4
+
+
+def encode_text(buffer, offset, data, other_data):
+    """
+    Encode l'adresse RS485 suivie de la commande ASCII.
+    """
+    buffer[offset] = data
+    text = other_data.encode()
+    end = offset + 1 + len(text)
+    buffer[offset + 1:end] = text
+    return end
+
+
+# type de commande -> encodeur de la donnée et des autres données ; encode_bytes pour les autres types
+ENCODERS = {
+    Cmd.MFC1: encode_float,
+    Cmd.MFC2: encode_float,
+    Cmd.Generator1.AO: encode_float,
+    Cmd.Generator2.AO: encode_float,
+    8: encode_text,
+}
+
+
+class CommandEncoder:
+    """
+    Cette classe encode les commandes dans un buffer alloué une seule fois. Le résultat est une vue sur ce buffer,
+    valable jusqu'à l'encodage suivant : une instance ne doit être utilisée que par un seul thread.
+
+    Methods:
+        __init__(self):
+            Constructeur de la classe CommandEncoder.
+
+        encode(self, type, data, other_data=()):
+            Encode une commande non tramée.
+
+        encode_frame(self, sequence, type, data, other_data=()):
+            Encode une commande dans une trame.
+
+        set_sequence(self, sequence):
+            Change le numéro de séquence de la dernière trame encodée.
+    """
+    def __init__(self):
+        """
+        Constructeur de la classe CommandEncoder.
+        """
+        self.buffer = bytearray(HEADER_SIZE + Cmd.Frame.max_payload + CRC_SIZE)
+        self.view = memoryview(self.buffer)
+        self.frame_end = 0
+
+    def encode_payload(self, offset, type, data, other_data):
+        """
+        Encode une commande à partir de offset et renvoie la position qui la suit.
+        """
+        self.buffer[offset] = type
+        return ENCODERS.get(type, encode_bytes)(self.buffer, offset + 1, data, other_data)
+
+    def encode(self, type, data, other_data=()):
+        """
+        Encode une commande non tramée.
+
+        Args:
+            type (int): Type de la commande.
+            data: Donnée principale.
+            other_data: Autres données.
+
+        Returns:
+            memoryview: Commande encodée.
+        """
+        return self.view[:self.encode_payload(0, type, data, other_data)]
+
+    def encode_frame(self, sequence, type, data, other_data=()):
+        """
+        Encode une commande dans une trame.
+
+        Args:
+            sequence (int): Numéro de séquence.
+            type (int): Type de la commande.
+            data: Donnée principale.
+            other_data: Autres données.
+
+        Returns:
+            memoryview: Trame encodée.
+        """
+        end = self.encode_payload(HEADER_SIZE, type, data, other_data)
+        length = end - HEADER_SIZE
+        if length > Cmd.Frame.max_payload:
+            raise ValueError(f"Frame payload too long ({length} bytes)")
+        self.buffer[0] = Cmd.Frame.start
+        self.buffer[1] = length
+        self.frame_end = end + CRC_SIZE
+        self.set_sequence(sequence)
+        return self.view[:self.frame_end]
+
+    def set_sequence(self, sequence):
+        """
+        Change le numéro de séquence de la dernière trame encodée et recalcule son CRC.
+
+        Args:
+            sequence (int): Numéro de séquence.
+        """
+        end = self.frame_end - CRC_SIZE
+        self.buffer[2] = sequence & 0xFF
+        struct.pack_into(Cmd.Frame.crc, self.buffer, end, frame_crc(self.view[1:end]))
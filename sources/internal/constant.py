@@ -71,6 +71,14 @@ class Cmd:
         Up = 4  # Ouvert
         Down = 8  # Fermé
 
+    class TurboPumpStatus:
+        """
+        Constantes liées aux entrées d'état des pompes turbo (bit à 1 : pompe pas encore à vitesse).
+        """
+        Port = MCP2_B
+        RGA = 64
+        CH = 32
+
     class Interlock:
         """
         Constantes liées à l'Interlock.
@@ -111,7 +119,78 @@ class Cmd:
         tension3 = 6
         tension4 = 7
 
+    class Frame:
+        """
+        Constantes liées au protocole tramé, qui encapsule les commandes et les réponses existantes.
+
+        Une trame contient : l'octet de début, la longueur du contenu (1 octet), le numéro de séquence (1 octet),
+        le contenu, puis le CRC-16/CCITT (0xFFFF initial, uint16 little-endian) de la longueur, de la séquence et du contenu.
+        Le contenu d'une requête est une commande du protocole historique ; la réponse reprend le numéro de séquence
+        de la requête et contient la réponse historique. Les commandes sans réponse ne reçoivent pas de trame.
+        Le firmware accepte toujours les commandes non tramées (elles ne commencent jamais par l'octet de début).
+        """
+        start = 0xA5
+        header = '<BBB'
+        crc = '<H'
+        max_payload = 255
+
+    class ReadAll:
+        """
+        Constantes liées à la lecture groupée de toutes les entrées (DI, AI et throttle valve) en une seule trame.
+
+        La trame renvoyée est préfixée par sa longueur (1 octet) puis contient, en little-endian :
+        les 4 octets de DI, les 8 entrées analogiques en float32, l'octet des capteurs de la throttle valve
+        et la position de la throttle valve en int16.
+        """
+        cmd = 10
+        format = '<4s8fBh'
+        length = 39
+
+    class DIEdges:
+        """
+        Constantes liées au journal des fronts de DI horodatés par le firmware.
+
+        La requête [11, port] arme la surveillance du port (1 à 4, comme la commande 1) et vide son journal.
+        La trame renvoyée est préfixée par sa longueur (1 octet) puis contient, en little-endian :
+        l'horloge du firmware en µs (uint32), la valeur actuelle du port, le nombre de fronts,
+        puis pour chaque front son instant en µs (uint32) et la nouvelle valeur du port.
+        """
+        cmd = 11
+        header = '<IBB'
+        edge = '<IB'
+        max_edges = 32
+
+
+    class AIFrame:
+        """
+        Constantes liées à la trame binaire des entrées analogiques, qui remplace les lignes de texte des commandes 6 et 7.
 
+        La requête [12, banc] lit le banc 0 (les 8 entrées), 1 (entrées de la commande 6) ou 2 (entrées de la commande 7).
+        La trame renvoyée est préfixée par sa longueur (1 octet) puis contient, en little-endian :
+        le type des valeurs (int16 en mV ou float32 en V), le nombre de valeurs, les valeurs,
+        puis la somme de contrôle (uint16, somme des octets qui la précèdent dans la trame).
+        """
+        cmd = 12
+        header = '<BB'
+        checksum = '<H'
+        int16 = 0
+        float32 = 1
+        dtypes = {int16: ('<i2', 0.001), float32: ('<f4', 1.0)} # type -> (dtype NumPy, facteur vers des volts)
+        banks = {0: slice(0, 8), 1: slice(0, 4), 2: slice(4, 8)}
+
+    class Baud:
+        """
+        Constantes liées à la négociation du débit du port série.
+
+        La requête [13, index] propose le débit rates[index]. Le firmware répond [index] au débit actuel s'il l'accepte
+        (rejected sinon), puis passe au nouveau débit. L'hôte confirme en renvoyant [13, index] au nouveau débit ;
+        le firmware répond à nouveau [index]. Sans confirmation après confirm_timeout secondes, le firmware revient
+        au débit précédent.
+        """
+        cmd = 13
+        rates = (115200, 230400, 250000, 500000, 1000000, 2000000)
+        rejected = 0xFF
+        confirm_timeout = 0.5
 
 class PiraniConfig:
     """
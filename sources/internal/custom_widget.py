@@ -21,6 +21,15 @@ class CustomWidget(QGraphicsWidget):
         update_label(self, key, **kwargs):
             Met à jour une étiquette avec la clé donnée.
 
+        get_spin_box(self, key):
+            Renvoie la boîte à filer créée avec la clé donnée.
+
+        format_text(self, key, kwargs):
+            Traduit et formate le texte d'un élément.
+
+        set_text(self, element, key, kwargs):
+            Affiche le texte formaté d'un élément s'il a changé.
+
         create_label_with_spin_box(self, key, initial_value=0, min_value=0, max_value=1000, color="black", unit="", function=None, **kwargs):
             Crée une étiquette avec une boîte à filer et l'ajoute au widget.
 
@@ -53,6 +62,12 @@ class CustomWidget(QGraphicsWidget):
 
         set_pos_size(self, width, height):
             Définit la position et la taille du widget.
+
+    Attributes:
+        labels, buttons, spin_boxes, unit_labels, indicators, combo_boxes: Listes des éléments dans l'ordre de création.
+        label_index, button_index, spin_box_index, indicator_index: Dictionnaires clé -> élément, pour les mises à jour
+            sans parcourir les listes (premier élément créé avec cette clé).
+        texts: Dernier texte affiché par chaque étiquette ou bouton, pour ne pas le reformater si rien n'a changé.
     """
     def __init__(self, translator, pos: tuple[float,float], ratio: tuple[float,float], color: str, font_size=8):
         """
@@ -73,6 +88,11 @@ class CustomWidget(QGraphicsWidget):
         self.unit_labels = []
         self.indicators = []  # Create a new list for indicators
         self.combo_boxes = []
+        self.label_index = {}
+        self.button_index = {}
+        self.spin_box_index = {}
+        self.indicator_index = {}
+        self.texts = {}
         self.color = color
         self.font_size = font_size
 
@@ -118,7 +138,7 @@ class CustomWidget(QGraphicsWidget):
         label.setFont(font)
     
         self.layout.addItem(label_proxy)
-        self.labels.append((label, label_proxy, key, kwargs))
+        self.add_label((label, label_proxy, key, kwargs))
 
 
 
@@ -130,17 +150,74 @@ class CustomWidget(QGraphicsWidget):
             key (str) : Clé de traduction pour l'étiquette.
             **kwargs : Arguments supplémentaires pour la traduction.
         """
-        # Loop over all labels
-        for label, label_proxy, label_key, label_kwargs in self.labels:
-            # If the key matches
-            if label_key == key:
-                # Update the state in kwargs
-                for arg_name in kwargs:
-                    label_kwargs[arg_name] = kwargs[arg_name]
-                # Translate the new text and update the label
-                label.setText(self.translator.translate(label_key, **label_kwargs))
-                # We found the label, so we can break the loop
-                break
+        record = self.label_index.get(key)
+        if record is None:
+            return
+        label, _, _, label_kwargs = record
+        if all(arg_name in label_kwargs and label_kwargs[arg_name] == value for arg_name, value in kwargs.items()):
+            return  # rien n'a changé depuis le dernier affichage
+        label_kwargs.update(kwargs)
+        self.set_text(label, key, label_kwargs)
+
+    def add_label(self, record):
+        """
+        Enregistre une étiquette dans la liste et l'index des étiquettes.
+
+        Args:
+            record (tuple) : (QLabel, proxy, clé, kwargs de traduction).
+        """
+        self.labels.append(record)
+        self.label_index.setdefault(record[2], record)
+
+    def add_button(self, record):
+        """
+        Enregistre un bouton dans la liste et l'index des boutons.
+
+        Args:
+            record (tuple) : (QPushButton, proxy, clé, kwargs de traduction).
+        """
+        self.buttons.append(record)
+        self.button_index.setdefault(record[2], record)
+
+    def get_spin_box(self, key):
+        """
+        Renvoie la boîte à filer créée avec la clé donnée.
+
+        Args:
+            key (str) : Clé de traduction de l'étiquette de la boîte à filer.
+
+        Returns:
+            QSpinBox: La boîte à filer, ou None si aucune n'a cette clé.
+        """
+        record = self.spin_box_index.get(key)
+        return None if record is None else record[0]
+
+    def format_text(self, key, kwargs):
+        """
+        Traduit et formate le texte d'un élément (Translator compile les traductions et mémorise les résultats).
+
+        Args:
+            key (str) : Clé de traduction.
+            kwargs (dict) : Arguments de formatage, traduits à leur tour.
+
+        Returns:
+            str: Le texte formaté, ou la clé si le formatage échoue (comme Translator.translate).
+        """
+        return self.translator.translate(key, **kwargs)
+
+    def set_text(self, element, key, kwargs):
+        """
+        Affiche le texte formaté d'une étiquette ou d'un bouton, seulement s'il est différent du texte actuel.
+
+        Args:
+            element : QLabel ou QPushButton.
+            key (str) : Clé de traduction.
+            kwargs (dict) : Arguments de formatage.
+        """
+        text = self.format_text(key, kwargs)
+        if self.texts.get(element) != text:
+            self.texts[element] = text
+            element.setText(text)
 
     def create_label_with_spin_box(self, key, initial_value=0, min_value = 0,max_value=1000 , color="black", unit="", function=None, **kwargs):
         """
@@ -215,8 +292,9 @@ class CustomWidget(QGraphicsWidget):
 
         self.layout.addItem(widget_proxy)
 
-        self.labels.append((label, widget_proxy, key, kwargs))  # Append the key for later language changes
+        self.add_label((label, widget_proxy, key, kwargs))  # Append the key for later language changes
         self.spin_boxes.append((spin_box, key, max_value, kwargs))  # Append the initial value and kwargs for later language changes
+        self.spin_box_index.setdefault(key, self.spin_boxes[-1])
         self.unit_labels.append((unit_label, unit, kwargs))  # Append the unit and kwargs for later language changes
 
 
@@ -228,15 +306,13 @@ class CustomWidget(QGraphicsWidget):
             key (str) : Clé de traduction pour la boîte à filer.
             max_value (int) : Nouvelle valeur maximale.
         """
-        # Loop over all spin boxes
-        for spin_box, spin_box_key, _, spin_box_kwargs in self.spin_boxes:
-            # If the key matches
-            if spin_box_key == key:
-                # Update the state in kwargs
-                spin_box_kwargs['max_value'] = max_value
-                # Translate the new text and update the spin box
-                spin_box.setRange(0, max_value)
-                break
+        record = self.spin_box_index.get(key)
+        if record is None:
+            return
+        spin_box, _, _, spin_box_kwargs = record
+        if spin_box_kwargs.get('max_value') != max_value:
+            spin_box_kwargs['max_value'] = max_value
+            spin_box.setRange(0, max_value)
             
 
 
@@ -264,7 +340,7 @@ class CustomWidget(QGraphicsWidget):
         button.setContentsMargins(1, 1, 1, 1)
         button.setStyleSheet("QPushButton { padding-top: 2px; }")
         self.layout.addItem(button_proxy)
-        self.buttons.append((button, button_proxy, key, kwargs))  # Append the key for later language changes
+        self.add_button((button, button_proxy, key, kwargs))  # Append the key for later language changes
 
 
     def update_button(self, key, state):
@@ -275,16 +351,14 @@ class CustomWidget(QGraphicsWidget):
             key (str) : Clé de traduction pour le bouton.
             state (str) : Nouvel état à afficher sur le bouton
         """
-        # Loop over all buttons
-        for button, button_proxy, button_key, kwargs in self.buttons:
-            # If the key matches
-            if button_key == key:
-                # Update the state in kwargs
-                kwargs['state'] = state
-                # Translate the new text and update the button
-                button.setText(self.translator.translate(button_key, **kwargs))
-                # We found the button, so we can break the loop
-                break
+        record = self.button_index.get(key)
+        if record is None:
+            return
+        button, _, _, kwargs = record
+        if 'state' in kwargs and kwargs['state'] == state:
+            return
+        kwargs['state'] = state
+        self.set_text(button, key, kwargs)
 
 
 
@@ -358,8 +432,9 @@ class CustomWidget(QGraphicsWidget):
         self.layout.addItem(widget_proxy)
 
         # Store the indicator QLabel for later updates
-        self.labels.append((label, widget_proxy, key, kwargs))
-        self.indicators.append((indicator, key, False))  # Add the indicator to the new list
+        self.add_label((label, widget_proxy, key, kwargs))
+        self.indicators.append([indicator, key, False])  # [indicateur, clé, état affiché]
+        self.indicator_index.setdefault(key, self.indicators[-1])
 
 
     def update_indicator(self, indicator, key, state):
@@ -371,22 +446,27 @@ class CustomWidget(QGraphicsWidget):
             key (str) : Clé de traduction lié à l'indicateur.
             state (bool) : Nouvel état de l'indicateur.
         """
-        for indicator, indicator_key, _ in self.indicators:
-            if indicator_key == key:
-                pixmap = QPixmap(indicator.size())
-                pixmap.fill(Qt.transparent)
+        record = self.indicator_index.get(key)
+        if record is None:
+            return
+        indicator = record[0]
+        state = bool(state)
+        if record[2] == state and indicator.pixmap() is not None and indicator.pixmap().size() == indicator.size():
+            return  # déjà dessiné dans cet état et à cette taille
+        record[2] = state
+        pixmap = QPixmap(indicator.size())
+        pixmap.fill(Qt.transparent)
 
-                painter = QPainter(pixmap)
-                painter.setRenderHint(QPainter.Antialiasing)
-                color = QColor("red") if state else QColor("green")
-                painter.setBrush(QBrush(color))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        color = QColor("red") if state else QColor("green")
+        painter.setBrush(QBrush(color))
 
-                painter.drawEllipse(pixmap.rect())
+        painter.drawEllipse(pixmap.rect())
 
-                painter.end()
+        painter.end()
 
-                indicator.setPixmap(pixmap)
-                break
+        indicator.setPixmap(pixmap)
 
     def create_label_with_combo_box_and_button(self, key, combo_items=[], button_function=None, button_key="", color="black", **kwargs):
         """
@@ -454,9 +534,9 @@ class CustomWidget(QGraphicsWidget):
 
         self.layout.addItem(widget_proxy)
 
-        self.labels.append((label, widget_proxy, key, kwargs))  # Append the key for later language changes
+        self.add_label((label, widget_proxy, key, kwargs))  # Append the key for later language changes
         self.combo_boxes.append((combo_box, key, kwargs))  # Append the initial value and kwargs for later language changes
-        self.buttons.append((button, widget_proxy, button_key, kwargs))  # Append the key for later language changes
+        self.add_button((button, widget_proxy, button_key, kwargs))  # Append the key for later language changes
         widget_proxy.setZValue(1)
 
 
@@ -479,9 +559,9 @@ class CustomWidget(QGraphicsWidget):
         Change la langue du widget pour toutes les éléments traduisibles.
         """
         for label, _ , key, kwargs in self.labels:
-            label.setText(self.translator.translate(key,**kwargs))
+            self.set_text(label, key, kwargs)
         for button, _ , key, kwargs in self.buttons:
-            button.setText(self.translator.translate(key,**kwargs))
+            self.set_text(button, key, kwargs)
         for unit_label, unit, kwargs in self.unit_labels:
             unit_label.setText(self.translator.translate(unit,**kwargs))  # Update the text of the unit QLabel
 
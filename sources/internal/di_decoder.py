@@ -0,0 +1,110 @@
+from internal.constant import Cmd
+
+
+def up_down(component):
+    """
+    Renvoie les bits des capteurs haut et bas d'un composant de Cmd (attributs Port, Up et Down).
+    """
+    return [(component.Port, component.Up), (component.Port, component.Down)]
+
+
+# widget, méthode, bits (port, masque) passés en arguments, True pour passer les bits dans une seule liste
+DI_BINDINGS = [
+    ("wafer_lift2", "update_DI", up_down(Cmd.wafer_lift2), False),
+    ("wafer_lift3", "update_DI", up_down(Cmd.wafer_lift3), False),
+    ("slit_valve", "update_DI", up_down(Cmd.slit_valve), False),
+    ("wafer_lift1", "update_DI", up_down(Cmd.wafer_lift1), False),
+    ("roughing_pump", "update_DI", [(Cmd.Interlock.Port, Cmd.Interlock.RoughingPumpOff)], False),
+    ("turbo_pump_rga", "update_DI", [(Cmd.TurboPumpStatus.Port, Cmd.TurboPumpStatus.RGA)], False),
+    ("turbo_pump_ch", "update_DI", [(Cmd.TurboPumpStatus.Port, Cmd.TurboPumpStatus.CH)], False),
+    ("turbo_pump_gate", "update_sensors", up_down(Cmd.RGAGate), False),
+    ("interlock", "update_interlock", [(Cmd.Interlock.Port, Cmd.Interlock.RoughingPumpOff),
+                                       (Cmd.Interlock.Port, Cmd.Interlock.PumpPressureHigh),
+                                       (Cmd.Interlock.Port, Cmd.Interlock.ChamberOpen),
+                                       (Cmd.Interlock.Port, Cmd.Interlock.ChamberPressureHigh)], True),
+]
+
+
+class DIDecoder:
+    """
+    Cette classe décode les trames de DI à l'aide d'une table construite une fois à partir de DI_BINDINGS.
+
+    Chaque trame est comparée à la précédente octet par octet (XOR) : seules les liaisons dont au moins un bit
+    a changé sont renvoyées. Le coût d'une trame dépend du nombre de bits modifiés, pas du nombre de voies.
+
+    Attributes:
+        bindings: Liste des liaisons (widget, méthode, bits, liste).
+        previous: Dernière trame décodée, ou None.
+
+    Methods:
+        __init__(self, bindings=DI_BINDINGS):
+            Constructeur de la classe DIDecoder.
+
+        decode(self, data):
+            Renvoie les liaisons dont un bit a changé depuis la trame précédente, avec leurs arguments.
+
+        reset(self):
+            Oublie la trame précédente : la trame suivante renvoie toutes les liaisons.
+    """
+    def __init__(self, bindings=DI_BINDINGS):
+        """
+        Constructeur de la classe DIDecoder.
+
+        Args:
+            bindings (list): (clé du widget, nom de la méthode, [(port, masque), ...], True pour passer une liste).
+                Le port 1 correspond au premier octet de la trame.
+        """
+        self.bindings = bindings
+        self.previous = None
+        size = max(port for _, _, bits, _ in bindings for port, _ in bits)
+
+        # bits[octet][bit] -> liaisons qui lisent ce bit
+        bit_users = [[set() for _ in range(8)] for _ in range(size)]
+        for index, (_, _, bits, _) in enumerate(bindings):
+            for port, mask in bits:
+                for bit in range(8):
+                    if mask & (1 << bit):
+                        bit_users[port - 1][bit].add(index)
+
+        # table[octet][bits modifiés] -> liaisons concernées, pour les 256 valeurs possibles du XOR
+        self.table = []
+        for users in bit_users:
+            byte_table = [()]
+            for changed in range(1, 256):
+                byte_table.append(tuple(sorted(set().union(*(users[bit] for bit in range(8) if changed & (1 << bit))))))
+            self.table.append(byte_table)
+
+    def decode(self, data):
+        """
+        Renvoie les liaisons dont au moins un bit a changé depuis la trame précédente.
+
+        Args:
+            data (bytes): Trame de DI, un octet par port.
+
+        Returns:
+            list: (clé du widget, nom de la méthode, arguments) dans l'ordre de DI_BINDINGS.
+                Toutes les liaisons sont renvoyées pour la première trame.
+        """
+        if self.previous is None:
+            changed = range(len(self.bindings))
+        else:
+            changed = set()
+            for index, byte_table in enumerate(self.table):
+                diff = data[index] ^ self.previous[index]
+                if diff:
+                    changed.update(byte_table[diff])
+            changed = sorted(changed)
+        self.previous = bytes(data)
+
+        result = []
+        for index in changed:
+            key, method, bits, as_list = self.bindings[index]
+            values = [data[port - 1] & mask for port, mask in bits]
+            result.append((key, method, (values,) if as_list else tuple(values)))
+        return result
+
+    def reset(self):
+        """
+        Oublie la trame précédente : la trame suivante renvoie toutes les liaisons.
+        """
+        self.previous = None
@@ -0,0 +1,214 @@
+from collections import deque
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from internal.logger import Logger
+from internal.serial_scheduler import Priority
+
+
+class DIWatcher(QThread):
+    """
+    Cette classe surveille les ports de DI auxquels des fenêtres sont abonnées et émet un signal à chaque front,
+    avec l'instant du front sur l'horloge time.monotonic().
+
+    Les fronts sont horodatés par le firmware (commande Cmd.DIEdges) : la précision ne dépend pas de la fréquence
+    des requêtes, et le journal (Cmd.DIEdges.max_edges fronts) n'est lu que toutes les poll_interval ms. Si le firmware
+    ne répond à aucune des probe_attempts premières lectures du journal, le port est relu avec la commande 1 toutes les
+    fallback_interval ms et les fronts sont horodatés à la réception de la réponse. Le support du journal est à nouveau
+    testé après chaque ouverture du port. Aucune requête n'est envoyée tant qu'aucun port n'est surveillé.
+
+    Attributes:
+        edge_detected: Signal (port, valeur précédente, nouvelle valeur, instant en secondes).
+        edge_log: None tant que le support du journal des fronts par le firmware n'est pas connu.
+        values: Dernière valeur connue de chaque port surveillé.
+
+    Methods:
+        __init__(self, gui):
+            Constructeur de la classe DIWatcher.
+
+        subscribe(self, port):
+            Commence la surveillance d'un port.
+
+        unsubscribe(self, port):
+            Arrête la surveillance d'un port quand plus aucun abonné ne l'utilise.
+
+        value(self, port):
+            Renvoie la dernière valeur connue d'un port, ou None.
+
+        stop(self):
+            Demande l'arrêt du thread.
+    """
+    edge_detected = pyqtSignal(int, int, int, float)
+
+    poll_interval = 50 # ms, entre deux lectures du journal
+    fallback_interval = 25 # ms, entre deux relectures du port sans journal
+    probe_attempts = 3 # lectures du journal sans réponse avant de conclure que le firmware ne le gère pas
+    idle_interval = 50 # ms, quand aucun port n'est surveillé
+    timeout = 0.1 # s
+    clock_window = 64 # nombre de mesures gardées pour estimer le décalage entre les horloges
+
+    def __init__(self, gui):
+        """
+        Constructeur de la classe DIWatcher.
+
+        Args:
+            gui: Fenêtre principale (fournit serial_reader).
+        """
+        super().__init__()
+        self.serial_reader = gui.serial_reader
+        self.lock = threading.Lock()
+        self.subscribers = {} # port -> nombre d'abonnés
+        self.values = {}
+        self.edge_log = None
+        self.edge_log_failures = 0
+        self.connection = None # numéro de l'ouverture du port pour laquelle edge_log est valable
+        self.offsets = deque(maxlen=self.clock_window)
+        self.device_clock = None # (dernière valeur brute en µs, nombre de débordements)
+        self.running = True
+
+    def subscribe(self, port):
+        """
+        Commence la surveillance d'un port.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+        """
+        with self.lock:
+            self.subscribers[port] = self.subscribers.get(port, 0) + 1
+
+    def unsubscribe(self, port):
+        """
+        Arrête la surveillance d'un port quand plus aucun abonné ne l'utilise.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+        """
+        with self.lock:
+            count = self.subscribers.get(port, 0) - 1
+            if count > 0:
+                self.subscribers[port] = count
+            else:
+                self.subscribers.pop(port, None)
+                self.values.pop(port, None)
+
+    def value(self, port):
+        """
+        Renvoie la dernière valeur connue d'un port.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+
+        Returns:
+            int: Valeur du port, ou None si elle n'a pas encore été lue.
+        """
+        with self.lock:
+            return self.values.get(port)
+
+    def stop(self):
+        """
+        Demande l'arrêt du thread.
+        """
+        self.running = False
+
+    def run(self):
+        """
+        Boucle de surveillance des ports.
+        """
+        while self.running:
+            with self.lock:
+                ports = list(self.subscribers)
+            if not ports or self.serial_reader.ser is None:
+                self.msleep(self.idle_interval)
+                continue
+            if self.connection != self.serial_reader.connections: # port rouvert : peut-être un autre firmware
+                self.connection = self.serial_reader.connections
+                self.edge_log = None
+                self.edge_log_failures = 0
+                self.device_clock = None
+                self.offsets.clear()
+            for port in ports:
+                try:
+                    if self.edge_log is not False:
+                        self.read_edge_log(port)
+                    if self.edge_log is False:
+                        self.read_port(port)
+                except Exception as e:
+                    Logger.debug(f"DI watcher: {e}")
+            self.msleep(self.fallback_interval if self.edge_log is False else self.poll_interval)
+
+    def read_edge_log(self, port):
+        """
+        Vide le journal des fronts du firmware pour un port. Si le firmware ne répond à aucune des probe_attempts
+        premières tentatives, la relecture du port est utilisée à la place.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+        """
+        data = self.serial_reader.read_DI_edges(port, timeout=self.timeout)
+        received = time.monotonic()
+        if data is None:
+            if self.edge_log is None:
+                self.edge_log_failures += 1
+                if self.edge_log_failures >= self.probe_attempts:
+                    Logger.warning("DI edge log not supported by the firmware, falling back to polling the DI port.")
+                    self.edge_log = False
+            return
+        self.edge_log = True
+        now, value, edges = data
+        device_now = self.unwrap(now)
+        # la latence ne fait qu'ajouter du retard : le plus petit écart observé est le plus proche du vrai décalage
+        self.offsets.append(received - device_now)
+        offset = min(self.offsets)
+        for micros, new_value in edges:
+            age = ((now - micros) & 0xFFFFFFFF) / 1e6
+            self.set_value(port, new_value, device_now - age + offset)
+        self.set_value(port, value, received)
+
+    def read_port(self, port):
+        """
+        Relit un port avec la commande 1 et horodate le front à la réception de la réponse.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+        """
+        data = self.serial_reader.query(1, port, num_values=1, priority=Priority.SAFETY, timeout=self.timeout).result()
+        if data:
+            self.set_value(port, data[0], time.monotonic())
+
+    def unwrap(self, micros):
+        """
+        Convertit l'horloge 32 bits du firmware en secondes, en comptant ses débordements (toutes les 71 minutes).
+
+        Args:
+            micros (int): Horloge du firmware en µs.
+
+        Returns:
+            float: Horloge du firmware en secondes.
+        """
+        if self.device_clock is None:
+            self.device_clock = (micros, 0)
+        last, wraps = self.device_clock
+        if micros < last:
+            wraps += 1
+        self.device_clock = (micros, wraps)
+        return (wraps * 2**32 + micros) / 1e6
+
+    def set_value(self, port, value, timestamp):
+        """
+        Met à jour la valeur d'un port et émet edge_detected si elle a changé. Une lecture terminée après la
+        désinscription du port est ignorée.
+
+        Args:
+            port (int): Port de DI (1 à 4).
+            value (int): Nouvelle valeur du port.
+            timestamp (float): Instant du changement (time.monotonic).
+        """
+        with self.lock:
+            if port not in self.subscribers:
+                return
+            previous = self.values.get(port)
+            self.values[port] = value
+        if previous is not None and previous != value: # émis hors du verrou
+            self.edge_detected.emit(port, previous, value, timestamp)
@@ -0,0 +1,179 @@
+from datetime import timedelta
+import threading
+import time
+
+from serial.tools.list_ports import comports
+
+from internal.logger import Logger
+
+
+def port_identity(port):
+    """
+    Renvoie l'identité USB d'un port série.
+
+    Args:
+        port (str): Nom du port.
+
+    Returns:
+        tuple: (VID, PID, numéro de série), ou None si le port n'est pas un adaptateur USB connu.
+    """
+    for info in comports():
+        if info.device == port and info.vid is not None:
+            return info.vid, info.pid, info.serial_number
+    return None
+
+
+def format_duration(seconds):
+    """
+    Formate une durée en secondes en H:MM:SS.
+    """
+    return str(timedelta(seconds=int(seconds)))
+
+
+class LinkSupervisor:
+    """
+    Cette classe rouvre automatiquement le port série après une déconnexion (câble USB débranché, adaptateur
+    réinitialisé, ...).
+
+    Le port est recherché par son identité USB (VID, PID et numéro de série), car il peut réapparaître sous un
+    autre nom, puis rouvert avec un délai qui double à chaque échec. Une fois la liaison rétablie et le firmware
+    à nouveau à l'écoute, les dernières sorties demandées sont renvoyées (voir SerialReader.replay_outputs),
+    uniquement si c'est le même appareil qui a réapparu.
+
+    Configuration (section "serial", clés facultatives) :
+        {"reconnect": true, "reconnect_interval": 0.5, "reconnect_max_interval": 30, "replay_outputs": true}
+
+    Attributes:
+        port: Nom du dernier port ouvert.
+        identity: Identité USB du dernier port ouvert, ou None.
+        connected_since: Instant (time.monotonic) de la dernière ouverture du port, ou None si la liaison est coupée.
+        disconnects: Nombre de déconnexions depuis le lancement.
+        downtime: Durée cumulée des coupures terminées, en secondes.
+
+    Methods:
+        __init__(self, serial_reader):
+            Constructeur de la classe LinkSupervisor.
+
+        connected(self, port):
+            Enregistre l'ouverture d'un port.
+
+        link_lost(self):
+            Signale la perte du port et réveille le thread de reconnexion.
+
+        status(self):
+            Renvoie l'état de la liaison.
+
+        stop(self):
+            Arrête le thread de reconnexion.
+    """
+    def __init__(self, serial_reader):
+        """
+        Constructeur de la classe LinkSupervisor.
+
+        Args:
+            serial_reader: Objet SerialReader dont le port est surveillé.
+        """
+        self.serial_reader = serial_reader
+        self.settings = serial_reader.config.value.get("serial", {})
+        self.port = None
+        self.identity = None
+        self.connected_since = None
+        self.lost_at = None
+        self.disconnects = 0
+        self.downtime = 0.0
+        self.running = True
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="LinkSupervisor", daemon=True)
+        self.thread.start()
+
+    def connected(self, port):
+        """
+        Enregistre l'ouverture d'un port, par l'opérateur ou par la reconnexion.
+
+        Args:
+            port (str): Nom du port ouvert.
+        """
+        now = time.monotonic()
+        if self.lost_at is not None:
+            self.downtime += now - self.lost_at
+            self.lost_at = None
+        self.port = port
+        self.identity = port_identity(port)
+        self.connected_since = now
+
+    def link_lost(self):
+        """
+        Signale la perte du port et réveille le thread de reconnexion.
+        """
+        if self.connected_since is None:
+            return
+        now = time.monotonic()
+        Logger.warning(f"Serial link on {self.port} lost after {format_duration(now - self.connected_since)}.")
+        self.connected_since = None
+        self.lost_at = now
+        self.disconnects += 1
+        self.wake.set()
+
+    def status(self):
+        """
+        Renvoie l'état de la liaison.
+
+        Returns:
+            dict: "connected", "uptime" (s depuis la dernière ouverture), "disconnects" et "downtime" (s cumulées).
+        """
+        now = time.monotonic()
+        return {
+            "connected": self.connected_since is not None,
+            "uptime": now - self.connected_since if self.connected_since is not None else 0.0,
+            "disconnects": self.disconnects,
+            "downtime": self.downtime + (now - self.lost_at if self.lost_at is not None else 0.0),
+        }
+
+    def stop(self):
+        """
+        Arrête le thread de reconnexion.
+        """
+        self.running = False
+        self.wake.set()
+
+    def find_port(self):
+        """
+        Cherche le port perdu parmi les ports disponibles : d'abord par identité USB complète, puis par VID et PID
+        s'il n'y a qu'un seul candidat, et enfin par nom.
+
+        Returns:
+            tuple: (nom du port, True si c'est le même appareil), ou (None, False) si le port n'est pas revenu.
+        """
+        if self.identity is not None:
+            ports = comports()
+            for info in ports:
+                if (info.vid, info.pid, info.serial_number) == self.identity:
+                    return info.device, True
+            candidates = [info.device for info in ports if (info.vid, info.pid) == self.identity[:2]]
+            if len(candidates) == 1 and self.identity[2] is None: # adaptateur sans numéro de série
+                return candidates[0], True
+        if self.port in self.serial_reader.get_available_com_ports():
+            return self.port, self.identity is None or port_identity(self.port) == self.identity
+        return None, False
+
+    def run(self):
+        """
+        Boucle du thread de reconnexion.
+        """
+        while self.running:
+            self.wake.wait()
+            self.wake.clear()
+            interval = self.settings.get("reconnect_interval", 0.5)
+            lost_at = self.lost_at
+            while self.running and self.serial_reader.ser is None and self.lost_at is not None and self.settings.get("reconnect", True):
+                port, same_device = self.find_port()
+                if port is not None:
+                    self.serial_reader.set_com_port(port)
+                if self.serial_reader.ser is not None:
+                    Logger.info(f"Serial link restored on {port} after {format_duration(time.monotonic() - lost_at)} "
+                                f"({self.disconnects} disconnects since start).")
+                    if same_device and self.settings.get("replay_outputs", True):
+                        self.serial_reader.replay_outputs()
+                    break
+                self.wake.wait(interval) # un appel à stop interrompt l'attente
+                interval = min(interval * 2, self.settings.get("reconnect_max_interval", 30))
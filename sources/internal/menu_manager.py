@@ -4,9 +4,11 @@ from PyQt5.QtCore import QTimer
 from internal.custom_widget import CustomWidget
 
 from internal.logger import Logger
+from internal.link_supervisor import format_duration
 from window.constant_dialog import ConstantDialog
 
 from window.help_dialog import HelpDialog
+from window.trend_gui import TrendGui
 
 
 class MenuManager:
@@ -17,6 +19,7 @@ class MenuManager:
         parent: Référence à l'objet parent.
         translator: Objet de traduction.
         serial_reader: Lecteur série pour la communication avec les ports COM.
+        trend_window: Fenêtre de tendances, créée avec les menus pour enregistrer l'historique dès le démarrage.
 
     Methods:
         __init__(self, parent):
@@ -48,6 +51,9 @@ class MenuManager:
 
         open_help_dialog(self):
             Ouvre la boîte de dialogue d'aide.
+
+        open_trend_window(self):
+            Affiche la fenêtre de tendances.
     """
     def __init__(self, parent):
         """
@@ -68,12 +74,16 @@ class MenuManager:
         self.com_menu = QMenu("COM", self.parent)
         self.help_action = QAction(self.translator.translate("Help"), self.parent)
         self.help_action.triggered.connect(self.open_help_dialog)
+        self.trend_window = TrendGui(self.parent)
+        self.trend_action = QAction(self.translator.translate("trend"), self.parent)
+        self.trend_action.triggered.connect(self.open_trend_window)
         self.com_menu.aboutToShow.connect(self.update_com_menu)
         self.config_menu.addMenu(self.create_language_menu())
         self.config_menu.addMenu(self.create_font_size_menu())
         self.config_menu.addAction("Constante", self.open_constant_dialog)
         self.parent.menuBar().addMenu(self.com_menu)
         self.parent.menuBar().addMenu(self.config_menu)
+        self.parent.menuBar().addAction(self.trend_action)
         self.parent.menuBar().addAction(self.help_action)
 
 
@@ -145,6 +155,14 @@ class MenuManager:
         else:
             self.com_menu.addAction(self.translator.translate("none_available"))
 
+        status = self.serial_reader.supervisor.status()
+        self.com_menu.addSeparator()
+        action = self.com_menu.addAction(self.translator.translate("link_status" if status["connected"] else "link_down",
+                                                                   uptime=format_duration(status["uptime"]),
+                                                                   disconnects=str(status["disconnects"]),
+                                                                   downtime=format_duration(status["downtime"])))
+        action.setEnabled(False)
+
     def create_language_menu(self):
         """
         Crée le menu de sélection de la langue.
@@ -196,4 +214,11 @@ class MenuManager:
         Ouvre la boîte de dialogue d'aide.
         """
         dialog = HelpDialog(self.parent)
-        dialog.exec_()
\ No newline at end of file
+        dialog.exec_()
+
+    def open_trend_window(self):
+        """
+        Affiche la fenêtre de tendances.
+        """
+        self.trend_window.show()
+        self.trend_window.raise_()
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Ce module lit le profil du port série dans la section "serial" de la configuration : débit, délais de lecture
+par commande et débits à essayer lors de la négociation (voir Cmd.Baud).
+"""
+from internal.constant import Cmd
+
+
+# nom utilisé dans la configuration -> types de commande concernés
+COMMAND_NAMES = {
+    "DI": (1,),
+    "AI": (6, 7),
+    "RS485": (8,),
+    "throttle_valve": (Cmd.ThrottleValve.cmd,),
+    "read_all": (Cmd.ReadAll.cmd,),
+    "DI_edges": (Cmd.DIEdges.cmd,),
+    "AI_frame": (Cmd.AIFrame.cmd,),
+    "baud": (Cmd.Baud.cmd,),
+}
+
+
+class PortProfile:
+    """
+    Cette classe regroupe les paramètres du port série.
+
+    Exemple de section "serial" (toutes les clés sont facultatives) :
+        {"baudrate": 115200, "timeout": 0.3, "inter_byte_timeout": null,
+         "timeouts": {"read_all": 0.1, "RS485": 0.3}, "negotiate": true, "baudrates": [1000000, 500000, 250000]}
+
+    Attributes:
+        baudrate: Débit à l'ouverture du port.
+        timeout: Délai de lecture en secondes des commandes sans délai propre.
+        inter_byte_timeout: Délai maximal en secondes entre deux octets d'une réponse, ou None.
+        timeouts: Dictionnaire type de commande -> délai de lecture en secondes.
+        negotiate: True pour essayer d'augmenter le débit à l'ouverture du port.
+        baudrates: Débits à essayer, du plus rapide au plus lent (seuls ceux de Cmd.Baud.rates sont gardés).
+
+    Methods:
+        __init__(self, config):
+            Constructeur de la classe PortProfile.
+
+        response_timeout(self, type):
+            Renvoie le délai de lecture de la réponse d'une commande.
+    """
+    def __init__(self, config):
+        """
+        Constructeur de la classe PortProfile.
+
+        Args:
+            config: Objet Config.
+        """
+        settings = config.value.get("serial", {})
+        self.baudrate = settings.get("baudrate", 115200)
+        self.timeout = settings.get("timeout", 0.3)
+        self.inter_byte_timeout = settings.get("inter_byte_timeout")
+        self.timeouts = {}
+        for name, timeout in settings.get("timeouts", {}).items():
+            for type in COMMAND_NAMES.get(name, ()):
+                self.timeouts[type] = timeout
+        self.negotiate = settings.get("negotiate", False)
+        self.baudrates = sorted((rate for rate in settings.get("baudrates", Cmd.Baud.rates) if rate in Cmd.Baud.rates), reverse=True)
+
+    def response_timeout(self, type):
+        """
+        Renvoie le délai de lecture de la réponse d'une commande.
+
+        Args:
+            type (int): Type de la commande.
+
+        Returns:
+            float: Délai en secondes.
+        """
+        return self.timeouts.get(type, self.timeout)
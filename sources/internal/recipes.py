@@ -1,19 +1,84 @@
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QThread, QEventLoop, pyqtSlot
 import yaml
+import operator
 import os
 import threading
 from time import sleep
 from internal.logger import Logger
 import sys
 
+
+class Action:
+    """
+    Action d'une étape compilée : clé du widget à commander et valeur déjà convertie (voir Recipes.dictionnaire).
+    """
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class Condition:
+    """
+    Condition d'une étape compilée : la valeur du widget est comparée à target avec compare (operator.eq, lt ou gt).
+
+    Attributes:
+        name: Clé du widget.
+        compare: Fonction de comparaison (valeur du widget, target) -> bool.
+        target: Valeur attendue, déjà convertie.
+        widget: Widget lu, résolu au lancement de la recette (voir Recipes.bind).
+    """
+    __slots__ = ("name", "compare", "target", "widget")
+
+    def __init__(self, name, compare, target):
+        self.name = name
+        self.compare = compare
+        self.target = target
+        self.widget = None
+
+    def is_met(self):
+        """
+        Indique si la condition est remplie.
+        """
+        return self.compare(self.widget.get_value(), self.target)
+
+
+class RecipeStep:
+    """
+    Étape d'une recette compilée à partir du fichier YAML.
+
+    Attributes:
+        name: Nom de l'étape.
+        actions: Liste d'Action, dans l'ordre du fichier.
+        conditions: Liste de Condition (vide si l'étape attend seulement timeout secondes).
+        timeout: Durée maximale de l'étape en secondes.
+        error_message: Message affiché si les conditions ne sont pas remplies à temps.
+    """
+    __slots__ = ("name", "actions", "conditions", "timeout", "error_message")
+
+    def __init__(self, name, actions, conditions, timeout, error_message):
+        self.name = name
+        self.actions = actions
+        self.conditions = conditions
+        self.timeout = timeout
+        self.error_message = error_message
+
+
 class Recipes(QObject):
     """
     La classe Recipes gère l'exécution des recettes du système. Elle charge les recettes à partir de fichiers YAML et exécute les étapes spécifiées.
 
+    Les recettes sont compilées au chargement en listes de RecipeStep : les valeurs sont converties et les comparaisons
+    décodées une seule fois, et les widgets des conditions sont résolus au lancement de la recette. Les conditions
+    sont vérifiées toutes les condition_interval ms, au rythme de la boucle de lecture.
+
     Attributes:
         valid_actions: Liste des actions valides.
         valid_conditions: Liste des conditions valides.
         dictionnaire: Dictionnaire pour la correspondance des valeurs.
+        comparators: Dictionnaire préfixe d'une condition ("<" ou ">") -> fonction de comparaison.
+        condition_interval: Intervalle en ms entre deux vérifications des conditions.
         finished: Signal émis lorsque l'exécution d'une recette est terminée.
         warning: Signal émis en cas d'avertissement.
         request_timer_stop: Signal émis pour demander l'arrêt des recettes en cours.
@@ -21,7 +86,7 @@ class Recipes(QObject):
         action: Signal émis pour déclencher une action.
         parent: Référence à l'objet parent.
         translator: Référence à l'objet Translator.
-        recipes: Dictionnaire contenant les recettes.
+        recipes: Dictionnaire nom -> recette compilée (liste de RecipeStep).
         thread: Référence au thread de la classe.
         timer: Référence au timer de la classe.
         warning: Signal émis en cas d'avertissement.
@@ -39,6 +104,15 @@ class Recipes(QObject):
         handle_error(self, error_key, **kwargs):
             Gère les erreurs rencontrées lors de la vérification des recettes.
 
+        compile_recipe(self, content, filename):
+            Compile le contenu d'un fichier de recette en liste de RecipeStep.
+
+        compile_condition(self, filename, step_num, name, value):
+            Compile une condition.
+
+        bind(self, recipe):
+            Résout les widgets lus par les conditions d'une recette.
+
         load_recipes(self):
             Charge les recettes à partir des fichiers YAML.
 
@@ -76,7 +150,9 @@ class Recipes(QObject):
         "up": True,
         "down":False,
     }
-    
+    comparators = {"<": operator.lt, ">": operator.gt}
+    condition_interval = 50 # ms
+
     finished = pyqtSignal()
     warning = pyqtSignal(str)
     request_timer_stop = pyqtSignal()
@@ -119,8 +195,11 @@ class Recipes(QObject):
 
         Args:
             yaml_path: Chemin du fichier YAML de recette.
+
+        Returns:
+            Contenu du fichier.
         """
-        with open(yaml_path, 'r') as f:
+        with open(yaml_path, 'r', encoding="utf-8") as f:
             content = yaml.safe_load(f)
 
         filename = os.path.basename(yaml_path)
@@ -151,6 +230,7 @@ class Recipes(QObject):
             # Vérification de 'timeout'
             if "timeout" not in step:
                 self.handle_error('missing_timeout', filename=filename, step_num=step_num)
+        return content
 
     def handle_error(self, error_key, **kwargs):
         """
@@ -164,23 +244,86 @@ class Recipes(QObject):
         Logger.error(error_message)
         raise ValueError(error_message)  # Lève une exception avec le message d'erreur
 
+    def compile_recipe(self, content, filename):
+        """
+        Compile le contenu d'un fichier de recette vérifié par verify_yaml.
+
+        Args:
+            content: Contenu du fichier YAML.
+            filename: Nom du fichier, pour les messages d'erreur.
+
+        Returns:
+            list: Étapes de la recette (RecipeStep).
+        """
+        recipe = []
+        for step_num, step in content.items():
+            actions = []
+            for name, value in step.get("actions", {}).items():
+                if isinstance(value, str):
+                    value = self.dictionnaire.get(value, value)
+                if not isinstance(value, (bool, int, float)):
+                    self.handle_error('invalid_action_value', filename=filename, step_num=step_num, action_name=name, value=value)
+                actions.append(Action(name, value))
+            conditions = [self.compile_condition(filename, step_num, name, value) for name, value in step.get("conditions", {}).items()]
+            try:
+                timeout = int(step["timeout"])
+            except (ValueError, TypeError):
+                self.handle_error('invalid_timeout', filename=filename, step_num=step_num)
+            recipe.append(RecipeStep(step["name"], actions, conditions, timeout, step.get("error_message", "Error")))
+        return recipe
+
+    def compile_condition(self, filename, step_num, name, value):
+        """
+        Compile une condition : un nombre, un booléen ou un mot de dictionnaire est comparé par égalité,
+        une chaîne "<x" ou ">x" par comparaison au nombre x.
+
+        Args:
+            filename: Nom du fichier, pour les messages d'erreur.
+            step_num: Numéro de l'étape.
+            name: Clé du widget.
+            value: Valeur de la condition dans le fichier.
+
+        Returns:
+            Condition: Condition compilée.
+        """
+        if isinstance(value, str):
+            value = self.dictionnaire.get(value, value)
+        if isinstance(value, (bool, int, float)):
+            return Condition(name, operator.eq, value)
+        if isinstance(value, str) and value[:1] in self.comparators:
+            try:
+                return Condition(name, self.comparators[value[0]], float(value[1:]))
+            except ValueError:
+                pass
+        self.handle_error('invalid_condition_value', filename=filename, step_num=step_num, condition_name=name, value=value)
+
     def load_recipes(self):
         """
-        Charge les recettes à partir des fichiers YAML.
+        Charge et compile les recettes à partir des fichiers YAML.
         """
         recipes = {}
         for filename in os.listdir(self.recipe_folder):
+            if not filename.endswith('.yaml'):
+                continue
             path = os.path.join(self.recipe_folder, filename)
-            try:  # Essaye de vérifier et de charger le fichier
-                self.verify_yaml(path)
-                if filename.endswith('.yaml'):
-                    with open(path, 'r', encoding="utf-8") as f:
-                        recipe_name = os.path.splitext(filename)[0]
-                        recipes[recipe_name] = yaml.safe_load(f)
+            try:  # Essaye de vérifier et de compiler le fichier
+                content = self.verify_yaml(path)
+                recipes[os.path.splitext(filename)[0]] = self.compile_recipe(content, filename)
             except ValueError as e:  # Gère l'exception si une erreur est trouvée
                 Logger.error(f"Erreur lors du chargement de {filename}: {str(e)}")
         return recipes
 
+    def bind(self, recipe):
+        """
+        Résout les widgets lus par les conditions d'une recette.
+
+        Args:
+            recipe: Recette compilée (liste de RecipeStep).
+        """
+        for step in recipe:
+            for condition in step.conditions:
+                condition.widget = self.parent.custom_widgets[condition.name]
+
 
     def execute_recipe(self, recipe_name):
         """
@@ -195,6 +338,7 @@ class Recipes(QObject):
         if recipe_name in self.recipes:
             self.stop_event.clear()
             self.current_recipe = self.recipes[recipe_name]
+            self.bind(self.current_recipe)
             self.thread.start()
 
     def is_running(self):
@@ -211,35 +355,31 @@ class Recipes(QObject):
         Exécute les étapes d'une recette.
         """
         recipe = self.current_recipe
-        for index, step in enumerate(recipe.values()):  # On utilise values() pour obtenir seulement les valeurs
-            step_name = step["name"]
+        for index, step in enumerate(recipe):
             if self.stop_event.is_set():
                 break
-            self.parent.custom_widgets["chamber_label"].update_step(step_name, index + 1, len(recipe))
-            if 'actions' in step:
-                for action_name, action_value in step['actions'].items():
-                    if action_value in self.dictionnaire.keys():
-                        action_value = self.dictionnaire[action_value]
-                    self.action.emit(action_name, action_value)
-            if 'conditions' in step:
-                self.current_conditions = step['conditions']
-                if 'error_message' in step:
-                    self.current_error_message = step['error_message']
-                else:
-                    self.current_error_message = "Error"
-                condition_met = self.check_conditions(self.current_conditions)
-                self.timer.start(int(step['timeout']) * 1000)  # Timeouts
-
+            self.parent.custom_widgets["chamber_label"].update_step(step.name, index + 1, len(recipe))
+            for action in step.actions:
+                self.action.emit(action.name, action.value)
+            if step.conditions:
+                self.current_step = step
+                condition_met = self.check_conditions(step.conditions)
+                self.timer.start(step.timeout * 1000)  # Timeouts
+
+                displayed = None
                 while not condition_met and self.timer.isActive() and not self.stop_event.is_set():
-                    self.parent.custom_widgets["chamber_label"].update_time("timeout", int(float(self.timer.remainingTime())/1000))
+                    remaining = int(float(self.timer.remainingTime())/1000)
+                    if remaining != displayed: # l'affichage ne change qu'une fois par seconde
+                        displayed = remaining
+                        self.parent.custom_widgets["chamber_label"].update_time("timeout", remaining)
                     loop = QEventLoop()
-                    QTimer.singleShot(1000, loop.quit)  # Check the condition every second
+                    QTimer.singleShot(self.condition_interval, loop.quit)
                     loop.exec_()
-                    condition_met = self.check_conditions(self.current_conditions)
+                    condition_met = self.check_conditions(step.conditions)
                 if not condition_met:
                     break
             else:
-                for time in range(int(step['timeout']), 0, -1):
+                for time in range(step.timeout, 0, -1):
                     self.parent.custom_widgets["chamber_label"].update_time("time_left", time)
                     loop = QEventLoop()
                     QTimer.singleShot(1000, loop.quit)  # Check the condition every second
@@ -273,25 +413,14 @@ class Recipes(QObject):
         Vérifie si les conditions sont remplies pour l'exécution de l'étape.
 
         Args:
-            conditions: Conditions à vérifier. Une condition doit être un nombre, un booléen ou une chaîne de caractères contenant < ou > suivi d'un nombre.
+            conditions: Conditions compilées (liste de Condition).
 
         Returns:
             True si les conditions sont satisfaites, False sinon.
         """
-        for condition_name, condition_value in conditions.items():
-            value = self.parent.custom_widgets[condition_name].get_value()
-            if condition_value in self.dictionnaire.keys():
-                condition_value = self.dictionnaire[condition_value]
-            if isinstance(condition_value, bool) or isinstance(condition_value, int):
-                if value != condition_value:
-                    return False
-            elif isinstance(condition_value, str):
-                if condition_value[0] == '<':
-                    if value >= float(condition_value[1:]):
-                        return False
-                elif condition_value[0] == '>':
-                    if value <= float(condition_value[1:]):
-                        return False
+        for condition in conditions:
+            if not condition.is_met():
+                return False
         return True
 
                 
@@ -300,8 +429,8 @@ class Recipes(QObject):
         """
         Vérifie si le temps imparti pour une étape est écoulé.
         """
-        condition_met = self.check_conditions(self.current_conditions)
-        error_message = self.current_error_message
+        condition_met = self.check_conditions(self.current_step.conditions)
+        error_message = self.current_step.error_message
         if not condition_met:
             self.warning.emit(f"Warning: {error_message}")
             self.stop()
@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Cette classe est un tampon circulaire de taille fixe stocké dans un tableau NumPy.
+    Une fois plein, chaque nouvelle valeur remplace la plus ancienne : la mémoire utilisée ne grandit jamais.
+
+    Attributes:
+        capacity: Nombre maximal de valeurs conservées.
+
+    Methods:
+        __init__(self, capacity, dtype=np.float64):
+            Constructeur de la classe RingBuffer.
+
+        append(self, value):
+            Ajoute une valeur.
+
+        values(self):
+            Renvoie les valeurs de la plus ancienne à la plus récente.
+
+        clear(self):
+            Vide le tampon.
+    """
+    def __init__(self, capacity, dtype=np.float64):
+        """
+        Constructeur de la classe RingBuffer.
+
+        Args:
+            capacity (int): Nombre maximal de valeurs conservées.
+            dtype: Type NumPy des valeurs.
+        """
+        self.capacity = capacity
+        self.data = np.full(capacity, np.nan, dtype=dtype)
+        self.index = 0 # prochaine case écrite
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        """
+        Ajoute une valeur, en remplaçant la plus ancienne si le tampon est plein.
+
+        Args:
+            value: Valeur à ajouter.
+        """
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self):
+        """
+        Renvoie les valeurs de la plus ancienne à la plus récente.
+
+        Returns:
+            np.ndarray: Copie des valeurs dans l'ordre chronologique.
+        """
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.index:], self.data[:self.index]))
+
+    def clear(self):
+        """
+        Vide le tampon.
+        """
+        self.index = 0
+        self.count = 0
+
+
+def min_max_decimate(x, y, bins):
+    """
+    Réduit une courbe à au plus 2 * bins points en gardant le minimum et le maximum de chaque intervalle,
+    dans leur ordre d'apparition : les pics restent visibles quelle que soit la longueur de l'historique.
+
+    Args:
+        x (np.ndarray): Abscisses croissantes.
+        y (np.ndarray): Ordonnées (les nan sont ignorés dans le calcul des extrema).
+        bins (int): Nombre d'intervalles, typiquement la largeur du graphique en pixels.
+
+    Returns:
+        tuple: (x, y) décimés.
+    """
+    if len(x) <= 2 * bins:
+        return x, y
+    usable = len(x) - len(x) % bins
+    per_bin = usable // bins
+    block = y[:usable].reshape(bins, per_bin)
+    if np.isnan(block).any():
+        filled = np.where(np.isnan(block), np.inf, block)
+        low = np.argmin(filled, axis=1)
+        filled = np.where(np.isnan(block), -np.inf, block)
+        high = np.argmax(filled, axis=1)
+    else:
+        low = np.argmin(block, axis=1)
+        high = np.argmax(block, axis=1)
+    first = np.minimum(low, high) + np.arange(bins) * per_bin
+    second = np.maximum(low, high) + np.arange(bins) * per_bin
+    indices = np.empty(2 * bins, dtype=np.int64)
+    indices[0::2] = first
+    indices[1::2] = second
+    # les derniers points, qui ne remplissent pas un intervalle, sont gardés tels quels
+    indices = np.concatenate((indices, np.arange(usable, len(x))))
+    return x[indices], y[indices]
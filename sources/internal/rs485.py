@@ -1,7 +1,159 @@
-from internal.constant import PiraniConfig
+import math
+import threading
 import time
 
+from PyQt5.QtCore import QCoreApplication, QThread
+
+from internal.constant import PiraniConfig
+from internal.logger import Logger
+from internal.serial_scheduler import Priority
+
+
+def gauge_keys(config):
+    """
+    Renvoie les clés de configuration des jauges Pirani du bus RS485 ("gauges" de la section "rs485").
+
+    Args:
+        config: Objet Config.
+    """
+    return config.value.get("rs485", {}).get("gauges", ["chamber_pressure", "pump_pressure"])
+
+
+def split_response(data):
+    """
+    Découpe la réponse d'une jauge.
+
+    Args:
+        data (bytes): Réponse de la jauge, ou None.
+
+    Returns:
+        list: Champs de la réponse, vide si la jauge n'a pas répondu.
+    """
+    return data.decode(errors="replace").strip().split(';') if data else []
+
+
+def parse_setpoint(data):
+    """
+    Décode la réponse à ?S754 (index;seuil).
+
+    Args:
+        data (list): Réponse découpée.
+
+    Returns:
+        str: Seuil au format envoyé à la jauge ("1.0e-01"), ou None si la réponse est invalide.
+    """
+    try:
+        return "{:.1e}".format(float(data[-1].split()[-1]))
+    except (ValueError, IndexError):
+        return None
+
+
+def in_gui_thread():
+    """
+    Indique si l'appel est fait depuis le thread de l'interface.
+    """
+    app = QCoreApplication.instance()
+    return app is not None and QThread.currentThread() == app.thread()
+
+
+class PiraniSample:
+    """
+    Cette classe représente une lecture de la jauge Pirani, décodée une seule fois à la réception.
+
+    Attributes:
+        pressure: Pression en Torr (overrange si la jauge est en erreur ou hors gamme).
+        value: Pression dans l'unité de la jauge (overrange si la jauge est hors gamme), ou None si la jauge est en erreur.
+        unit: Unité de la jauge (1 : mBar, 2 : Pascal, 3 : Torr, voir PiraniConfig.units_types).
+        gas: Index du gaz dans PiraniConfig.gas_types.
+        status: Bits d'état de la jauge.
+        timestamp: Instant de la lecture (time.monotonic).
+        error: True si la jauge a répondu "error".
+    """
+    __slots__ = ("pressure", "value", "unit", "gas", "status", "timestamp", "error")
+    to_torr = {1: 0.75, 2: 0.0075, 3: 1.0} # unité -> facteur vers des Torr
+    overrange = 1000.0 # Torr, valeur prudente quand la pression n'est pas connue
+
+    def __init__(self, value, status, timestamp, error=False, out_of_range=False):
+        self.value = value
+        self.status = status
+        self.unit = (status >> 4) & 3 # 2 bits de l'unité
+        self.gas = (status >> 12) & 7 # bits du gaz enregistré
+        self.timestamp = timestamp
+        self.error = error
+        if error or out_of_range or value is None:
+            self.pressure = self.overrange # la valeur sentinelle est déjà en Torr, elle n'est pas convertie
+        else:
+            self.pressure = value * self.to_torr.get(self.unit, 1.0)
+
+    @classmethod
+    def parse(cls, data, timestamp=None):
+        """
+        Décode la réponse à ?V752.
+
+        Args:
+            data (list): Réponse découpée (valeur, bits d'état en hexadécimal), ou ["error"].
+            timestamp (float): Instant de la lecture, maintenant par défaut.
+
+        Returns:
+            PiraniSample: Lecture décodée, ou None si la réponse est invalide.
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if data and data[0] == "error":
+            return cls(None, 0, timestamp, error=True)
+        try:
+            status = int(data[1], 16)
+            if data[0].lower() == "overrange":
+                return cls(cls.overrange, status, timestamp, out_of_range=True)
+            value = float(data[0])
+        except (ValueError, IndexError, TypeError):
+            return None
+        if math.isnan(value):
+            return None
+        return cls(value, status, timestamp)
+
+    def __eq__(self, other):
+        # l'instant de lecture n'est pas comparé : deux lectures identiques ne redessinent pas le widget
+        return isinstance(other, PiraniSample) and (self.value, self.status, self.error) == (other.value, other.status, other.error)
+
+    __hash__ = None
+
+
 class RS485:
+    """
+    Cette classe regroupe les jauges Pirani du bus RS485 déclarées dans la configuration et répartit leurs lectures
+    entre les cycles de la boucle de lecture.
+
+    Chaque jauge est lue à sa propre fréquence ("poll_interval" de sa section). Un cycle lit au plus reads_per_cycle
+    jauges, les plus en retard d'abord : sa durée ne dépend pas du nombre de jauges. Une jauge qui ne répond pas
+    est relue après un délai qui double à chaque échec, jusqu'à max_backoff.
+    Le "max_age" d'une jauge (âge au-delà duquel get_sample la relit) vaut au moins deux fois son "poll_interval",
+    pour que les lectures à la demande ne s'ajoutent pas aux lectures périodiques.
+
+    scan cherche les jauges présentes sur le bus sans ralentir la boucle de lecture, et register complète
+    le registre de la configuration avec les jauges trouvées.
+
+    Configuration :
+        "rs485": {"gauges": ["chamber_pressure", "pump_pressure"], "reads_per_cycle": 2, "max_backoff": 60, "scan_timeout": 0.05},
+        et pour chaque jauge une section {"address": 7, "poll_interval": 0.2, "sn": "...", ...} (adresses 1 à 98).
+
+    Attributes:
+        pirani: Dictionnaire clé -> jauge, dans l'ordre de la configuration.
+        reads_per_cycle: Nombre maximal de jauges lues par appel à poll.
+        scan_timeout: Délai de réponse en secondes d'une adresse pendant la recherche des jauges.
+
+    Methods:
+        __init__(self, parent):
+            Constructeur de la classe RS485.
+
+        poll(self):
+            Lit les jauges dont la lecture est due et renvoie les nouvelles lectures.
+
+        scan(self, addresses=range(1, 99)):
+            Cherche les jauges présentes sur le bus et relit leurs paramètres.
+
+        register(self, found):
+            Ajoute au registre de la configuration les jauges trouvées par scan.
+    """
     def __init__(self,parent) -> None:
         """
         Constructeur de la classe RS485.
@@ -9,9 +161,134 @@ class RS485:
         Args:
             parent: Objet parent.
         """
+        self.parent = parent
+        self.serial_reader = parent.serial_reader
+        settings = parent.config.value.get("rs485", {})
+        self.reads_per_cycle = settings.get("reads_per_cycle", 2)
+        self.scan_timeout = settings.get("scan_timeout", 0.05) # s
         self.pirani = {}
-        self.pirani["chamber_pressure"] = self.__Pirani__(parent, "chamber_pressure")
-        self.pirani["pump_pressure"] = self.__Pirani__(parent, "pump_pressure")
+        addresses = {}
+        for key in gauge_keys(parent.config):
+            gauge = self.__Pirani__(parent, key)
+            if not 0 < gauge.address < 99: # 99 : adresse de diffusion
+                Logger.error(f"Pirani {key}: invalid RS485 address {gauge.address}, gauge ignored.")
+            elif gauge.address in addresses:
+                Logger.error(f"Pirani {key}: RS485 address {gauge.address} already used by {addresses[gauge.address]}, gauge ignored.")
+            else:
+                addresses[gauge.address] = key
+                self.pirani[key] = gauge
+
+    def poll(self):
+        """
+        Lit les jauges dont la lecture est due, au plus reads_per_cycle. Toutes les requêtes sont placées dans la file
+        du scheduler série avant d'attendre la première réponse. Appelé depuis la boucle de lecture.
+
+        Returns:
+            list: (clé, PiraniSample) pour chaque lecture pas encore publiée, y compris celles faites par get_sample.
+        """
+        now = time.monotonic()
+        due = sorted((gauge for gauge in self.pirani.values() if gauge.next_poll <= now), key=lambda gauge: gauge.next_poll)
+        requests = [(gauge, gauge.request_pressure()) for gauge in due[:self.reads_per_cycle]]
+        for gauge, future in requests:
+            gauge.store_pressure(future.result())
+
+        samples = []
+        for key, gauge in self.pirani.items():
+            sample = gauge.sample
+            if sample is not None and sample is not gauge.published:
+                gauge.published = sample
+                samples.append((key, sample))
+        return samples
+
+    def scan(self, addresses=range(1, 99)):
+        """
+        Cherche les jauges présentes sur le bus : le numéro de série est demandé à chaque adresse, puis les jauges
+        qui ont répondu sont relues (unité, gaz et seuils). Les requêtes ont la priorité la plus basse et un délai
+        de réponse court : elles ne passent qu'entre les lectures de la boucle, et sont toutes placées dans la file
+        avant d'attendre les réponses (elles se suivent sans attente en protocole tramé). Fonction bloquante,
+        à appeler avec SerialReader.run_async.
+
+        Args:
+            addresses: Adresses à interroger.
+
+        Returns:
+            list: Un dictionnaire par jauge trouvée, avec "address", "sn", et si la jauge les a renvoyés
+            "pressure_unit", "gas_type", "setpoint_high" et "setpoint_low" (au format de la configuration).
+        """
+        commands = self.__Pirani__.Command
+        def query(address, text):
+            return self.serial_reader.query(8, address, text + "\n", until=b"\n", priority=Priority.SCAN, response_timeout=self.scan_timeout)
+
+        probes = [(address, query(address, commands["read_SN"])) for address in addresses]
+        found = []
+        for address, future in probes:
+            response = split_response(future.result())
+            if response and response[0]:
+                found.append({"address": address, "sn": response[0]})
+
+        readings = [(gauge, query(gauge["address"], commands["read_pressure"]),
+                     [query(gauge["address"], commands["read_setpoint"].format(index=index)) for index in (0, 1)])
+                    for gauge in found]
+        for gauge, pressure, setpoints in readings:
+            sample = PiraniSample.parse(split_response(pressure.result()))
+            if sample is not None and not sample.error:
+                if 0 < sample.unit <= len(PiraniConfig.units_types):
+                    gauge["pressure_unit"] = PiraniConfig.units_types[sample.unit - 1]
+                if sample.gas < len(PiraniConfig.gas_types):
+                    gauge["gas_type"] = PiraniConfig.gas_types[sample.gas]
+            for name, future in zip(("setpoint_high", "setpoint_low"), setpoints):
+                setpoint = parse_setpoint(split_response(future.result()))
+                if setpoint is not None:
+                    gauge[name] = float(setpoint)
+        summary = ", ".join(f"{gauge['sn']} at {gauge['address']}" for gauge in found) or "none"
+        Logger.info(f"RS485 scan: {len(found)} gauge(s) found ({summary}).")
+        return found
+
+    def register(self, found):
+        """
+        Ajoute au registre de la configuration les jauges trouvées par scan, puis enregistre la configuration.
+        À appeler depuis le thread de l'interface.
+
+        Une jauge déjà déclarée est reconnue par son numéro de série, sinon par son adresse : son numéro de série
+        est enregistré et son adresse corrigée si elle a changé. Une nouvelle jauge est ajoutée avec les paramètres
+        relus ; elle est lue à partir du prochain démarrage (les groupes de la télémétrie en cours sont fixés).
+
+        Args:
+            found (list): Résultat de scan. La clé de chaque jauge y est ajoutée ("key").
+        """
+        config = self.parent.config
+        keys = config.value.setdefault("rs485", {}).setdefault("gauges", list(gauge_keys(config)))
+        by_sn = {config[key]["sn"]: key for key in keys if config[key].get("sn")}
+        by_address = {config[key]["address"]: key for key in keys}
+        for gauge in found:
+            key = by_sn.get(gauge["sn"]) or by_address.get(gauge["address"])
+            if key is None:
+                key = f"pirani_{gauge['address']}"
+                if key in config.value:
+                    key = f"{key}_{gauge['sn']}"
+                config.value[key] = {
+                    "address": gauge["address"],
+                    "sn": gauge["sn"],
+                    "setpoint_high": gauge.get("setpoint_high", 0.1),
+                    "setpoint_low": gauge.get("setpoint_low", 0.1),
+                    "gas_type": gauge.get("gas_type", PiraniConfig.gas_types[0]),
+                    "pressure_unit": gauge.get("pressure_unit", "Torr"),
+                    "max_age": 2.0,
+                    "poll_interval": 1.0,
+                }
+                keys.append(key)
+                Logger.info(f"Pirani {key} ({gauge['sn']}) added at address {gauge['address']}, polled after restart.")
+            else:
+                section = config[key]
+                section["sn"] = gauge["sn"]
+                if section["address"] != gauge["address"]:
+                    Logger.info(f"Pirani {key} ({gauge['sn']}) found at address {gauge['address']} instead of {section['address']}.")
+                    section["address"] = gauge["address"]
+                    if key in self.pirani:
+                        self.pirani[key].address = gauge["address"]
+                        self.pirani[key].settings = None
+            gauge["key"] = key
+        config.save_config()
 
     class __Pirani__:
         """
@@ -25,7 +302,7 @@ class RS485:
                 Envoie une commande au capteur Pirani.
 
             wait_to_send_command(self, cmd):
-                Attend que la liaison série soit libre avant d'envoyer une commande au capteur Pirani.
+                Envoie une commande de l'opérateur au capteur Pirani, en priorité sur les lectures périodiques.
 
             update_address(self):
                 Met à jour l'adresse du capteur Pirani.
@@ -33,11 +310,26 @@ class RS485:
             convert_to_exp_format(self, value):
                 Convertit une valeur en notation exponentielle.
 
+            target_settings(self):
+                Renvoie les paramètres demandés dans la configuration, au format de la jauge.
+
+            read_settings(self):
+                Relit les paramètres actuels de la jauge.
+
             update_config(self):
-                Met à jour la configuration du capteur Pirani.
+                Envoie à la jauge les paramètres de la configuration qui diffèrent des siens.
+
+            request_pressure(self, priority=Priority.POLL):
+                Envoie une lecture de la pression sans attendre la réponse.
+
+            store_pressure(self, response):
+                Décode la réponse à une lecture de la pression et planifie la lecture suivante.
 
             read_pressure(self):
-                Lit la pression à partir du capteur Pirani.
+                Lit la pression à partir du capteur Pirani et met à jour la dernière lecture.
+
+            get_sample(self, max_age=None, wait=None):
+                Renvoie la dernière lecture, relue seulement si elle est trop ancienne.
 
             read_SN(self):
                 Lit le numéro de série du capteur Pirani.
@@ -53,7 +345,15 @@ class RS485:
             "read_SN" : "?S790",
             "calibration_atm":"!S761 1;1",
             "setpoint_high":"!S754 0;{pressure}",
-            "setpoint_low":"!S754 1;{pressure}"
+            "setpoint_low":"!S754 1;{pressure}",
+            "read_setpoint":"?S754 {index}"
+        }
+        # paramètre -> commande d'écriture et argument de la commande
+        Settings = {
+            "pressure_unit": ("change_unit", "unit"),
+            "gas_type": ("change_gas", "gas_type"),
+            "setpoint_high": ("setpoint_high", "pressure"),
+            "setpoint_low": ("setpoint_low", "pressure"),
         }
 
         def __init__(self,parent,key) -> None:
@@ -68,25 +368,40 @@ class RS485:
             self.serial_reader = parent.serial_reader
             self.key = key
             self.address = self.parent.config[self.key]["address"]
-
-
-        def command(self,cmd):#envois une commande
+            self.poll_interval = self.parent.config[self.key].get("poll_interval", 1.0) # s
+            # une lecture périodique peut partir jusqu'à un cycle de la boucle après son échéance : avec un max_age plus
+            # court, get_sample relirait la jauge entre deux lectures périodiques
+            min_age = 2 * self.poll_interval
+            self.max_age = self.parent.config[self.key].get("max_age", min_age) # s
+            if self.max_age < min_age:
+                Logger.warning(f"Pirani {key}: max_age ({self.max_age} s) raised to twice the poll interval ({min_age} s).")
+                self.max_age = min_age
+            self.max_backoff = self.parent.config.value.get("rs485", {}).get("max_backoff", 60) # s
+            self.next_poll = 0.0 # instant (time.monotonic) de la prochaine lecture périodique
+            self.failures = 0 # lectures sans réponse consécutives
+            self.sample = None # dernière lecture valide (PiraniSample)
+            self.published = None # dernière lecture renvoyée par RS485.poll
+            self.lock = threading.Lock() # une seule relecture à la fois
+            self.refreshing = None # Future de la relecture lancée depuis l'interface
+            self.settings = None # paramètres de la jauge relus ou vérifiés, None tant qu'ils ne sont pas connus
+
+
+        def command(self,cmd,priority=Priority.POLL):#envois une commande
             """
-                Envoie une commande au capteur Pirani.
+                Envoie une commande au capteur Pirani et attend sa réponse.
 
             Args:
                 cmd: Commande à envoyer.
+                priority: Priorité de la commande dans le scheduler série.
 
             Returns:
-                Résultat de la commande.
+                Résultat de la commande découpé, vide si la jauge n'a pas répondu.
             """
-            self.serial_reader.send_data(8,self.address, cmd + "\n")
-            data = self.serial_reader.wait_and_read_data(until='\n')
-            return data.decode().strip().split(';')
+            return split_response(self.serial_reader.query(8, self.address, cmd + "\n", until=b"\n", priority=priority).result())
 
         def wait_to_send_command(self,cmd):
             """
-                Attend que la liaison série soit libre avant d'envoyer une commande au capteur Pirani.
+                Envoie une commande de l'opérateur au capteur Pirani, en priorité sur les lectures périodiques.
 
             Args:
                 cmd: Commande à envoyer.
@@ -94,12 +409,7 @@ class RS485:
             Returns:
                 Résultat de la commande.
             """
-            while(self.serial_reader.busy == True):
-                time.sleep(0.01)
-            self.serial_reader.busy = True
-            data = self.command(cmd)
-            self.serial_reader.busy = False
-            return data
+            return self.command(cmd, Priority.WRITE)
 
 
 
@@ -107,16 +417,11 @@ class RS485:
             """
                 Met à jour l'adresse du capteur Pirani.
             """
-            while(self.serial_reader.busy == True):
-                time.sleep(0.01)
-            self.serial_reader.busy = True
-
             self.address = self.parent.config[self.key]["address"]
+            self.settings = None # autre jauge possible à cette adresse
             new_address = f"{0 if(self.address<10) else ''}{self.address}"
             command = self.Command["change_address"].format(address=new_address) + "\n"
-            self.serial_reader.send_data(8, 99, command)
-            data = self.serial_reader.wait_and_read_data(until='\n')
-            self.serial_reader.busy = False
+            self.serial_reader.query(8, 99, command, until=b"\n", priority=Priority.WRITE).result()
 
         def convert_to_exp_format(self,value):
             """
@@ -132,36 +437,142 @@ class RS485:
             return value
         
 
-        def update_config(self):
+        def target_settings(self):
             """
-                Met à jour la configuration du capteur Pirani.
+                Renvoie les paramètres demandés dans la configuration, au format de la jauge.
+
+            Returns:
+                dict: Paramètre (clé de Settings) -> valeur.
             """
-            while(self.serial_reader.busy == True):
-                time.sleep(0.01)
-            self.serial_reader.busy = True
             config = self.parent.config[self.key]
+            return {
+                "pressure_unit": PiraniConfig.units_types.index(config["pressure_unit"]) + 1,
+                "gas_type": PiraniConfig.gas_types.index(config["gas_type"]),
+                "setpoint_high": self.convert_to_exp_format(config["setpoint_high"]),
+                "setpoint_low": self.convert_to_exp_format(config["setpoint_low"]),
+            }
+
+        def read_settings(self):
+            """
+                Relit les paramètres actuels de la jauge : l'unité et le gaz sont dans les bits d'état d'une lecture
+                de la pression, les seuils sont relus un par un. Un paramètre illisible est absent du résultat.
+
+            Returns:
+                dict: Paramètre (clé de Settings) -> valeur.
+            """
+            settings = {}
+            sample = self.read_pressure()
+            if sample is not None and not sample.error:
+                settings["pressure_unit"] = sample.unit
+                settings["gas_type"] = sample.gas
+            for index, name in enumerate(("setpoint_high", "setpoint_low")):
+                setpoint = parse_setpoint(self.wait_to_send_command(self.Command["read_setpoint"].format(index=index)))
+                if setpoint is not None:
+                    settings[name] = setpoint
+            self.settings = settings
+            return settings
+
+        def update_config(self):
+            """
+                Envoie à la jauge les paramètres de la configuration qui diffèrent des siens. Les paramètres de la jauge
+                sont relus une seule fois, puis tenus à jour à chaque écriture acceptée. Chaque commande est envoyée
+                seule dans le scheduler série : les lectures périodiques passent entre deux commandes.
 
-            unit = PiraniConfig.units_types.index(config["pressure_unit"]) + 1
-            gas_type = PiraniConfig.gas_types.index(config["gas_type"])
+            Returns:
+                list: Paramètres modifiés.
+            """
+            target = self.target_settings()
+            settings = self.settings if self.settings is not None else self.read_settings()
+            changed = []
+            for name, value in target.items():
+                if settings.get(name) == value:
+                    continue
+                command, argument = self.Settings[name]
+                response = self.wait_to_send_command(self.Command[command].format(**{argument: value}))
+                if response and response[0] and not response[0].upper().startswith("ERR"):
+                    settings[name] = value
+                    changed.append(name)
+                else:
+                    settings.pop(name, None) # valeur inconnue : elle sera renvoyée à la prochaine mise à jour
+                    Logger.warning(f"Pirani {self.key}: {name} = {value} rejected ({';'.join(response) or 'no response'}).")
+            Logger.info(f"Pirani {self.key}: {', '.join(changed) if changed else 'no parameter'} updated.")
+            return changed
+
+
+        def request_pressure(self, priority=Priority.POLL):
+            """
+                Envoie une lecture de la pression sans attendre la réponse.
 
+            Args:
+                priority: Priorité de la commande dans le scheduler série.
 
-            self.command(self.Command["change_unit"].format(unit=unit))
-            self.command(self.Command["change_gas"].format(gas_type=gas_type))
+            Returns:
+                Future: Future contenant la réponse (bytes), ou None.
+            """
+            return self.serial_reader.query(8, self.address, self.Command["read_pressure"] + "\n", until=b"\n", priority=priority)
 
-            self.command(self.Command["setpoint_high"].format(pressure=self.convert_to_exp_format(config["setpoint_high"])))
-            self.command(self.Command["setpoint_low"].format(pressure=self.convert_to_exp_format(config["setpoint_low"])))
+        def store_pressure(self, response):
+            """
+                Décode la réponse à une lecture de la pression, met à jour la dernière lecture (sample)
+                et planifie la lecture périodique suivante, plus tard si la jauge ne répond pas.
 
-            self.serial_reader.busy = False
+            Args:
+                response: Réponse de la jauge (bytes), ou None.
 
+            Returns:
+                PiraniSample: Lecture décodée, ou None si la jauge n'a pas répondu.
+            """
+            sample = PiraniSample.parse(split_response(response))
+            if sample is None:
+                self.failures += 1
+                self.next_poll = time.monotonic() + min(self.poll_interval * 2 ** self.failures, self.max_backoff)
+                if self.failures == 1:
+                    Logger.warning(f"Pirani {self.key} (address {self.address}) not responding.")
+                return None
+            if self.failures:
+                Logger.info(f"Pirani {self.key} (address {self.address}) responding again after {self.failures} failures.")
+            self.failures = 0
+            self.sample = sample
+            self.next_poll = sample.timestamp + self.poll_interval
+            return sample
 
         def read_pressure(self):
             """
-                Lit la pression à partir du capteur Pirani.
+                Lit la pression à partir du capteur Pirani et met à jour la dernière lecture (sample).
+
+            Returns:
+                PiraniSample: Lecture décodée, ou None si la jauge n'a pas répondu.
+            """
+            return self.store_pressure(self.request_pressure().result())
+
+        def get_sample(self, max_age=None, wait=None):
+            """
+                Renvoie la dernière lecture de la jauge. Elle n'est relue sur le bus que si elle date de plus
+                de max_age secondes. Sans attente (toujours depuis le thread de l'interface), la relecture est lancée
+                en tâche de fond et la dernière lecture est renvoyée tout de suite.
+
+            Args:
+                max_age: Âge maximal en secondes de la lecture renvoyée ("max_age" de la configuration de la jauge par défaut).
+                wait: True pour attendre la relecture, False pour ne jamais attendre le bus. Par défaut, attend
+                    sauf depuis le thread de l'interface.
 
             Returns:
-                Résultat de la lecture de la pression.
+                PiraniSample: Dernière lecture, ou None si la jauge n'a encore jamais répondu.
             """
-            return self.command(self.Command["read_pressure"])
+            max_age = self.max_age if max_age is None else max_age
+            wait = not in_gui_thread() if wait is None else wait
+            sample = self.sample
+            if sample is not None and time.monotonic() - sample.timestamp <= max_age:
+                return sample
+            if not wait or in_gui_thread():
+                if self.refreshing is None or self.refreshing.done():
+                    self.refreshing = self.serial_reader.run_async(self.get_sample, max_age, True)
+                return sample
+            with self.lock:
+                sample = self.sample
+                if sample is None or time.monotonic() - sample.timestamp > max_age: # pas relue par un autre thread entre-temps
+                    self.read_pressure()
+            return self.sample
         
         def read_SN(self):
             """
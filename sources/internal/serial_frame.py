@@ -0,0 +1,133 @@
+"""
+Ce module implémente le protocole tramé du port série (voir Cmd.Frame) : construction des trames et
+décodage d'un flux d'octets avec resynchronisation.
+"""
+from binascii import crc_hqx
+import struct
+
+from internal.constant import Cmd
+
+
+HEADER_SIZE = struct.calcsize(Cmd.Frame.header)
+CRC_SIZE = struct.calcsize(Cmd.Frame.crc)
+
+
+def frame_crc(data):
+    """
+    Calcule le CRC-16/CCITT (valeur initiale 0xFFFF) utilisé par les trames.
+
+    Args:
+        data (bytes): Longueur, séquence et contenu de la trame.
+    """
+    return crc_hqx(data, 0xFFFF)
+
+
+def encode_frame(sequence, payload):
+    """
+    Construit une trame.
+
+    Args:
+        sequence (int): Numéro de séquence (0 à 255).
+        payload (bytes): Contenu de la trame (au plus Cmd.Frame.max_payload octets).
+
+    Returns:
+        bytes: Trame complète.
+    """
+    if len(payload) > Cmd.Frame.max_payload:
+        raise ValueError(f"Frame payload too long ({len(payload)} bytes)")
+    body = bytes([len(payload), sequence & 0xFF]) + payload
+    return bytes([Cmd.Frame.start]) + body + struct.pack(Cmd.Frame.crc, frame_crc(body))
+
+
+class FrameDecoder:
+    """
+    Cette classe extrait les trames d'un flux d'octets reçus par morceaux.
+
+    Les octets qui précèdent un octet de début sont ignorés. Si le CRC d'une trame est faux (octet perdu,
+    octet parasite, octet de début au milieu d'un contenu), seul son octet de début est abandonné et la
+    recherche reprend à l'octet suivant : une erreur ne décale jamais les trames suivantes.
+
+    Attributes:
+        buffer: Octets reçus pas encore décodés.
+        crc_errors: Nombre de trames rejetées à cause de leur CRC.
+        skipped: Nombre d'octets ignorés en dehors de toute trame.
+
+    Methods:
+        feed(self, data):
+            Ajoute des octets reçus.
+
+        next_frame(self):
+            Renvoie la prochaine trame complète et valide, ou None.
+
+        resync(self):
+            Abandonne la trame incomplète en tête du buffer.
+
+        clear(self):
+            Vide le buffer.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.crc_errors = 0
+        self.skipped = 0
+
+    def feed(self, data):
+        """
+        Ajoute des octets reçus.
+
+        Args:
+            data (bytes): Octets reçus.
+        """
+        self.buffer += data
+
+    def next_frame(self):
+        """
+        Renvoie la prochaine trame complète et valide du buffer.
+
+        Returns:
+            tuple: (numéro de séquence, contenu), ou None s'il n'y a pas de trame complète.
+        """
+        buffer = self.buffer
+        while True:
+            start = buffer.find(Cmd.Frame.start)
+            if start < 0:
+                self.skipped += len(buffer)
+                buffer.clear()
+                return None
+            if start > 0:
+                self.skipped += start
+                del buffer[:start]
+            if len(buffer) < HEADER_SIZE:
+                return None
+            length = buffer[1]
+            end = HEADER_SIZE + length
+            if len(buffer) < end + CRC_SIZE:
+                return None
+            crc, = struct.unpack_from(Cmd.Frame.crc, buffer, end)
+            if frame_crc(bytes(buffer[1:end])) != crc:
+                self.crc_errors += 1
+                self.skipped += 1
+                del buffer[:1] # ce n'était pas un début de trame, on cherche le suivant
+                continue
+            sequence = buffer[2]
+            payload = bytes(buffer[HEADER_SIZE:end])
+            del buffer[:end + CRC_SIZE]
+            return sequence, payload
+
+    def resync(self):
+        """
+        Abandonne la trame en tête du buffer quand elle ne se complète pas (octet de début parasite suivi
+        d'une longueur trop grande) : les trames valides qui la suivent peuvent à nouveau être décodées.
+
+        Returns:
+            bool: True si des octets restent à décoder.
+        """
+        if self.buffer:
+            self.skipped += 1
+            del self.buffer[:1]
+        return bool(self.buffer)
+
+    def clear(self):
+        """
+        Vide le buffer.
+        """
+        self.buffer.clear()
@@ -1,32 +1,120 @@
 from serial import Serial, SerialException
 from serial.tools.list_ports import comports
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtCore import QThread, pyqtSignal, QObject, QTimer
+from PyQt5.QtCore import QThread, pyqtSignal, QObject
 
 from internal.logger import Logger
 from internal.constant import *
-from internal.rs485 import RS485
-
+from internal.rs485 import RS485, gauge_keys
+from internal.serial_scheduler import SerialScheduler, SerialCommand, Priority
+from internal.simulator import SimulatedDevice, SimulatedSerial
+from internal.telemetry import TelemetryRecorder
+from internal.serial_frame import FrameDecoder
+from internal.command_encoder import CommandEncoder
+from internal.port_profile import PortProfile
+from internal.link_supervisor import LinkSupervisor
+from internal.widget_refresher import PollSnapshot
+
+from concurrent.futures import ThreadPoolExecutor
+import math
 import struct
+import threading
 import time
 
+import numpy as np
+
+
+def response(future):
+    """
+    Renvoie la réponse d'une commande terminée, sans lever l'erreur du Future (commande expirée ou en échec).
+
+    Args:
+        future (Future): Future d'une commande du scheduler série.
+
+    Returns:
+        bytes: Réponse de la commande, ou None si la commande a échoué.
+    """
+    if future.exception() is not None:
+        return None
+    return future.result()
+
+def decode_AI_frame(data):
+    """
+    Décode une trame binaire d'entrées analogiques (voir Cmd.AIFrame) sans copie intermédiaire :
+    les valeurs sont lues directement dans le buffer reçu.
+
+    Args:
+        data (bytes): Contenu de la trame, sans l'octet de longueur.
+
+    Returns:
+        np.ndarray: Valeurs en volts (float32), ou None si la trame est invalide (taille, type ou somme de contrôle).
+    """
+    header_size = struct.calcsize(Cmd.AIFrame.header)
+    checksum_size = struct.calcsize(Cmd.AIFrame.checksum)
+    if data is None or len(data) < header_size + checksum_size:
+        return None
+    view = memoryview(data)
+    value_type, count = struct.unpack_from(Cmd.AIFrame.header, view)
+    if value_type not in Cmd.AIFrame.dtypes:
+        return None
+    dtype, scale = Cmd.AIFrame.dtypes[value_type]
+    end = header_size + count * np.dtype(dtype).itemsize
+    if len(data) != end + checksum_size:
+        return None
+    checksum, = struct.unpack_from(Cmd.AIFrame.checksum, view, end)
+    if int(np.frombuffer(view, dtype=np.uint8, count=end).sum()) & 0xFFFF != checksum:
+        return None
+    values = np.frombuffer(view, dtype=dtype, count=count, offset=header_size)
+    return values * np.float32(scale) if scale != 1.0 else values
+
 class SerialReader(QObject):
     error_occurred = pyqtSignal(str) 
+    frame_probes = 3 # trames sans réponse avant de conclure que le firmware ne gère pas le protocole tramé
+    replay_wait = 5 # s, délai laissé au firmware pour redémarrer après une reconnexion
+    result_ready = pyqtSignal(object, object) # callback, Future
 
-    def __init__(self, parent):
+    def __init__(self, parent, port=None):
         """
         Constructeur de la classe SerialReader.
 
         Args:
             parent: Objet parent.
+            port (str): Port à ouvrir. Par défaut, le premier port disponible.
         """
         super().__init__()
         self.ser = None
+        self.connections = 0 # nombre d'ouvertures du port : les détections du firmware sont refaites après chacune
+        self.config = parent.config
         self.translator = parent.translator
         self.error_occurred.connect(parent.show_error_message)
-
-        self.busy = False 
-        self.set_com_port(self.get_available_com_ports()[0] if self.get_available_com_ports() else None)
+        self.result_ready.connect(self.deliver_result)
+        self.profile = PortProfile(self.config)
+
+        # protocole tramé (Cmd.Frame) : None tant que le firmware n'a pas répondu à une trame, False s'il ne les gère pas
+        self.framed = None
+        self.frame_failures = 0 # réponses tramées manquantes consécutives
+        self.sequence = 0
+        self.encoder = CommandEncoder() # utilisé uniquement par le thread du scheduler
+        self.frame_decoder = FrameDecoder()
+        self.late_frames = 0
+
+        # requêtes tramées en vol (pipeline) : séquence -> (commande, instant d'envoi, taille de la trame)
+        self.in_flight = {}
+        self.in_flight_bytes = 0
+        self.pipeline = threading.Condition()
+        self.receiver = None
+
+        # dernières sorties demandées, renvoyées après une reconnexion (voir replay_outputs)
+        self.outputs = {} # action -> état
+        self.setpoints = {} # type de commande -> (donnée, autres données)
+        self.supervisor = LinkSupervisor(self)
+
+        self.scheduler = SerialScheduler(self)
+        # opérations composées de plusieurs commandes (configuration des jauges, ...), exécutées hors du thread de l'interface
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SerialTask")
+        if port is None and self.get_available_com_ports():
+            port = self.get_available_com_ports()[0]
+        self.set_com_port(port)
 
 
     def get_available_com_ports(self):
@@ -34,9 +122,12 @@ class SerialReader(QObject):
         Obtient la liste des ports COM disponibles.
 
         Returns:
-            List[str]: Liste des ports COM disponibles.
+            List[str]: Liste des ports COM disponibles, suivie du port simulé s'il est activé dans la configuration.
         """
-        return [port.device for port in comports()]
+        ports = [port.device for port in comports()]
+        if self.config.value.get("serial", {}).get("simulator", False):
+            ports.append(SimulatedSerial.port_name)
+        return ports
 
     def set_com_port(self, port):
         """
@@ -49,7 +140,19 @@ class SerialReader(QObject):
             if self.ser is not None and self.ser.port == port:
                 return
             try:
-                self.ser = Serial(port=port, baudrate=115200, timeout=0.3)
+                if port == SimulatedSerial.port_name:
+                    ser = self.create_simulator()
+                else:
+                    ser = Serial(port=port, baudrate=self.profile.baudrate, timeout=self.profile.timeout,
+                                 inter_byte_timeout=self.profile.inter_byte_timeout)
+                if self.profile.negotiate:
+                    self.negotiate_baudrate(ser) # avant que le scheduler n'utilise le port
+                self.ser = ser
+                self.connections += 1
+                self.framed = None
+                self.frame_failures = 0
+                self.frame_decoder.clear()
+                self.supervisor.connected(port)
             except SerialException:
                 Logger.error(f"Error while connecting to serial port {port}.")
         else:
@@ -58,6 +161,90 @@ class SerialReader(QObject):
 
 
 
+    def create_simulator(self):
+        """
+        Crée un port série simulé, avec les adresses des jauges Pirani de la configuration.
+
+        Returns:
+            SimulatedSerial: Port série simulé.
+        """
+        addresses = {key: self.config[key]["address"] for key in gauge_keys(self.config)}
+        Logger.info("Using the simulated serial device.")
+        return SimulatedSerial(baudrate=self.profile.baudrate, timeout=self.profile.timeout,
+                               inter_byte_timeout=self.profile.inter_byte_timeout, device=SimulatedDevice(addresses))
+
+    def negotiate_baudrate(self, ser):
+        """
+        Passe le port au débit le plus rapide du profil accepté par le firmware (voir Cmd.Baud). Un firmware
+        qui ne répond à aucune proposition ne gère pas la négociation : le débit d'ouverture est gardé.
+
+        Args:
+            ser: Port série ouvert, pas encore utilisé par le scheduler.
+
+        Returns:
+            int: Débit retenu.
+        """
+        timeout = ser.timeout
+        ser.timeout = self.profile.response_timeout(Cmd.Baud.cmd)
+        answered = False
+        try:
+            for rate in self.profile.baudrates:
+                if rate <= ser.baudrate:
+                    break
+                index = Cmd.Baud.rates.index(rate)
+                request = bytes([Cmd.Baud.cmd, index]) # pas d'encoder : le scheduler peut utiliser l'ancien port
+                ser.reset_input_buffer()
+                ser.write(request)
+                answer = ser.read(1)
+                if not answer:
+                    if answered:
+                        continue # réponse perdue
+                    Logger.info("Baud rate negotiation not supported by the firmware.")
+                    break
+                answered = True
+                if answer[0] != index:
+                    continue # débit refusé, on essaie le suivant
+
+                previous = ser.baudrate
+                ser.baudrate = rate
+                ser.reset_input_buffer()
+                ser.write(request)
+                if ser.read(1) == bytes([index]):
+                    Logger.info(f"Serial link negotiated at {rate} baud.")
+                    break
+                # confirmation perdue : le firmware revient de lui-même au débit précédent
+                ser.baudrate = previous
+                time.sleep(Cmd.Baud.confirm_timeout)
+                ser.reset_input_buffer()
+        except (SerialException, ValueError) as e:
+            Logger.warning(f"Baud rate negotiation failed on {ser.port}: {e}")
+        finally:
+            ser.timeout = timeout
+        return ser.baudrate
+
+    def response_timeout(self, command):
+        """
+        Renvoie le délai de lecture de la réponse d'une commande : le sien s'il en a un, sinon celui du profil du port.
+
+        Args:
+            command (SerialCommand): Commande envoyée.
+        """
+        if command.response_timeout is not None:
+            return command.response_timeout
+        return self.profile.response_timeout(command.type)
+
+    def set_response_timeout(self, command):
+        """
+        Applique au port le délai de lecture de la réponse d'une commande (voir response_timeout). Appelé uniquement
+        depuis le thread du scheduler.
+
+        Args:
+            command (SerialCommand): Commande envoyée.
+        """
+        timeout = self.response_timeout(command)
+        if self.ser is not None and self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+
     def float_to_bytes(self, f):
         """
         Convertit un nombre flottant en bytes au format little-endian.
@@ -71,7 +258,372 @@ class SerialReader(QObject):
         # Convertir le float en bytes en little-endian
         return struct.pack('<f', f)
     
-    def send_data(self, type, data, other_data=[]):
+    def send_data(self, type, data, other_data=[], priority=Priority.WRITE, timeout=None):
+        """
+        Ajoute une commande sans réponse à la file du scheduler série.
+
+        Args:
+            type (int): Type de données à envoyer.
+            data: Données à envoyer.
+            other_data (list): Autres données à envoyer.
+            priority (int): Priorité de la commande.
+            timeout (float): Délai en secondes au-delà duquel la commande est abandonnée si elle n'a pas été envoyée.
+
+        Returns:
+            Future: Future terminé une fois la commande envoyée.
+        """
+        if type == 0:
+            self.outputs[data // 2] = data % 2
+        elif type in (Cmd.MFC1, Cmd.MFC2, Cmd.Generator1.AO, Cmd.Generator2.AO) or (type == Cmd.ThrottleValve.cmd and data == Cmd.ThrottleValve.set_position):
+            self.setpoints[type] = (data, other_data)
+        return self.scheduler.submit(SerialCommand(type, data, other_data, priority=priority, timeout=timeout))
+
+    def replay_outputs(self):
+        """
+        Renvoie les dernières sorties demandées après une reconnexion : le firmware a pu redémarrer avec toutes
+        ses sorties au repos. Rien n'est envoyé tant que le firmware ne répond pas à une lecture des DI ; les consignes
+        analogiques sont ensuite renvoyées avant les sorties numériques, pour que les débits soient fixés avant
+        l'ouverture des vannes. Appelé depuis le thread de reconnexion.
+
+        Returns:
+            bool: True si les sorties ont été renvoyées.
+        """
+        deadline = time.monotonic() + self.replay_wait
+        while self.query(1, 0, num_values=4, priority=Priority.SAFETY).result() is None:
+            if self.ser is None or time.monotonic() > deadline:
+                Logger.warning("Firmware not answering after reconnection, outputs not replayed.")
+                return False
+        for type, (data, other_data) in list(self.setpoints.items()):
+            self.send_data(type, data, other_data, priority=Priority.SAFETY)
+        for action, state in sorted(self.outputs.items()):
+            self.send_data(0, action * 2 + state, priority=Priority.SAFETY)
+        Logger.info(f"Replayed {len(self.setpoints)} setpoints and {len(self.outputs)} outputs after reconnection.")
+        return True
+
+    def query(self, type, data, other_data=[], num_values=0, until=b"", frame=False, priority=Priority.POLL, timeout=None, response_timeout=None):
+        """
+        Ajoute une commande avec réponse à la file du scheduler série.
+
+        Args:
+            type (int): Type de données à envoyer.
+            data: Données à envoyer.
+            other_data (list): Autres données à envoyer.
+            num_values (int): Nombre d'octets de réponse à lire.
+            until (bytes): Données jusqu'auxquelles lire la réponse.
+            frame (bool): True si la réponse est une trame préfixée par sa longueur.
+            priority (int): Priorité de la commande.
+            timeout (float): Délai en secondes au-delà duquel la commande est abandonnée si elle n'a pas été envoyée.
+            response_timeout (float): Délai de lecture de la réponse en secondes, None pour celui du profil du port.
+
+        Returns:
+            Future: Future contenant la réponse (bytes), ou None en cas d'erreur.
+        """
+        return self.scheduler.submit(SerialCommand(type, data, other_data, num_values, until, frame, priority, timeout, response_timeout))
+
+    def run_async(self, function, *args, callback=None):
+        """
+        Exécute une fonction bloquante (par exemple une suite de commandes RS485) hors du thread de l'interface.
+
+        Args:
+            function: Fonction à exécuter.
+            *args: Arguments de la fonction.
+            callback: Fonction appelée dans le thread de l'interface avec le Future une fois la fonction terminée.
+
+        Returns:
+            Future: Future contenant le résultat de la fonction.
+        """
+        future = self.executor.submit(function, *args)
+        self.on_done(future, callback)
+        return future
+
+    def on_done(self, future, callback=None):
+        """
+        Appelle callback dans le thread de l'interface quand le Future est terminé. Les erreurs sont journalisées.
+
+        Args:
+            future (Future): Future d'une commande ou de run_async.
+            callback: Fonction appelée avec le Future, ou None.
+        """
+        future.add_done_callback(lambda future: self.result_ready.emit(callback, future))
+
+    def deliver_result(self, callback, future):
+        """
+        Reçoit dans le thread de l'interface le Future terminé et appelle son callback.
+
+        Args:
+            callback: Fonction appelée avec le Future, ou None.
+            future (Future): Future terminé.
+        """
+        if future.exception() is not None:
+            Logger.warning(f"Serial operation failed: {future.exception()}")
+        if callback is not None:
+            callback(future)
+
+    def execute(self, command):
+        """
+        Exécute une commande sur le port série. Appelé uniquement depuis le thread du scheduler.
+
+        Args:
+            command (SerialCommand): Commande à exécuter.
+
+        Returns:
+            bytes: Réponse lue, ou None si aucune réponse n'est attendue ou en cas d'erreur.
+        """
+        if self.use_frames(command):
+            return self.execute_framed(command)
+        self.transmit(command.type, command.data, command.other_data)
+        if not command.expects_response():
+            return None
+        self.set_response_timeout(command)
+        if command.frame:
+            return self.wait_and_read_frame()
+        return self.wait_and_read_data(command.num_values, command.until)
+
+    def use_frames(self, command):
+        """
+        Indique si une commande doit être envoyée dans une trame. Tant que le firmware n'a pas répondu à une trame,
+        seules les commandes avec réponse sont tramées : une écriture n'est jamais envoyée à un firmware qui ne la comprendrait pas.
+
+        Args:
+            command (SerialCommand): Commande à exécuter.
+        """
+        if self.ser is None or self.framed is False or not self.config.value.get("serial", {}).get("framed", False):
+            return False
+        return self.framed or command.expects_response()
+
+    def execute_framed(self, command):
+        """
+        Exécute une commande avec le protocole tramé : la réponse est identifiée par son numéro de séquence,
+        sans vider le buffer de réception. Si le firmware ne répond à aucune des frame_probes premières trames,
+        le protocole historique est utilisé à la place.
+
+        Args:
+            command (SerialCommand): Commande à exécuter.
+
+        Returns:
+            bytes: Réponse (sans l'octet de longueur pour les commandes à trame), ou None.
+        """
+        sequence = self.sequence
+        self.sequence = (self.sequence + 1) & 0xFF
+        try:
+            self.ser.write(self.encoder.encode_frame(sequence, command.type, command.data, command.other_data))
+        except SerialException:
+            self.disconnected()
+            return None
+        if not command.expects_response():
+            return None
+
+        self.set_response_timeout(command)
+        response = self.read_framed_response(sequence)
+        if response is None:
+            if command.priority == Priority.SCAN: # adresse RS485 sans jauge : le firmware n'a rien à renvoyer
+                return None
+            self.frame_failures += 1
+            if self.framed is None and self.frame_failures >= self.frame_probes and self.ser is not None:
+                Logger.warning("Framed protocol not supported by the firmware, falling back to the legacy protocol.")
+                self.framed = False
+                self.ser.reset_input_buffer()
+                self.frame_decoder.clear()
+                return self.execute(command)
+            return None
+        self.framed = True
+        self.frame_failures = 0
+        return self.framed_result(command, response)
+
+    def framed_result(self, command, response):
+        """
+        Renvoie le résultat d'une commande à partir du contenu de sa trame de réponse.
+
+        Args:
+            command (SerialCommand): Commande exécutée.
+            response (bytes): Contenu de la trame de réponse.
+
+        Returns:
+            bytes: Réponse, sans l'octet de longueur pour les commandes à trame (None si cette longueur est fausse).
+        """
+        if command.frame:
+            # réponse historique préfixée par sa longueur
+            if len(response) == 0 or response[0] != len(response) - 1:
+                return None
+            return response[1:]
+        return response
+
+    def pipelined(self):
+        """
+        Indique si les commandes peuvent être envoyées sans attendre la réponse des précédentes : le firmware
+        a répondu en protocole tramé et la fenêtre ("window" dans la section "serial" de la configuration) dépasse 1.
+        """
+        return self.framed is True and self.ser is not None and self.config.value.get("serial", {}).get("window", 4) > 1
+
+    def send_pipelined(self, command):
+        """
+        Envoie une commande tramée sans attendre sa réponse. Son Future est terminé par le thread de réception
+        quand la trame de même numéro de séquence arrive, ou avec None après son délai de lecture.
+        Bloque tant que la fenêtre est pleine (nombre de requêtes ou d'octets en vol). Appelé uniquement depuis
+        le thread du scheduler.
+
+        Args:
+            command (SerialCommand): Commande à envoyer.
+        """
+        settings = self.config.value.get("serial", {})
+        window = settings.get("window", 4)
+        window_bytes = settings.get("window_bytes", 64) # buffer de réception de l'Arduino
+        frame = self.encoder.encode_frame(0, command.type, command.data, command.other_data)
+        size = len(frame)
+
+        with self.pipeline:
+            while self.in_flight and (len(self.in_flight) >= window or self.in_flight_bytes + size > window_bytes):
+                self.pipeline.wait(0.05)
+            sequence = self.sequence
+            while sequence in self.in_flight:
+                sequence = (sequence + 1) & 0xFF
+            self.sequence = (sequence + 1) & 0xFF
+            self.encoder.set_sequence(sequence)
+            if command.expects_response():
+                self.in_flight[sequence] = (command, time.monotonic(), size)
+                self.in_flight_bytes += size
+        if self.receiver is None or not self.receiver.is_alive():
+            self.receiver = threading.Thread(target=self.receive_frames, name="SerialReceiver", daemon=True)
+            self.receiver.start()
+
+        try:
+            self.ser.write(frame)
+        except (SerialException, AttributeError):
+            self.disconnected()
+        if not command.expects_response():
+            command.future.set_result(None)
+
+    def receive_frames(self):
+        """
+        Boucle du thread de réception du pipeline : lit les trames et termine le Future de la requête de même
+        numéro de séquence. Les requêtes sans réponse après leur délai de lecture sont terminées avec None.
+        Le thread s'arrête quand le pipeline n'est plus utilisé.
+        """
+        decoder = self.frame_decoder
+        while True:
+            ser = self.ser
+            if ser is None or self.framed is not True:
+                self.expire_in_flight(force=True)
+                with self.pipeline:
+                    if not self.in_flight:
+                        self.receiver = None
+                        return
+                continue
+            try:
+                data = ser.read(max(1, ser.in_waiting))
+            except SerialException:
+                self.disconnected()
+                continue
+            decoder.feed(data)
+            while True:
+                frame = decoder.next_frame()
+                if frame is None:
+                    if data or not decoder.resync(): # sans nouvel octet, une trame incomplète en tête est abandonnée
+                        break
+                    continue
+                with self.pipeline:
+                    entry = self.in_flight.pop(frame[0], None)
+                    if entry is not None:
+                        self.in_flight_bytes -= entry[2]
+                        self.pipeline.notify_all()
+                if entry is None:
+                    self.late_frames += 1
+                    Logger.debug(f"Dropping late serial frame {frame[0]}")
+                    continue
+                self.frame_failures = 0
+                if not entry[0].future.done():
+                    entry[0].future.set_result(self.framed_result(entry[0], frame[1]))
+            self.expire_in_flight()
+
+    def expire_in_flight(self, force=False):
+        """
+        Termine avec None les requêtes en vol sans réponse après leur délai de lecture (voir PortProfile).
+
+        Args:
+            force (bool): True pour terminer toutes les requêtes en vol (port fermé ou changé).
+        """
+        now = time.monotonic()
+        expired = []
+        with self.pipeline:
+            for sequence, (command, sent, size) in list(self.in_flight.items()):
+                if force or now - sent > self.response_timeout(command):
+                    del self.in_flight[sequence]
+                    self.in_flight_bytes -= size
+                    expired.append(command)
+            if expired:
+                self.pipeline.notify_all()
+        for command in expired:
+            if command.priority != Priority.SCAN: # voir execute_framed
+                self.frame_failures += 1
+            if not command.future.done():
+                command.future.set_result(None)
+
+    def read_framed_response(self, sequence):
+        """
+        Lit les trames reçues jusqu'à celle qui porte le numéro de séquence attendu. Les réponses arrivées
+        trop tard pour une requête précédente sont ignorées. Appelé uniquement depuis le thread du scheduler.
+
+        Args:
+            sequence (int): Numéro de séquence de la requête.
+
+        Returns:
+            bytes: Contenu de la trame de réponse, ou None si elle n'arrive pas avant le timeout du port.
+        """
+        decoder = self.frame_decoder
+        timed_out = False
+        try:
+            while True:
+                frame = decoder.next_frame()
+                while frame is not None:
+                    if frame[0] == sequence:
+                        return frame[1]
+                    self.late_frames += 1
+                    Logger.debug(f"Dropping late serial frame {frame[0]} (waiting for {sequence})")
+                    frame = decoder.next_frame()
+                if timed_out:
+                    # plus rien n'arrive : une trame incomplète en tête du buffer bloque peut-être des trames valides
+                    if decoder.resync():
+                        continue
+                    return None
+                data = self.ser.read(max(1, self.ser.in_waiting))
+                if not data:
+                    timed_out = True
+                decoder.feed(data)
+        except SerialException:
+            self.disconnected()
+            return None
+
+    def encode_command(self, type, data, other_data=[]):
+        """
+        Encode une commande du protocole historique (voir CommandEncoder). Appelé uniquement depuis le thread du scheduler.
+
+        Args:
+            type (int): Type de données à envoyer.
+            data: Données à envoyer.
+            other_data: Autres données à envoyer (bytes, ou texte pour les commandes RS485).
+
+        Returns:
+            memoryview: Commande encodée, valable jusqu'à l'encodage suivant.
+        """
+        return self.encoder.encode(type, data, other_data)
+
+    def disconnected(self):
+        """
+        Signale la perte du port série, le ferme et réveille la reconnexion automatique (voir LinkSupervisor).
+        """
+        ser = self.ser
+        if ser is None:
+            return
+        Logger.warning(f"Error while using serial port {ser.port}.")
+        self.ser = None
+        try:
+            ser.close() # libère le nom du port pour sa réapparition
+        except Exception:
+            pass
+        self.supervisor.link_lost()
+        self.error_occurred.emit(self.translator.translate("serial_port_disconnected", port=ser.port))
+
+    def transmit(self, type, data, other_data=[]):
         """
         Envoie des données via le port série.
 
@@ -82,26 +634,15 @@ class SerialReader(QObject):
         """
         if self.ser is not None:
             try:
-                self.ser.write(bytes([type]))
-                if isinstance(data, float):
-                    self.ser.write(self.float_to_bytes(data))
-                else:
-                    self.ser.write(bytes([data]))
-                for d in other_data:
-                    try:
-                        self.ser.write(d.to_bytes(1))
-                    except:
-                        self.ser.write(bytes(d,"utf-8"))
+                self.ser.write(self.encode_command(type, data, other_data))
             except SerialException:
-                Logger.warning(f"Error while sending data to serial port {self.ser.port}.")
-                self.error_occurred.emit(self.translator.translate("serial_port_disconnected", port=self.ser.port))
-                self.ser = None
+                self.disconnected()
 
 
 
     def wait_and_read_data(self, num_values=1, until:bytes="".encode()):
         """
-        Attend que des données soient disponibles sur le port série et les lit.
+        Attend que des données soient disponibles sur le port série et les lit. Appelé uniquement depuis le thread du scheduler.
 
         Args:
             num_values (int): Nombre d'octets à lire depuis le port série.
@@ -119,11 +660,77 @@ class SerialReader(QObject):
                 self.ser.reset_input_buffer()
                 return data
             except SerialException:
-                Logger.warning(f"Error while reading data from serial port {self.ser.port}.")
-                self.error_occurred.emit(self.translator.translate("serial_port_disconnected", port=self.ser.port))
-                self.ser = None
+                self.disconnected()
         return None
 
+    def wait_and_read_frame(self):
+        """
+        Attend une trame préfixée par sa longueur (1 octet) et la lit entièrement. Appelé uniquement depuis le thread du scheduler.
+
+        Returns:
+            bytes: Contenu de la trame (sans l'octet de longueur), ou None en cas d'erreur ou de trame incomplète.
+        """
+        if self.ser is not None:
+            try:
+                length = self.ser.read(1)
+                data = self.ser.read(length[0]) if len(length) == 1 else b""
+                self.ser.reset_input_buffer()
+                if len(length) == 1 and len(data) == length[0]:
+                    return data
+            except SerialException:
+                self.disconnected()
+        return None
+
+    def read_all_inputs(self):
+        """
+        Lit toutes les entrées (DI, AI et throttle valve) en une seule requête.
+
+        Returns:
+            tuple: (DI sur 4 octets, tableau NumPy des 8 entrées analogiques, capteurs de la throttle valve, position de la throttle valve),
+            ou None si la réponse est absente ou invalide.
+        """
+        data = self.query(Cmd.ReadAll.cmd, 0, frame=True, priority=Priority.SAFETY).result()
+        if data is None or len(data) != Cmd.ReadAll.length:
+            return None
+        values = struct.unpack(Cmd.ReadAll.format, data)
+        return values[0], np.frombuffer(data, dtype='<f4', count=8, offset=4), values[9], values[10]
+
+    def read_AI_frame(self, bank=0, timeout=None):
+        """
+        Lit un banc d'entrées analogiques avec la trame binaire (Cmd.AIFrame).
+
+        Args:
+            bank (int): Banc à lire (0 : les 8 entrées, 1 : entrées de la commande 6, 2 : entrées de la commande 7).
+            timeout (float): Délai en secondes au-delà duquel la requête est abandonnée si elle n'a pas été envoyée.
+
+        Returns:
+            Future: Future contenant la trame (bytes) à décoder avec decode_AI_frame.
+        """
+        return self.query(Cmd.AIFrame.cmd, bank, frame=True, timeout=timeout)
+
+    def read_DI_edges(self, port, timeout=None):
+        """
+        Vide le journal des fronts horodatés par le firmware pour un port de DI (la première requête arme la surveillance).
+
+        Args:
+            port (int): Port de DI (1 à 4).
+            timeout (float): Délai en secondes au-delà duquel la requête est abandonnée si elle n'a pas été envoyée.
+
+        Returns:
+            tuple: (horloge du firmware en µs, valeur actuelle du port, liste de (µs, valeur) pour chaque front),
+            ou None si la réponse est absente ou invalide.
+        """
+        data = self.query(Cmd.DIEdges.cmd, port, frame=True, priority=Priority.SAFETY, timeout=timeout).result()
+        header_size = struct.calcsize(Cmd.DIEdges.header)
+        edge_size = struct.calcsize(Cmd.DIEdges.edge)
+        if data is None or len(data) < header_size:
+            return None
+        now, value, count = struct.unpack_from(Cmd.DIEdges.header, data)
+        if len(data) != header_size + count * edge_size:
+            return None
+        edges = [struct.unpack_from(Cmd.DIEdges.edge, data, header_size + i * edge_size) for i in range(count)]
+        return now, value, edges
+
     def write_data(self, action, state):
         """
         Écrit des données via le port série.
@@ -131,8 +738,11 @@ class SerialReader(QObject):
         Args:
             action (int): Action à écrire.
             state (int): État à écrire.
+
+        Returns:
+            Future: Future terminé une fois la commande envoyée.
         """
-        self.send_data(0, action*2 + state)
+        return self.send_data(0, action*2 + state)
 
 
 
@@ -140,101 +750,202 @@ class SerialReader(QObject):
 
 class SerialReaderThread(QThread):
     """
-    Constructeur de la classe SerialReaderThread.
+    Thread de lecture périodique des entrées. Les widgets ne sont jamais modifiés depuis ce thread :
+    les valeurs de chaque cycle sont envoyées à l'interface dans un PollSnapshot par le signal snapshot_ready.
 
     Args:
         gui: Interface utilisateur associée.
     """
+    snapshot_ready = pyqtSignal(object) # PollSnapshot
+
+    startup_delay = 3000 # ms
+    poll_interval = 1000 # ms, lecture commande par commande
+    batched_poll_interval = 200 # ms, lecture groupée
+    poll_timeout = 1.0 # s, une lecture périodique non envoyée après ce délai est abandonnée
+    probe_attempts = 3 # réponses manquantes consécutives avant de conclure que le firmware ne gère pas une commande
+
     def __init__(self, gui):
         super().__init__()
         self.parent = gui
         self.serial_reader = gui.serial_reader
         self.RS485 = gui.RS485
-        self.custom_widgets = gui.custom_widgets
-
+        self.batched_read = None # None tant que le support de la lecture groupée par le firmware n'est pas connu
+        self.binary_AI = None # idem pour la trame binaire des entrées analogiques
+        self.batched_failures = 0
+        self.binary_AI_failures = 0
+        self.connection = None # numéro de l'ouverture du port pour laquelle les détections sont valables
+        self.running = True
+        self.telemetry = TelemetryRecorder(gui.config)
 
     def run(self):
         """
         Démarre le thread de lecture série.
         """
-        self.msleep(3000) #attend que tous démarre bien
-        while True:
-            if self.serial_reader.busy == False and self.serial_reader.ser is not None:
+        self.msleep(self.startup_delay) #attend que tous démarre bien
+        while self.running:
+            if self.serial_reader.ser is not None:
+                self.check_connection()
+                snapshot = PollSnapshot()
                 try:
-                    #read all DI
-                    self.serial_reader.busy = True # tell to serial_reader that it will be busy for some time
-                    self.serial_reader.send_data(1,0)
-                    data = self.serial_reader.wait_and_read_data(4)
-                    # print(data)
-                    if data is not None and len(data) == 4:
-                        self.custom_widgets["wafer_lift2"].update_DI(data[0] & Cmd.wafer_lift2.Up, data[0] & Cmd.wafer_lift2.Down)
-                        self.custom_widgets["wafer_lift3"].update_DI(data[0] & Cmd.wafer_lift3.Up, data[0] & Cmd.wafer_lift3.Down)
-                        self.custom_widgets["slit_valve"].update_DI(data[0] & Cmd.slit_valve.Up, data[0] & Cmd.slit_valve.Down)
-                        self.custom_widgets["wafer_lift1"].update_DI(data[0] & Cmd.wafer_lift1.Up, data[0] & Cmd.wafer_lift1.Down)
-                        
-                        self.custom_widgets["roughing_pump"].update_DI(data[2] & 2)
-                        self.custom_widgets["turbo_pump_rga"].update_DI(data[1] & 64)
-                        self.custom_widgets["turbo_pump_ch"].update_DI(data[1] & 32)
-
-                        self.custom_widgets["turbo_pump_gate"].update_sensors(data[1] & Cmd.RGAGate.Up, data[1] & Cmd.RGAGate.Down)
-
-                        
-                        self.custom_widgets["interlock"].update_interlock([data[2] & Cmd.Interlock.RoughingPumpOff,
-                                                                            data[2] & Cmd.Interlock.PumpPressureHigh,
-                                                                            data[2] & Cmd.Interlock.ChamberOpen,
-                                                                            data[2] & Cmd.Interlock.ChamberPressureHigh
-                                                                            ])
-                        QTimer.singleShot(0, self.parent.update_AI)
-
-                    # read analog inputs 1 (MFC1, MFC2, baratron1, baratron2)
-                    self.serial_reader.send_data(6,4)
-                    data = None
-                    data = self.serial_reader.wait_and_read_data(until='\n'.encode())
-                    if data is not None and len(data) > 0:
-                        data = data.decode().strip().split(' ')
-                        self.custom_widgets["MFC1"].update_AI(data[0])
-                        self.custom_widgets["MFC2"].update_AI(data[1])
-                        self.custom_widgets["baratron1"].update_AI(data[2])
-                        self.custom_widgets["baratron2"].update_AI(data[3])
-                        
-                    #read analog inputs 2 (generator1 source power, generator1 reflected power, generator2 source power, generator2 reflected power)
-                    self.serial_reader.send_data(7,4)
-                    data = None
-                    data = self.serial_reader.wait_and_read_data(until='\n'.encode())
-                    if data is not None and len(data) > 0:
-                        data = data.decode().strip().split(' ')
-                        self.custom_widgets["generator1"].update_AI(data[0:2])
-                        self.custom_widgets["generator2"].update_AI(data[2:4])
-                        
-                    # read RS485 sensors
-                    for key in ["chamber_pressure","pump_pressure"]:
-                        data = None
-                        data = self.RS485.pirani[key].read_pressure()
-                        # print(data)
-                        if len(data)==2 or data[0]=='error':
-                            self.custom_widgets[key].update_pressure(data)
-
-                    # read throttle valve sensor
-                    self.serial_reader.send_data(9, Cmd.ThrottleValve.sensors)
-                    data = self.serial_reader.wait_and_read_data(1)
-                    # print(data)
-                    self.custom_widgets["throttle_valve"].update_sensor(data[0])
-                    data = None
-                    # read throttle valve position
-                    self.serial_reader.send_data(9, Cmd.ThrottleValve.position)
-                    data = self.serial_reader.wait_and_read_data(2)
-                    # print(data)
-                    self.custom_widgets["throttle_valve"].update_position(int.from_bytes(data, byteorder='big'))
-
-
+                    if self.batched_read is not False:
+                        self.read_batched_inputs(snapshot)
+                    if self.batched_read is not True:
+                        self.read_inputs(snapshot)
+                except Exception as e:
+                    Logger.error(f"Serial Reader: {e}")
 
+                # read RS485 sensors : jauges dont la lecture est due (voir RS485.poll), même si la lecture des entrées a échoué
+                try:
+                    for key, sample in self.RS485.poll():
+                        snapshot.values[key] = sample
+                        self.record_pressure(key, sample)
                 except Exception as e:
-                    print("Serial Reader:",e)
-                    pass
+                    Logger.error(f"Serial Reader: {e}")
+
+                if snapshot:
+                    snapshot.timestamp = time.monotonic()
+                    self.snapshot_ready.emit(snapshot)
 
-                self.serial_reader.busy = False # free the serial reader
-                self.msleep(1000) # Sleep for 1 second
+                self.msleep(self.batched_poll_interval if self.batched_read else self.poll_interval)
             else:
-                # print("busy")
                 self.msleep(50)
 
+    def stop(self):
+        """
+        Demande l'arrêt du thread à la fin du cycle de lecture en cours.
+        """
+        self.running = False
+
+    def check_connection(self):
+        """
+        Oublie les détections du firmware (lecture groupée, trame binaire des AI) quand le port a été rouvert :
+        l'appareil n'est peut-être plus le même.
+        """
+        if self.connection != self.serial_reader.connections:
+            self.connection = self.serial_reader.connections
+            self.batched_read = None
+            self.binary_AI = None
+            self.batched_failures = 0
+            self.binary_AI_failures = 0
+
+    def read_batched_inputs(self, snapshot):
+        """
+        Lit toutes les entrées avec la commande groupée. Si le firmware ne répond à aucune des probe_attempts
+        premières tentatives, la lecture groupée est désactivée et la lecture commande par commande est utilisée.
+
+        Args:
+            snapshot (PollSnapshot): Instantané du cycle en cours, complété avec les valeurs lues.
+        """
+        data = self.serial_reader.read_all_inputs()
+        if data is None:
+            if self.batched_read is None:
+                self.batched_failures += 1
+                if self.batched_failures >= self.probe_attempts:
+                    Logger.warning("Batched read not supported by the firmware, falling back to one command per input.")
+                    self.batched_read = False
+            return
+        self.batched_read = True
+        DI, AI, sensors, position = data
+        self.update_DI(snapshot, DI)
+        self.update_AI(snapshot, AI)
+        self.update_throttle_valve(snapshot, sensors, position)
+
+    def read_inputs(self, snapshot):
+        """
+        Lit les entrées commande par commande (DI, AI en trame binaire ou AI 1 et AI 2 en texte, puis throttle valve).
+
+        Args:
+            snapshot (PollSnapshot): Instantané du cycle en cours, complété avec les valeurs lues.
+        """
+        # toutes les requêtes sont mises en file d'un coup, les écritures de l'opérateur peuvent s'intercaler entre elles
+        timeout = self.poll_timeout
+        #read all DI
+        DI = self.serial_reader.query(1, 0, num_values=4, priority=Priority.SAFETY, timeout=timeout)
+        if self.binary_AI is not False:
+            # read all analog inputs in one binary frame
+            AI = self.serial_reader.read_AI_frame(0, timeout=timeout)
+        else:
+            # read analog inputs 1 (MFC1, MFC2, baratron1, baratron2)
+            AI1 = self.serial_reader.query(6, 4, until=b"\n", timeout=timeout)
+            #read analog inputs 2 (generator1 source power, generator1 reflected power, generator2 source power, generator2 reflected power)
+            AI2 = self.serial_reader.query(7, 4, until=b"\n", timeout=timeout)
+        # read throttle valve sensor
+        sensors = self.serial_reader.query(9, Cmd.ThrottleValve.sensors, num_values=1, timeout=timeout)
+        # read throttle valve position
+        position = self.serial_reader.query(9, Cmd.ThrottleValve.position, num_values=2, timeout=timeout)
+
+        data = response(DI)
+        if data is not None and len(data) == 4:
+            self.update_DI(snapshot, data)
+
+        if self.binary_AI is not False:
+            values = decode_AI_frame(response(AI))
+            if values is not None and len(values) == 8:
+                self.binary_AI = True
+                self.update_AI(snapshot, values)
+            elif self.binary_AI is None:
+                self.binary_AI_failures += 1
+                if self.binary_AI_failures >= self.probe_attempts:
+                    Logger.warning("Binary AI frame not supported by the firmware, falling back to text AI commands.")
+                    self.binary_AI = False
+        else:
+            AI1, AI2 = response(AI1), response(AI2)
+            if AI1 is not None and len(AI1) > 0 and AI2 is not None and len(AI2) > 0:
+                self.update_AI(snapshot, AI1.decode().strip().split(' ') + AI2.decode().strip().split(' '))
+
+        sensors, position = response(sensors), response(position)
+        if sensors is not None and len(sensors) == 1 and position is not None and len(position) == 2:
+            self.update_throttle_valve(snapshot, sensors[0], int.from_bytes(position, byteorder='big'))
+
+    def record_pressure(self, key, sample):
+        """
+        Enregistre une lecture d'une jauge Pirani dans la télémétrie, avec la pression en Torr (nan si la jauge est en erreur).
+
+        Args:
+            key (str): Clé de la jauge.
+            sample (PiraniSample): Lecture de la jauge.
+        """
+        if sample.error:
+            values = [math.nan, math.nan]
+        else:
+            values = [sample.pressure, sample.status]
+        self.telemetry.record(key, values, sample.timestamp)
+
+    def update_DI(self, snapshot, data):
+        """
+        Enregistre les 4 octets de DI dans la télémétrie et dans l'instantané.
+
+        Args:
+            snapshot (PollSnapshot): Instantané du cycle en cours.
+            data (bytes): États des entrées numériques.
+        """
+        self.telemetry.record("DI", list(data))
+        snapshot.values["DI"] = bytes(data)
+
+    def update_AI(self, snapshot, data):
+        """
+        Enregistre les 8 entrées analogiques dans la télémétrie et dans l'instantané.
+
+        Args:
+            snapshot (PollSnapshot): Instantané du cycle en cours.
+            data: MFC1, MFC2, baratron1, baratron2, puis puissance source et réfléchie des générateurs 1 et 2
+                (tableau NumPy des trames binaires ou textes des commandes 6 et 7).
+        """
+        try:
+            values = np.asarray(data, dtype=np.float32) # les textes ne sont convertis qu'ici, une seule fois
+        except ValueError:
+            return
+        self.telemetry.record("AI", values)
+        snapshot.values["AI"] = tuple(values.tolist())
+
+    def update_throttle_valve(self, snapshot, sensors, position):
+        """
+        Enregistre l'état de la throttle valve dans la télémétrie et dans l'instantané.
+
+        Args:
+            snapshot (PollSnapshot): Instantané du cycle en cours.
+            sensors (int): Octet des capteurs ouvert/fermé.
+            position (int): Position actuelle en pas.
+        """
+        self.telemetry.record("throttle_valve", [sensors, position])
+        snapshot.values["throttle_valve"] = (sensors, position)
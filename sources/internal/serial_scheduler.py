@@ -0,0 +1,168 @@
+from concurrent.futures import Future
+import itertools
+import queue
+import threading
+import time
+
+from internal.logger import Logger
+
+
+class Priority:
+    """
+    Cette classe contient les niveaux de priorité des commandes série. Plus la valeur est faible, plus la commande est prioritaire.
+    """
+    SAFETY = 0 # lectures liées à la sécurité (interlock, capteurs)
+    WRITE = 1 # écritures demandées par l'opérateur (vannes, consignes)
+    POLL = 2 # lectures périodiques en tâche de fond
+    SCAN = 3 # recherche des jauges du bus RS485, seulement quand il ne reste rien d'autre à envoyer
+
+
+class SerialCommand:
+    """
+    Cette classe représente une commande à envoyer sur le port série et la réponse attendue.
+
+    Attributes:
+        type: Type de la commande (premier octet envoyé).
+        data: Donnée principale de la commande.
+        other_data: Autres données à envoyer.
+        num_values: Nombre d'octets de réponse attendus (0 si aucune réponse n'est attendue).
+        until: Terminateur de la réponse attendue.
+        frame: True si la réponse est une trame préfixée par sa longueur.
+        priority: Priorité de la commande (voir Priority).
+        deadline: Instant (time.monotonic) après lequel la commande n'est plus envoyée, ou None.
+        response_timeout: Délai de lecture de la réponse en secondes, ou None pour celui du profil du port.
+        future: Future contenant la réponse une fois la commande exécutée.
+
+    Methods:
+        __init__(self, type, data, other_data=(), num_values=0, until=b"", frame=False, priority=Priority.WRITE, timeout=None, response_timeout=None):
+            Constructeur de la classe SerialCommand.
+
+        expects_response(self):
+            Indique si une réponse est attendue.
+
+        is_expired(self):
+            Indique si la date limite de la commande est dépassée.
+    """
+    def __init__(self, type, data, other_data=(), num_values=0, until=b"", frame=False, priority=Priority.WRITE, timeout=None, response_timeout=None):
+        """
+        Constructeur de la classe SerialCommand.
+
+        Args:
+            type (int): Type de la commande.
+            data: Donnée principale de la commande.
+            other_data: Autres données à envoyer.
+            num_values (int): Nombre d'octets de réponse attendus.
+            until (bytes): Terminateur de la réponse attendue.
+            frame (bool): True si la réponse est une trame préfixée par sa longueur.
+            priority (int): Priorité de la commande.
+            timeout (float): Délai en secondes au-delà duquel la commande est abandonnée si elle n'a pas été envoyée.
+            response_timeout (float): Délai de lecture de la réponse en secondes, None pour celui du profil du port.
+        """
+        self.type = type
+        self.data = data
+        self.other_data = other_data
+        self.num_values = num_values
+        self.until = until.encode() if isinstance(until, str) else until
+        self.frame = frame
+        self.priority = priority
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.response_timeout = response_timeout
+        self.future = Future()
+        self.sequence = 0
+
+    def expects_response(self):
+        """
+        Indique si une réponse est attendue.
+
+        Returns:
+            bool: True si une réponse doit être lue après l'envoi.
+        """
+        return self.num_values > 0 or self.until != b"" or self.frame
+
+    def is_expired(self):
+        """
+        Indique si la date limite de la commande est dépassée.
+
+        Returns:
+            bool: True si la commande ne doit plus être envoyée.
+        """
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class SerialScheduler:
+    """
+    Cette classe possède le port série : un unique thread exécute les commandes par ordre de priorité,
+    puis par ordre d'arrivée à priorité égale. En protocole tramé, ce thread envoie les commandes sans attendre
+    leur réponse, dans la limite de la fenêtre du pipeline (voir SerialReader.send_pipelined).
+
+    Methods:
+        __init__(self, serial_reader):
+            Constructeur de la classe SerialScheduler.
+
+        submit(self, command):
+            Ajoute une commande à la file et renvoie son Future.
+
+        stop(self):
+            Arrête le thread du scheduler.
+
+        run(self):
+            Boucle d'exécution des commandes.
+    """
+    def __init__(self, serial_reader):
+        """
+        Constructeur de la classe SerialScheduler.
+
+        Args:
+            serial_reader: Objet SerialReader qui exécute les commandes sur le port.
+        """
+        self.serial_reader = serial_reader
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count(1)
+        self.thread = threading.Thread(target=self.run, name="SerialScheduler", daemon=True)
+        self.thread.start()
+
+    def submit(self, command):
+        """
+        Ajoute une commande à la file et renvoie son Future.
+
+        Args:
+            command (SerialCommand): Commande à exécuter.
+
+        Returns:
+            Future: Future contenant la réponse (bytes, ou None si le port n'est pas disponible).
+        """
+        command.sequence = next(self.counter)
+        self.queue.put(command)
+        return command.future
+
+    def stop(self):
+        """
+        Arrête le thread du scheduler après la commande en cours.
+        """
+        stop_command = SerialCommand(None, None, priority=-1)
+        self.queue.put(stop_command)
+
+    def run(self):
+        """
+        Boucle d'exécution des commandes.
+        """
+        while True:
+            command = self.queue.get()
+            if command.type is None:
+                break
+            if command.is_expired():
+                command.future.set_exception(TimeoutError(f"Serial command {command.type} expired before being sent."))
+                continue
+            if not command.future.set_running_or_notify_cancel():
+                continue
+            try:
+                if self.serial_reader.pipelined():
+                    self.serial_reader.send_pipelined(command) # le Future est terminé à la réception de la réponse
+                else:
+                    command.future.set_result(self.serial_reader.execute(command))
+            except Exception as e:
+                Logger.warning(f"Error while executing serial command {command.type}: {e}")
+                command.future.set_exception(e)
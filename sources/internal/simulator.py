@@ -0,0 +1,687 @@
+"""
+Ce module simule l'Arduino du banc de test et les jauges Pirani du bus RS485, sans matériel.
+
+SimulatedDevice implémente les commandes série (0 à 13), tramées ou non (Cmd.Frame), telles qu'attendues
+par SerialReader et RS485, avec une dynamique de pression simplifiée (pompage, mise à l'air, débit des MFC).
+
+SimulatedSerial expose le sous-ensemble de l'interface de serial.Serial utilisé par SerialReader
+(write, read, read_until, reset_input_buffer, in_waiting, close) avec une latence, une gigue
+et une perte d'octets configurables.
+"""
+from collections import deque
+import math
+import random
+import struct
+import threading
+import time
+
+from serial import SerialException
+
+from internal.constant import Cmd, MCP2_A, MCP2_B, MCP3_A, MCP3_B
+from internal.serial_frame import CRC_SIZE, HEADER_SIZE, encode_frame, frame_crc
+
+
+ATMOSPHERE = 760.0 # Torr
+
+
+class SimulatedDevice:
+    """
+    Modèle de l'Arduino et des jauges Pirani.
+
+    Les sorties sont actives à l'état bas comme sur le banc : une vanne est ouverte et une pompe tourne quand leur DO vaut 0.
+    Les wafer lifts et la slit valve montent quand leur DO vaut 1. Les capteurs de fin de course sont actifs à l'état bas.
+
+    Attributes:
+        time_scale: Facteur d'accélération du temps simulé.
+        outputs: Dictionnaire des sorties numériques (action -> état).
+        analog_outputs: Dictionnaire des sorties analogiques en volts (commande -> tension).
+        chamber_pressure: Pression de la chambre en Torr.
+        pump_pressure: Pression de la ligne de pompage en Torr.
+        pirani: Dictionnaire des jauges Pirani (adresse -> paramètres de la jauge).
+        clock: Horloge simulée du firmware en secondes.
+        edge_log: Journal des fronts de chaque port de DI surveillé (port -> file de (µs, valeur)).
+        AI_format: Type des valeurs de la trame binaire des entrées analogiques (Cmd.AIFrame.int16 ou float32).
+        max_baudrate: Débit le plus rapide accepté lors de la négociation (voir Cmd.Baud).
+        baudrate: Débit actuel de la liaison.
+
+    Methods:
+        __init__(self, pirani_addresses=None, time_scale=1.0, max_baudrate=1000000):
+            Constructeur de la classe SimulatedDevice.
+
+        command_length(self, buffer):
+            Renvoie la longueur de la commande en tête du buffer, ou None si elle est incomplète.
+
+        handle(self, command):
+            Exécute une commande complète et renvoie la réponse.
+
+        step(self):
+            Fait avancer le modèle physique jusqu'à l'instant présent.
+
+        link_baudrate(self):
+            Renvoie le débit actuel de la liaison.
+    """
+    lift_travel_time = 1.5 # s
+    gate_travel_time = 2.0 # s
+    throttle_speed = 400 # pas/s
+    turbo_spin_up_time = 60 # s
+    edge_resolution = 0.001 # s, pas d'intégration pendant un mouvement, pour horodater les fronts
+
+    def __init__(self, pirani_addresses=None, time_scale=1.0, max_baudrate=1000000):
+        """
+        Constructeur de la classe SimulatedDevice.
+
+        Args:
+            pirani_addresses (dict): Adresse RS485 de chaque jauge ({"chamber_pressure": 7, "pump_pressure": 6} par défaut).
+            time_scale (float): Facteur d'accélération du temps simulé.
+            max_baudrate (int): Débit le plus rapide accepté lors de la négociation.
+        """
+        if pirani_addresses is None:
+            pirani_addresses = {"chamber_pressure": 7, "pump_pressure": 6}
+        self.time_scale = time_scale
+        self.lock = threading.Lock()
+        self.last_step = time.monotonic()
+        self.clock = 0.0
+        self.edge_log = {} # port (1 à 4) -> deque de (µs, valeur)
+        self.last_DI = None
+
+        self.outputs = {} # action -> 0/1, les sorties non écrites sont à 1 (inactives)
+        self.analog_outputs = {Cmd.MFC1: 0.0, Cmd.MFC2: 0.0, Cmd.Generator1.AO: 0.0, Cmd.Generator2.AO: 0.0}
+        self.mfc_flow = {Cmd.MFC1: 0.0, Cmd.MFC2: 0.0} # V
+
+        self.chamber_pressure = ATMOSPHERE
+        self.pump_pressure = ATMOSPHERE
+        self.turbo_speed = {Cmd.TurboRGA: 0.0, Cmd.TurboCH: 0.0} # 0 à 1
+        self.travel = {} # DO -> position de 0 (bas/fermé) à 1 (haut/ouvert)
+
+        self.throttle_position = 0
+        self.throttle_target = 0
+        self.AI_format = Cmd.AIFrame.float32
+        self.max_baudrate = max_baudrate
+        self.baudrate = 115200
+        self.baud_pending = None # (débit précédent, instant limite de la confirmation) pendant un changement de débit
+
+        self.pirani = {}
+        for key, address in pirani_addresses.items():
+            self.pirani[address] = {"key": key, "unit": 3, "gas": 0, "setpoints": ["1.0E-01", "1.0E-01"], "sn": f"SIM{address:05d}"}
+
+    def output(self, action):
+        """
+        Renvoie l'état d'une sortie numérique.
+
+        Args:
+            action (int): Numéro de la sortie.
+
+        Returns:
+            int: 0 ou 1 (les sorties jamais écrites valent 1).
+        """
+        return self.outputs.get(action, 1)
+
+    def is_open(self, action):
+        """
+        Indique si une vanne (sortie active à l'état bas) est ouverte.
+
+        Args:
+            action (int): Numéro de la sortie.
+
+        Returns:
+            bool: True si la vanne est ouverte.
+        """
+        return self.output(action) == 0
+
+    def step(self):
+        """
+        Fait avancer le modèle physique jusqu'à l'instant présent.
+        """
+        now = time.monotonic()
+        remaining = (now - self.last_step) * self.time_scale
+        self.last_step = now
+        while remaining > 0:
+            dt = min(remaining, self.edge_resolution if self.edge_log and self.is_moving() else 0.05)
+            self.integrate(dt)
+            self.clock += dt
+            remaining -= dt
+            if self.edge_log:
+                self.log_edges()
+
+    def is_moving(self):
+        """
+        Indique si un lift, la slit valve ou la vanne de la turbo n'a pas atteint sa position cible.
+        """
+        for lift in [Cmd.wafer_lift1, Cmd.wafer_lift2, Cmd.wafer_lift3, Cmd.slit_valve]:
+            if self.travel.get(lift.DO, 0.0) != float(self.output(lift.DO)):
+                return True
+        return self.travel.get(Cmd.RGAGate.DO, 0.0) != (1.0 if self.is_open(Cmd.RGAGate.DO) else 0.0)
+
+    def micros(self):
+        """
+        Renvoie l'horloge du firmware en µs sur 32 bits, comme micros() sur l'Arduino.
+        """
+        return int(self.clock * 1e6) & 0xFFFFFFFF
+
+    def log_edges(self):
+        """
+        Ajoute au journal les changements des ports surveillés depuis le dernier pas d'intégration.
+        """
+        DI = self.digital_inputs()
+        if self.last_DI is not None:
+            for port, log in self.edge_log.items():
+                if DI[port - 1] != self.last_DI[port - 1]:
+                    log.append((self.micros(), DI[port - 1]))
+        self.last_DI = DI
+
+    def read_edges(self, port):
+        """
+        Arme la surveillance d'un port de DI et vide son journal (commande 11).
+
+        Args:
+            port (int): Port de DI (1 à 4).
+
+        Returns:
+            bytes: Trame préfixée par sa longueur.
+        """
+        if port not in self.edge_log:
+            self.edge_log[port] = deque(maxlen=Cmd.DIEdges.max_edges)
+            self.last_DI = self.digital_inputs()
+        log = self.edge_log[port]
+        frame = struct.pack(Cmd.DIEdges.header, self.micros(), self.digital_inputs()[port - 1], len(log))
+        for edge in log:
+            frame += struct.pack(Cmd.DIEdges.edge, *edge)
+        log.clear()
+        return bytes([len(frame)]) + frame
+
+    def integrate(self, dt):
+        """
+        Intègre le modèle physique sur un pas de temps.
+
+        Args:
+            dt (float): Pas de temps simulé en secondes.
+        """
+        # mécanique : lifts, slit valve et vanne de la turbo
+        for lift in [Cmd.wafer_lift1, Cmd.wafer_lift2, Cmd.wafer_lift3, Cmd.slit_valve]:
+            target = float(self.output(lift.DO))
+            self.travel[lift.DO] = self.approach(self.travel.get(lift.DO, 0.0), target, dt / self.lift_travel_time)
+        target = 1.0 if self.is_open(Cmd.RGAGate.DO) else 0.0
+        self.travel[Cmd.RGAGate.DO] = self.approach(self.travel.get(Cmd.RGAGate.DO, 0.0), target, dt / self.gate_travel_time)
+
+        self.throttle_position = self.approach(self.throttle_position, self.throttle_target, self.throttle_speed * dt)
+
+        for pump in self.turbo_speed:
+            target = 1.0 if self.is_open(pump) and self.pump_pressure < 1 else 0.0
+            self.turbo_speed[pump] = self.approach(self.turbo_speed[pump], target, dt / self.turbo_spin_up_time)
+
+        for mfc in self.mfc_flow:
+            self.mfc_flow[mfc] += (self.analog_outputs[mfc] - self.mfc_flow[mfc]) * min(1.0, dt / 0.5)
+
+        # pression de la ligne de pompage : pompe primaire, équilibrage avec la chambre
+        rough_base = 5e-3
+        if self.is_open(Cmd.RoughingPump):
+            self.pump_pressure = self.relax(self.pump_pressure, rough_base, dt, 4.0)
+        if self.is_open(Cmd.iso_chamber):
+            # la chambre est dix fois plus volumineuse que la ligne de pompage
+            mean = (10 * self.chamber_pressure + self.pump_pressure) / 11
+            self.chamber_pressure = self.relax(self.chamber_pressure, mean, dt, 3.0)
+            self.pump_pressure = self.relax(self.pump_pressure, mean, dt, 0.3)
+
+        # pompage secondaire de la chambre par la turbo
+        turbo = self.turbo_speed[Cmd.TurboCH]
+        if turbo > 0 and self.travel[Cmd.RGAGate.DO] > 0.5:
+            self.chamber_pressure = self.relax(self.chamber_pressure, 1e-5, dt, 5.0 / turbo)
+
+        # mise à l'air et injection de gaz
+        if self.is_open(Cmd.nupro_vent):
+            self.chamber_pressure = self.relax(self.chamber_pressure, ATMOSPHERE, dt, 8.0)
+        if self.is_open(Cmd.nupro_final):
+            flow = 0.0
+            for mfc, nupro in [(Cmd.MFC1, Cmd.nupro_mfc1), (Cmd.MFC2, Cmd.nupro_mfc2)]:
+                if self.is_open(nupro):
+                    flow += self.mfc_flow[mfc] / 5 * 1000 # sccm
+            self.chamber_pressure = min(ATMOSPHERE, self.chamber_pressure + flow * 1e-3 * dt)
+
+    def approach(self, value, target, max_delta):
+        """
+        Rapproche une valeur de sa cible d'au plus max_delta.
+        """
+        if value < target:
+            return min(target, value + max_delta)
+        return max(target, value - max_delta)
+
+    def relax(self, value, target, dt, tau):
+        """
+        Relaxation exponentielle d'une pression vers sa cible avec la constante de temps tau.
+        """
+        return target + (value - target) * math.exp(-dt / tau)
+
+    def digital_inputs(self):
+        """
+        Calcule les 4 octets de DI.
+
+        Returns:
+            bytes: États des entrées numériques (ports MCP2_A, MCP2_B, MCP3_A, MCP3_B).
+        """
+        port = {MCP2_A: 0, MCP2_B: 0, MCP3_A: 0, MCP3_B: 0}
+        for lift in [Cmd.wafer_lift1, Cmd.wafer_lift2, Cmd.wafer_lift3, Cmd.slit_valve]:
+            travel = self.travel.get(lift.DO, 0.0)
+            # capteurs actifs à l'état bas
+            if travel < 1.0:
+                port[lift.Port] |= lift.Up
+            if travel > 0.0:
+                port[lift.Port] |= lift.Down
+        travel = self.travel.get(Cmd.RGAGate.DO, 0.0)
+        if travel < 1.0:
+            port[Cmd.RGAGate.Port] |= Cmd.RGAGate.Up
+        if travel > 0.0:
+            port[Cmd.RGAGate.Port] |= Cmd.RGAGate.Down
+        if self.turbo_speed[Cmd.TurboRGA] < 0.95:
+            port[MCP2_B] |= 64
+        if self.turbo_speed[Cmd.TurboCH] < 0.95:
+            port[MCP2_B] |= 32
+
+        if not self.is_open(Cmd.RoughingPump):
+            port[MCP3_A] |= Cmd.Interlock.RoughingPumpOff
+        if self.pump_pressure > 1.0:
+            port[MCP3_A] |= Cmd.Interlock.PumpPressureHigh
+        if self.chamber_pressure > 1.0:
+            port[MCP3_A] |= Cmd.Interlock.ChamberPressureHigh
+        return bytes([port[MCP2_A], port[MCP2_B], port[MCP3_A], port[MCP3_B]])
+
+    def analog_inputs(self):
+        """
+        Calcule les 8 entrées analogiques en volts.
+
+        Returns:
+            list: MFC1, MFC2, baratron1, baratron2, puis puissance source et réfléchie des générateurs 1 et 2.
+        """
+        baratron = min(11.0, self.chamber_pressure * 100)
+        generators = []
+        for generator in [Cmd.Generator1, Cmd.Generator2]:
+            source = self.analog_outputs[generator.AO] if self.output(generator.Enable) == 0 else 0.0
+            generators += [source, source * 0.02]
+        return [self.mfc_flow[Cmd.MFC1], self.mfc_flow[Cmd.MFC2], baratron, baratron] + generators
+
+    def AI_frame(self, bank):
+        """
+        Construit la trame binaire d'un banc d'entrées analogiques (voir Cmd.AIFrame), au format AI_format.
+
+        Args:
+            bank (int): Banc à lire (0 : les 8 entrées, 1 : entrées 1 à 4, 2 : entrées 5 à 8).
+
+        Returns:
+            bytes: Trame préfixée par sa longueur.
+        """
+        values = self.analog_inputs()[Cmd.AIFrame.banks[bank]]
+        if self.AI_format == Cmd.AIFrame.int16:
+            payload = struct.pack(f'<{len(values)}h', *(max(-32768, min(32767, round(value * 1000))) for value in values))
+        else:
+            payload = struct.pack(f'<{len(values)}f', *values)
+        frame = struct.pack(Cmd.AIFrame.header, self.AI_format, len(values)) + payload
+        frame += struct.pack(Cmd.AIFrame.checksum, sum(frame) & 0xFFFF)
+        return bytes([len(frame)]) + frame
+
+    def throttle_sensors(self):
+        """
+        Calcule l'octet des capteurs de la throttle valve (bit 1 : ouverte, bit 0 : fermée).
+        """
+        return (2 if self.throttle_position >= 800 else 0) | (1 if self.throttle_position <= 0 else 0)
+
+    def command_length(self, buffer):
+        """
+        Renvoie la longueur de la commande en tête du buffer.
+
+        Args:
+            buffer (bytearray): Octets reçus.
+
+        Returns:
+            int: Longueur de la commande, ou None si elle est incomplète.
+        """
+        if len(buffer) < 2:
+            return None
+        type = buffer[0]
+        if type == Cmd.Frame.start:
+            length = HEADER_SIZE + buffer[1] + CRC_SIZE if len(buffer) >= HEADER_SIZE else None
+        elif type in (Cmd.MFC1, Cmd.MFC2, Cmd.Generator1.AO, Cmd.Generator2.AO):
+            length = 5
+        elif type == 8:
+            end = buffer.find(b"\n", 2)
+            length = end + 1 if end >= 0 else None
+        elif type == Cmd.ThrottleValve.cmd and buffer[1] == Cmd.ThrottleValve.set_position:
+            length = 4
+        else:
+            length = 2
+        if length is None or len(buffer) < length:
+            return None
+        return length
+
+    def handle(self, command):
+        """
+        Exécute une commande complète et renvoie la réponse.
+
+        Args:
+            command (bytes): Commande reçue.
+
+        Returns:
+            bytes: Réponse de l'appareil (vide si la commande n'a pas de réponse).
+        """
+        if command[0] == Cmd.Frame.start:
+            return self.handle_frame(command)
+        with self.lock:
+            self.step()
+            type = command[0]
+            if type == 0:
+                self.outputs[command[1] // 2] = command[1] % 2
+            elif type == 1:
+                DI = self.digital_inputs()
+                return DI if command[1] == 0 else DI[command[1] - 1:command[1]]
+            elif type in self.analog_outputs:
+                self.analog_outputs[type] = struct.unpack('<f', command[1:5])[0]
+            elif type in (6, 7):
+                values = self.analog_inputs()[0:4] if type == 6 else self.analog_inputs()[4:8]
+                return (" ".join(f"{value:.3f}" for value in values) + "\r\n").encode()
+            elif type == 8:
+                return self.handle_pirani(command[1], command[2:].decode(errors="replace").strip())
+            elif type == Cmd.ThrottleValve.cmd:
+                return self.handle_throttle_valve(command)
+            elif type == Cmd.ReadAll.cmd:
+                frame = struct.pack(Cmd.ReadAll.format, self.digital_inputs(), *self.analog_inputs(), self.throttle_sensors(), int(self.throttle_position))
+                return bytes([len(frame)]) + frame
+            elif type == Cmd.DIEdges.cmd and 1 <= command[1] <= 4:
+                return self.read_edges(command[1])
+            elif type == Cmd.AIFrame.cmd and command[1] in Cmd.AIFrame.banks:
+                return self.AI_frame(command[1])
+            elif type == Cmd.Baud.cmd:
+                return self.handle_baud(command[1])
+            return b""
+
+    def handle_baud(self, index):
+        """
+        Exécute une étape de la négociation du débit (voir Cmd.Baud).
+
+        Args:
+            index (int): Index du débit dans Cmd.Baud.rates.
+
+        Returns:
+            bytes: Index accepté, ou Cmd.Baud.rejected.
+        """
+        rate = Cmd.Baud.rates[index] if index < len(Cmd.Baud.rates) else None
+        if self.baud_pending is not None and rate == self.link_baudrate():
+            self.baud_pending = None # confirmation reçue au nouveau débit
+            return bytes([index])
+        if rate is None or rate > self.max_baudrate:
+            return bytes([Cmd.Baud.rejected])
+        self.baud_pending = (self.baudrate, time.monotonic() + Cmd.Baud.confirm_timeout)
+        self.baudrate = rate
+        return bytes([index])
+
+    def link_baudrate(self):
+        """
+        Renvoie le débit actuel de la liaison, après être revenu au débit précédent si un changement
+        n'a pas été confirmé à temps.
+        """
+        if self.baud_pending is not None and time.monotonic() > self.baud_pending[1]:
+            self.baudrate = self.baud_pending[0]
+            self.baud_pending = None
+        return self.baudrate
+
+    def handle_frame(self, frame):
+        """
+        Exécute la commande contenue dans une trame (voir Cmd.Frame) et renvoie la réponse dans une trame
+        de même numéro de séquence. Une trame dont le CRC est faux est ignorée.
+
+        Args:
+            frame (bytes): Trame complète.
+
+        Returns:
+            bytes: Trame de réponse, ou vide si la commande n'a pas de réponse.
+        """
+        end = HEADER_SIZE + frame[1]
+        crc, = struct.unpack_from(Cmd.Frame.crc, frame, end)
+        if frame_crc(frame[1:end]) != crc or frame[1] == 0:
+            return b""
+        response = self.handle(frame[HEADER_SIZE:end])
+        return encode_frame(frame[2], response) if response else b""
+
+    def handle_throttle_valve(self, command):
+        """
+        Exécute une commande de la throttle valve.
+
+        Args:
+            command (bytes): Commande reçue.
+
+        Returns:
+            bytes: Réponse de la throttle valve.
+        """
+        if command[1] == Cmd.ThrottleValve.set_position:
+            target = int.from_bytes(command[2:4], byteorder='little', signed=True)
+            self.throttle_target = 0 if target == -100 else max(0, min(800, target))
+        elif command[1] == Cmd.ThrottleValve.sensors:
+            return bytes([self.throttle_sensors()])
+        elif command[1] == Cmd.ThrottleValve.position:
+            return int(self.throttle_position).to_bytes(2, byteorder='big')
+        return b""
+
+    def pirani_pressure(self, key):
+        """
+        Renvoie la pression vue par une jauge Pirani, en Torr.
+        """
+        return self.chamber_pressure if key == "chamber_pressure" else self.pump_pressure
+
+    def handle_pirani(self, address, text):
+        """
+        Exécute une commande RS485 destinée à une jauge Pirani.
+
+        Args:
+            address (int): Adresse de la jauge (99 pour l'adresse de diffusion).
+            text (str): Commande ASCII (par exemple "?V752").
+
+        Returns:
+            bytes: Réponse de la jauge, vide si aucune jauge ne répond à cette adresse.
+        """
+        if address == 99 and len(self.pirani) == 1:
+            address = next(iter(self.pirani))
+        gauge = self.pirani.get(address)
+        if gauge is None:
+            return b""
+        code, _, argument = text.partition(" ")
+        if code == "?V752":
+            torr = self.pirani_pressure(gauge["key"])
+            factor = {1: 1 / 0.75, 2: 1 / 0.0075, 3: 1.0}[gauge["unit"]]
+            status = (gauge["unit"] << 4) | (gauge["gas"] << 12)
+            return f"{torr * factor:.2E};{status:04X}\r\n".encode()
+        if code == "?S790":
+            return f"{gauge['sn']}\r\n".encode()
+        if code == "?S754":
+            return f"{argument};{gauge['setpoints'][int(argument)]}\r\n".encode()
+        if code == "!S750":
+            self.pirani[int(argument)] = self.pirani.pop(address)
+        elif code == "!S755":
+            gauge["unit"] = int(argument)
+        elif code == "!S756":
+            gauge["gas"] = int(argument)
+        elif code == "!S754":
+            index, _, pressure = argument.partition(";")
+            gauge["setpoints"][int(index)] = pressure
+        elif code != "!S761":
+            return b"ERR\r\n"
+        return b"OK\r\n"
+
+
+class SimulatedSerial:
+    """
+    Port série simulé connecté à un SimulatedDevice, compatible avec l'usage fait de serial.Serial par SerialReader.
+
+    Attributes:
+        port: Nom du port.
+        timeout: Délai de lecture en secondes.
+        latency: Latence de réponse de l'appareil en secondes.
+        jitter: Gigue maximale ajoutée à la latence en secondes.
+        drop_rate: Probabilité de perte de chaque octet de réponse.
+        inter_byte_timeout: Délai maximal en secondes entre deux octets lus, ou None.
+        device: Appareil simulé. Les octets écrits à un autre débit que celui de l'appareil sont perdus.
+
+    Methods:
+        __init__(self, port="SIM", baudrate=115200, timeout=0.3, latency=0.002, jitter=0.001, drop_rate=0.0, device=None, seed=None, inter_byte_timeout=None):
+            Constructeur de la classe SimulatedSerial.
+
+        write(self, data):
+            Envoie des octets à l'appareil simulé.
+
+        read(self, size=1):
+            Lit au plus size octets en attendant au plus timeout secondes.
+
+        read_until(self, expected=b"\\n", size=None):
+            Lit jusqu'au terminateur en attendant au plus timeout secondes.
+
+        reset_input_buffer(self):
+            Vide les octets déjà reçus.
+
+        close(self):
+            Ferme le port.
+    """
+    port_name = "SIM"
+
+    def __init__(self, port="SIM", baudrate=115200, timeout=0.3, latency=0.002, jitter=0.001, drop_rate=0.0, device=None, seed=None, inter_byte_timeout=None):
+        """
+        Constructeur de la classe SimulatedSerial.
+
+        Args:
+            port (str): Nom du port.
+            baudrate (int): Débit simulé, utilisé pour le temps de transmission.
+            timeout (float): Délai de lecture en secondes.
+            latency (float): Latence de réponse de l'appareil en secondes.
+            jitter (float): Gigue maximale ajoutée à la latence en secondes.
+            drop_rate (float): Probabilité de perte de chaque octet de réponse.
+            device (SimulatedDevice): Appareil simulé, créé avec les paramètres par défaut si None.
+            seed: Graine du générateur aléatoire.
+            inter_byte_timeout (float): Délai maximal en secondes entre deux octets lus, ou None.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.inter_byte_timeout = inter_byte_timeout
+        self.device = device if device is not None else SimulatedDevice()
+        self.random = random.Random(seed)
+        self.is_open = True
+
+        self.rx = bytearray() # octets reçus par l'appareil, pas encore interprétés
+        self.tx = [] # liste de (instant de disponibilité, octet) envoyés par l'appareil
+        self.condition = threading.Condition()
+
+    def byte_time(self):
+        """
+        Renvoie le temps de transmission d'un octet (10 bits par octet).
+        """
+        return 10 / self.baudrate
+
+    def write(self, data):
+        """
+        Envoie des octets à l'appareil simulé.
+
+        Args:
+            data (bytes): Octets à envoyer.
+
+        Returns:
+            int: Nombre d'octets écrits.
+        """
+        if not self.is_open:
+            raise SerialException("Simulated port is closed.")
+        if self.baudrate != self.device.link_baudrate():
+            return len(data) # octets illisibles pour l'appareil
+        self.rx += data
+        while True:
+            length = self.device.command_length(self.rx)
+            if length is None:
+                break
+            command = bytes(self.rx[:length])
+            del self.rx[:length]
+            response = self.device.handle(command)
+            if response:
+                self.queue_response(response)
+        return len(data)
+
+    def queue_response(self, response):
+        """
+        Place une réponse dans le buffer de réception après la latence simulée.
+
+        Args:
+            response (bytes): Réponse de l'appareil.
+        """
+        with self.condition:
+            start = time.monotonic() + self.latency + self.random.uniform(0, self.jitter)
+            if self.tx:
+                start = max(start, self.tx[-1][0])
+            for index, byte in enumerate(response):
+                if self.drop_rate and self.random.random() < self.drop_rate:
+                    continue
+                self.tx.append((start + (index + 1) * self.byte_time(), byte))
+            self.condition.notify_all()
+
+    @property
+    def in_waiting(self):
+        """
+        Nombre d'octets déjà disponibles en lecture.
+        """
+        now = time.monotonic()
+        with self.condition:
+            return sum(1 for ready, _ in self.tx if ready <= now)
+
+    def read(self, size=1):
+        """
+        Lit au plus size octets en attendant au plus timeout secondes.
+
+        Args:
+            size (int): Nombre d'octets à lire.
+
+        Returns:
+            bytes: Octets lus.
+        """
+        return self.read_until(None, size)
+
+    def read_until(self, expected=b"\n", size=None):
+        """
+        Lit jusqu'au terminateur (ou size octets) en attendant au plus timeout secondes.
+
+        Args:
+            expected (bytes): Terminateur, ou None pour lire size octets.
+            size (int): Nombre maximal d'octets à lire.
+
+        Returns:
+            bytes: Octets lus.
+        """
+        if not self.is_open:
+            raise SerialException("Simulated port is closed.")
+        data = bytearray()
+        deadline = time.monotonic() + (self.timeout if self.timeout is not None else 1e9)
+        end = deadline
+        with self.condition:
+            while size is None or len(data) < size:
+                now = time.monotonic()
+                if self.tx and self.tx[0][0] <= now:
+                    data.append(self.tx.pop(0)[1])
+                    if expected is not None and data.endswith(expected):
+                        break
+                    if self.inter_byte_timeout is not None:
+                        end = min(deadline, now + self.inter_byte_timeout)
+                    continue
+                if now >= end:
+                    break
+                wait = end - now
+                if self.tx:
+                    wait = min(wait, self.tx[0][0] - now)
+                self.condition.wait(wait)
+        return bytes(data)
+
+    def reset_input_buffer(self):
+        """
+        Vide les octets déjà reçus. Les octets encore en transit sont conservés.
+        """
+        now = time.monotonic()
+        with self.condition:
+            self.tx = [(ready, byte) for ready, byte in self.tx if ready > now]
+
+    def close(self):
+        """
+        Ferme le port.
+        """
+        self.is_open = False
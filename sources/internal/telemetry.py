@@ -0,0 +1,259 @@
+"""
+Ce module enregistre les valeurs lues par la boucle de lecture série dans un fichier binaire en colonnes.
+
+Format du fichier (little-endian) :
+    - en-tête : MAGIC, longueur (uint32) puis description JSON des groupes de voies,
+      de l'heure de début (time.time) et de l'instant correspondant (time.monotonic) ;
+    - blocs : CHUNK_MAGIC, numéro du groupe (uint8), nombre d'échantillons n (uint32), CRC32 du contenu (uint32),
+      puis n instants time.monotonic en float64 et, pour chaque voie du groupe, n valeurs float32.
+
+Le fichier n'est jamais réécrit : chaque bloc est ajouté en une écriture puis synchronisé sur le disque.
+Après un arrêt brutal, seul le dernier bloc peut être incomplet ; le lecteur l'ignore grâce à son CRC.
+"""
+from array import array
+from datetime import datetime
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from internal.logger import Logger
+
+
+MAGIC = b"BDTTLM01"
+CHUNK_MAGIC = b"CHNK"
+CHUNK_HEADER = '<4sBII'
+
+# groupe -> voies, dans l'ordre des valeurs passées à TelemetryRecorder.record
+GROUPS = {
+    "DI": ["MCP2_A", "MCP2_B", "MCP3_A", "MCP3_B"],
+    "AI": ["MFC1", "MFC2", "baratron1", "baratron2", "generator1_source", "generator1_reflected", "generator2_source", "generator2_reflected"],
+    "throttle_valve": ["sensors", "position"],
+    "chamber_pressure": ["pressure_torr", "status"], # pression convertie en Torr, quelle que soit l'unité de la jauge
+    "pump_pressure": ["pressure_torr", "status"],
+}
+
+
+class TelemetryRecorder:
+    """
+    Cette classe ajoute les échantillons de chaque groupe de voies à un fichier de télémétrie, par blocs.
+
+    Attributes:
+        path: Chemin du fichier en cours, ou None si l'enregistrement est désactivé.
+        chunk_size: Nombre d'échantillons d'un groupe au-delà duquel un bloc est écrit.
+        flush_interval: Délai en secondes au-delà duquel les échantillons en attente sont écrits.
+
+    Methods:
+        __init__(self, config):
+            Constructeur de la classe TelemetryRecorder.
+
+        record(self, group, values, timestamp=None):
+            Ajoute un échantillon à un groupe.
+
+        flush(self):
+            Écrit les échantillons en attente de tous les groupes.
+
+        close(self):
+            Écrit les échantillons en attente et ferme le fichier.
+    """
+    def __init__(self, config):
+        """
+        Constructeur de la classe TelemetryRecorder.
+
+        Args:
+            config: Objet Config. La section "telemetry" est facultative :
+                {"enabled": true, "folder": "data/telemetry", "chunk_size": 512, "flush_interval": 5}.
+        """
+        settings = config.value.get("telemetry", {})
+        self.chunk_size = settings.get("chunk_size", 512)
+        self.flush_interval = settings.get("flush_interval", 5)
+        self.path = None
+        self.file = None
+        self.lock = threading.Lock() # record est appelé par la boucle de lecture, close par l'interface
+        self.groups = dict(GROUPS)
+        for key in config.value.get("rs485", {}).get("gauges", []): # jauges Pirani ajoutées dans la configuration
+            self.groups.setdefault(key, GROUPS["chamber_pressure"])
+        self.group_index = {group: index for index, group in enumerate(self.groups)}
+        self.buffers = {group: self.new_buffer(group) for group in self.groups}
+        self.last_flush = time.monotonic()
+
+        if settings.get("enabled", False):
+            folder = settings.get("folder", "data/telemetry")
+            try:
+                os.makedirs(folder, exist_ok=True)
+                self.path = os.path.join(folder, datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".bdt")
+                self.file = open(self.path, "ab")
+                self.write_header()
+                Logger.info(f"Recording telemetry to {self.path}")
+            except OSError as e:
+                Logger.error(f"Could not create telemetry file: {e}")
+                self.path = None
+                self.file = None
+
+    def new_buffer(self, group):
+        """
+        Crée les colonnes vides d'un groupe : les instants puis une colonne par voie.
+        """
+        return [array('d')] + [array('f') for _ in self.groups[group]]
+
+    def write_header(self):
+        """
+        Écrit l'en-tête du fichier.
+        """
+        description = json.dumps({"groups": self.groups, "start_time": time.time(), "start_monotonic": time.monotonic()}).encode()
+        self.file.write(MAGIC + struct.pack('<I', len(description)) + description)
+        self.file.flush()
+
+    def record(self, group, values, timestamp=None):
+        """
+        Ajoute un échantillon à un groupe. Sans effet si l'enregistrement est désactivé.
+
+        Args:
+            group (str): Nom du groupe (clé de groups).
+            values (list): Une valeur par voie du groupe (nan si la valeur n'est pas disponible).
+            timestamp (float): Instant time.monotonic de l'échantillon, maintenant par défaut.
+        """
+        with self.lock:
+            if self.file is None:
+                return
+            buffer = self.buffers[group]
+            buffer[0].append(time.monotonic() if timestamp is None else timestamp)
+            for column, value in zip(buffer[1:], values):
+                column.append(value)
+            if len(buffer[0]) >= self.chunk_size:
+                self.write_chunk(group)
+            if time.monotonic() - self.last_flush > self.flush_interval:
+                self.flush_all()
+
+    def write_chunk(self, group):
+        """
+        Ajoute au fichier un bloc avec les échantillons en attente d'un groupe.
+        """
+        buffer = self.buffers[group]
+        if len(buffer[0]) == 0:
+            return
+        payload = b"".join(column.tobytes() for column in buffer)
+        header = struct.pack(CHUNK_HEADER, CHUNK_MAGIC, self.group_index[group], len(buffer[0]), zlib.crc32(payload))
+        try:
+            self.file.write(header + payload)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except OSError as e:
+            Logger.error(f"Could not write telemetry chunk: {e}")
+        self.buffers[group] = self.new_buffer(group)
+
+    def flush(self):
+        """
+        Écrit les échantillons en attente de tous les groupes.
+        """
+        with self.lock:
+            if self.file is not None:
+                self.flush_all()
+
+    def flush_all(self):
+        """
+        Écrit un bloc par groupe ayant des échantillons en attente. Appelé avec le verrou pris.
+        """
+        for group in self.groups:
+            self.write_chunk(group)
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        """
+        Écrit les échantillons en attente et ferme le fichier.
+        """
+        with self.lock:
+            if self.file is not None:
+                self.flush_all()
+                self.file.close()
+                self.file = None
+
+
+class TelemetryReader:
+    """
+    Cette classe lit un fichier de télémétrie et renvoie ses voies sous forme de tableaux NumPy.
+
+    Attributes:
+        groups: Dictionnaire groupe -> liste des voies.
+        start_time: Heure de début de l'enregistrement (time.time).
+        start_monotonic: Instant time.monotonic correspondant à start_time.
+
+    Methods:
+        __init__(self, path):
+            Constructeur de la classe TelemetryReader.
+
+        read(self, group, absolute_time=False):
+            Renvoie toutes les voies d'un groupe.
+    """
+    def __init__(self, path):
+        """
+        Constructeur de la classe TelemetryReader.
+
+        Args:
+            path (str): Chemin du fichier de télémétrie.
+        """
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a telemetry file")
+        length, = struct.unpack_from('<I', self.data, len(MAGIC))
+        offset = len(MAGIC) + 4
+        description = json.loads(self.data[offset:offset + length])
+        self.groups = description["groups"]
+        self.start_time = description["start_time"]
+        self.start_monotonic = description["start_monotonic"]
+        self.chunks = self.index_chunks(offset + length)
+
+    def index_chunks(self, offset):
+        """
+        Parcourt les blocs du fichier et s'arrête au premier bloc incomplet ou corrompu.
+
+        Returns:
+            list: (nom du groupe, nombre d'échantillons, position du contenu) pour chaque bloc valide.
+        """
+        names = list(self.groups)
+        header_size = struct.calcsize(CHUNK_HEADER)
+        chunks = []
+        while offset + header_size <= len(self.data):
+            magic, index, rows, crc = struct.unpack_from(CHUNK_HEADER, self.data, offset)
+            if magic != CHUNK_MAGIC or index >= len(names):
+                break
+            group = names[index]
+            size = rows * (8 + 4 * len(self.groups[group]))
+            payload = self.data[offset + header_size:offset + header_size + size]
+            if len(payload) != size or zlib.crc32(payload) != crc:
+                Logger.warning(f"Telemetry file truncated after {len(chunks)} chunks")
+                break
+            chunks.append((group, rows, offset + header_size))
+            offset += header_size + size
+        return chunks
+
+    def read(self, group, absolute_time=False):
+        """
+        Renvoie toutes les voies d'un groupe.
+
+        Args:
+            group (str): Nom du groupe.
+            absolute_time (bool): True pour des instants en time.time, False pour des instants time.monotonic.
+
+        Returns:
+            dict: "time" (float64) puis une entrée (float32) par voie du groupe.
+        """
+        channels = self.groups[group]
+        columns = {name: [] for name in ["time"] + channels}
+        for chunk_group, rows, offset in self.chunks:
+            if chunk_group != group:
+                continue
+            columns["time"].append(np.frombuffer(self.data, dtype='<f8', count=rows, offset=offset))
+            offset += 8 * rows
+            for name in channels:
+                columns[name].append(np.frombuffer(self.data, dtype='<f4', count=rows, offset=offset))
+                offset += 4 * rows
+        result = {name: np.concatenate(parts) if parts else np.empty(0, dtype='<f8' if name == "time" else '<f4') for name, parts in columns.items()}
+        if absolute_time:
+            result["time"] = result["time"] - self.start_monotonic + self.start_time
+        return result
@@ -1,20 +1,67 @@
 import json
 import sys
 import os
+from collections import OrderedDict
 
 import time
 
 from internal.logger import Logger
 
+
+class Template:
+    """
+    Traduction d'une clé préparée au chargement : le texte sans champ à remplacer est renvoyé tel quel,
+    les autres sont formatés avec str.format.
+    """
+    __slots__ = ("key", "text", "static")
+
+    def __init__(self, key, text):
+        self.key = key
+        self.text = text
+        self.static = "{" not in text and "}" not in text
+
+    def render(self, values):
+        """
+        Formate la traduction. Renvoie la clé si le formatage échoue (champ manquant, accolade mal fermée, ...).
+
+        Args:
+            values (dict): Valeurs des champs, déjà traduites.
+        """
+        if self.static:
+            return self.text
+        try:
+            return self.text.format(**values)
+        except Exception:
+            return self.key
+
+
 class Translator:
+    """
+    Cette classe traduit les clés de l'interface dans la langue courante.
+
+    Les fichiers de langue sont compilés au chargement en objets Template, avec l'anglais comme traduction
+    de repli. Les traductions sans argument sont calculées à la compilation ; les résultats avec des arguments
+    textuels sont mémorisés par langue (cache LRU de taille memo_size). Une langue inconnue est traduite en anglais.
+
+    Attributes:
+        translations: Dictionnaire langue -> contenu brut du fichier de langue.
+        templates: Dictionnaire langue -> clé -> Template.
+        rendered: Dictionnaire langue -> clé -> traduction sans argument, calculée à la compilation.
+        current_language: Langue courante.
+    """
+    memo_size = 2048 # résultats mémorisés par langue
+
     def __init__(self,config):
         self.translations = {
             "en": {},
             "fr": {},
             "gilles":{},
         }
+        self.templates = {language: {} for language in self.translations}
+        self.rendered = {language: {} for language in self.translations}
+        self.memo = {language: OrderedDict() for language in self.translations}
         self.current_language = config["gui"]["lang"]
-        
+
 
     def load_translations(self):
         base_path = os.environ.get('_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
@@ -29,21 +76,60 @@ class Translator:
             Logger.error(f"Error while loading translations: {e}")
             time.sleep(1000)
             sys.exit(1)
+        self.compile()
         Logger.info("Translations loaded.")
-        
+
+    def compile(self):
+        """
+        Compile chaque langue en objets Template, les clés manquantes reprenant la traduction anglaise,
+        et vide les résultats mémorisés.
+        """
+        english = {key: Template(key, str(text)) for key, text in self.translations["en"].items()}
+        for language, translations in self.translations.items():
+            templates = dict(english)
+            if language != "en":
+                templates.update({key: Template(key, str(text)) for key, text in translations.items()})
+            self.templates[language] = templates
+            self.rendered[language] = {key: template.render({}) for key, template in templates.items()}
+            self.memo[language].clear()
+
     def translate(self, key, **kwargs):
         if not isinstance(key,str):
             key = str(key)
-        for k, v in kwargs.items():
-            kwargs[k] = self.translate(v)
-        try:
-            # Try to get the translation in the current language
-            translation = self.translations[self.current_language][key]
-        except KeyError:
-            # If not found, fallback to English
-            translation = self.translations["en"].get(key, key)
-        try:
-            translation = translation.format(**kwargs)
-            return translation
-        except:
-            return key
+        language = self.current_language
+        if language not in self.rendered: # langue inconnue : repli sur l'anglais
+            language = "en"
+        rendered = self.rendered[language]
+        if not kwargs:
+            result = rendered.get(key)
+            return Template(key, key).render({}) if result is None else result
+
+        # seuls les arguments textuels (états, unités, ...) sont mémorisés : les valeurs numériques changent à chaque
+        # lecture, et 1, 1.0 et True seraient confondus dans le cache (map(str.__instancecheck__) : isinstance rapide)
+        memo = self.memo[language] if all(map(str.__instancecheck__, kwargs.values())) else None
+        if memo is not None:
+            memo_key = (key, tuple(kwargs.items()))
+            result = memo.get(memo_key)
+            if result is not None:
+                try:
+                    memo.move_to_end(memo_key)
+                except KeyError: # évincé entre-temps par un autre thread
+                    pass
+                return result
+
+        values = {}
+        for name, value in kwargs.items():
+            text = value if isinstance(value, str) else str(value)
+            values[name] = rendered.get(text, text)
+        template = self.templates[language].get(key)
+        result = Template(key, key).render(values) if template is None else template.render(values)
+
+        if memo is not None:
+            # pas de verrou : chaque opération sur l'OrderedDict est atomique, au pire une entrée est recalculée
+            memo[memo_key] = result
+            if len(memo) > self.memo_size:
+                try:
+                    memo.popitem(last=False)
+                except KeyError:
+                    pass
+        return result
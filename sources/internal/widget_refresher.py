@@ -0,0 +1,156 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QGuiApplication
+
+from internal.di_decoder import DIDecoder
+
+
+class PollSnapshot:
+    """
+    Cette classe regroupe les valeurs lues pendant un cycle de la boucle de lecture série.
+
+    Attributes:
+        timestamp: Instant de la fin du cycle (time.monotonic).
+        values: Dictionnaire voie -> valeur brute ("DI", "AI", "throttle_valve", puis une voie par jauge Pirani).
+            Une voie absente n'a pas été lue correctement pendant ce cycle.
+    """
+    def __init__(self):
+        self.timestamp = None
+        self.values = {}
+
+    def __bool__(self):
+        return bool(self.values)
+
+
+class WidgetRefresher(QObject):
+    """
+    Cette classe applique aux widgets, dans le thread de l'interface, les valeurs lues par la boucle de lecture série.
+
+    Les instantanés reçus sont fusionnés : seule la dernière valeur de chaque voie est gardée. Les widgets sont
+    mis à jour en une seule passe, au plus une fois par rafraîchissement de l'écran, et seulement pour les voies
+    dont la valeur a changé depuis la passe précédente.
+
+    Attributes:
+        pending: Dernière valeur reçue de chaque voie pas encore appliquée.
+        applied: Dernière valeur appliquée de chaque voie.
+        refresh_interval: Intervalle minimal entre deux passes, en millisecondes.
+
+    Methods:
+        __init__(self, gui):
+            Constructeur de la classe WidgetRefresher.
+
+        push(self, snapshot):
+            Reçoit un instantané et programme une passe de mise à jour.
+
+        refresh(self):
+            Applique aux widgets les voies modifiées.
+
+        apply_snapshot(self, snapshot):
+            Applique immédiatement un instantané.
+    """
+    default_refresh_rate = 60 # Hz, si la fréquence de l'écran n'est pas connue
+
+    def __init__(self, gui):
+        """
+        Constructeur de la classe WidgetRefresher.
+
+        Args:
+            gui: Fenêtre principale (fournit custom_widgets, RS485 et update_AI).
+        """
+        super().__init__()
+        self.parent = gui
+        self.custom_widgets = gui.custom_widgets
+        self.pending = {}
+        self.applied = {}
+        self.DI_decoder = DIDecoder()
+        self.last_refresh = 0.0
+
+        screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() is not None else None
+        refresh_rate = screen.refreshRate() if screen is not None and screen.refreshRate() > 0 else self.default_refresh_rate
+        self.refresh_interval = max(1, int(1000 / refresh_rate))
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.refresh)
+
+        self.channels = {
+            "DI": self.apply_DI,
+            "AI": self.apply_AI,
+            "throttle_valve": self.apply_throttle_valve,
+        }
+        # jauges Pirani affichées ; les autres jauges sont seulement enregistrées dans la télémétrie
+        for key in gui.RS485.pirani:
+            if key in self.custom_widgets:
+                self.channels[key] = lambda data, key=key: self.custom_widgets[key].update_pressure(data)
+
+    def push(self, snapshot):
+        """
+        Reçoit un instantané de la boucle de lecture et programme une passe de mise à jour
+        si aucune n'est déjà prévue.
+
+        Args:
+            snapshot (PollSnapshot): Valeurs lues pendant un cycle.
+        """
+        self.pending.update(snapshot.values)
+        if not self.timer.isActive():
+            elapsed = (time.monotonic() - self.last_refresh) * 1000
+            self.timer.start(max(0, int(self.refresh_interval - elapsed)))
+
+    def refresh(self):
+        """
+        Applique aux widgets les voies en attente dont la valeur a changé.
+        """
+        self.last_refresh = time.monotonic()
+        pending, self.pending = self.pending, {}
+        for channel, value in pending.items():
+            if channel in self.channels and self.applied.get(channel) != value:
+                self.applied[channel] = value
+                self.channels[channel](value)
+
+    def apply_snapshot(self, snapshot):
+        """
+        Applique immédiatement un instantané, sans attendre la passe suivante.
+
+        Args:
+            snapshot (PollSnapshot): Valeurs lues pendant un cycle.
+        """
+        self.pending.update(snapshot.values)
+        self.refresh()
+
+    def apply_DI(self, data):
+        """
+        Met à jour les widgets dont au moins une entrée numérique a changé (voir DIDecoder).
+
+        Args:
+            data (bytes): États des entrées numériques.
+        """
+        for key, method, args in self.DI_decoder.decode(data):
+            getattr(self.custom_widgets[key], method)(*args)
+            if key == "turbo_pump_gate":
+                self.parent.update_AI() # redessine la ligne des capteurs de la vanne
+
+    def apply_AI(self, data):
+        """
+        Met à jour les widgets à partir des 8 entrées analogiques.
+
+        Args:
+            data (tuple): MFC1, MFC2, baratron1, baratron2, puis puissance source et réfléchie des générateurs 1 et 2.
+        """
+        self.custom_widgets["MFC1"].update_AI(data[0])
+        self.custom_widgets["MFC2"].update_AI(data[1])
+        self.custom_widgets["baratron1"].update_AI(data[2])
+        self.custom_widgets["baratron2"].update_AI(data[3])
+        self.custom_widgets["generator1"].update_AI(data[4:6])
+        self.custom_widgets["generator2"].update_AI(data[6:8])
+
+    def apply_throttle_valve(self, data):
+        """
+        Met à jour le widget de la throttle valve.
+
+        Args:
+            data (tuple): Octet des capteurs ouvert/fermé, position actuelle en pas.
+        """
+        sensors, position = data
+        self.custom_widgets["throttle_valve"].update_sensor(sensors)
+        self.custom_widgets["throttle_valve"].update_position(position)
@@ -197,11 +197,9 @@ class Generator(CustomWidget):
         Sets the value of the MFC. Used in recipes
         '''
         #change value of spinbox
-        for spin_box, spin_box_key, _, spin_box_kwargs in self.spin_boxes:
-            if spin_box_key == "setpoint":
-                spin_box.setValue(value)
-                self.update_AO(spin_box)
-                break
+        spin_box = self.get_spin_box("setpoint")
+        spin_box.setValue(value)
+        self.update_AO(spin_box)
 
     def get_value(self):
         '''
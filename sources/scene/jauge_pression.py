@@ -3,6 +3,7 @@ from PyQt5.QtCore import Qt
 from internal.custom_widget import CustomWidget
 from window.pirani_config_gui import PiraniConfigGui
 from internal.constant import PiraniConfig
+from internal.rs485 import PiraniSample
 
 
 class JaugePression(CustomWidget):
@@ -19,7 +20,6 @@ class JaugePression(CustomWidget):
         self.window = None
         self.parent = parent
         self.key = key
-        self.value = 1000
         ratio = (0.12, 0.12)
         super().__init__(parent.translator, pos, ratio, "#E2F0D9")
         self.create_labels(key)
@@ -37,15 +37,19 @@ class JaugePression(CustomWidget):
         self.create_label("gas_type", gas_type = "")
         self.create_label("pressure", value = "0", unit = "")
 
-    def update_pressure(self, value):
-        if value[0] == 'error':
+    def update_pressure(self, sample):
+        """
+        Affiche une lecture de la jauge.
+
+        Args:
+            sample (PiraniSample): Lecture de la jauge, déjà décodée par RS485.
+        """
+        if sample.error:
             self.update_label('pressure', value = "error", unit = "")
             return
 
-        unit = (int(value[1], 16) >> 4) & 3 #permet de récuperer uniquement les 2 bit indiquant l'unité
-        gas_index = (int(value[1], 16) >> 12) & 7 #permet de récuperer uniquement les 2 bit indiquant le gas enregistré
-        self.update_label("gas_type", gas_type = PiraniConfig.gas_types[gas_index])
-        pressure = float(value[0])
+        self.update_label("gas_type", gas_type = PiraniConfig.gas_types[sample.gas])
+        pressure = sample.value
         if pressure < 0.1:
             pressure_str = f"{pressure:.2e}"  # Utilise l'écriture scientifique avec 1 chiffre après le point
             base, exp = pressure_str.split("e")  # Split la chaîne en base et exposant
@@ -55,12 +59,11 @@ class JaugePression(CustomWidget):
             pressure = base + "E" + exp
         else:
             pressure = f"{pressure:.3f}"
-        self.value = pressure
         pressure += " "
 
-        self.update_label('pressure', value = pressure, unit = PiraniConfig.units_types[unit - 1])
+        self.update_label('pressure', value = pressure, unit = PiraniConfig.units_types[sample.unit - 1])
         if self.window is not None and self.window.isVisible():
-            self.window.update_status_bits(int(value[1], 16))
+            self.window.update_status_bits(sample.status)
 
     def open_window(self):
         if self.parent.serial_reader.ser is not None:
@@ -70,15 +73,12 @@ class JaugePression(CustomWidget):
 
     def get_value(self):
         """
-        Returns the value of the label.
+        Renvoie la pression en Torr à partir de la dernière lecture de la jauge. N'attend jamais le bus, quel que soit
+        le thread appelant (recettes, courbes) : une lecture trop ancienne est relue en tâche de fond.
         """
-        value = self.value
-        #convert unit to torr
-        if value == "overrange":
-            return 1000
-        if self.parent.config[self.key]["pressure_unit"] == "mBar":
-            value = float(value)*0.75
-        elif self.parent.config[self.key]["pressure_unit"] == "Pascal":
-            value = float(value)*0.0075
-        return float(value)
+        gauge = self.parent.RS485.pirani.get(self.key) # None si la jauge a été écartée (adresse invalide ou déjà utilisée)
+        sample = gauge.get_sample(wait=False) if gauge is not None else None
+        if sample is None:
+            return PiraniSample.overrange
+        return sample.pressure
 
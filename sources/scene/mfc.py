@@ -124,11 +124,9 @@ class MFC(CustomWidget):
             value: La nouvelle valeur du MFC.
         """
         # Changer la valeur de la spin box
-        for spin_box, spin_box_key, _, spin_box_kwargs in self.spin_boxes:
-            if spin_box_key == "setpoint":
-                spin_box.setValue(value)
-                self.update_AO(spin_box)
-                break
+        spin_box = self.get_spin_box("setpoint")
+        spin_box.setValue(value)
+        self.update_AO(spin_box)
 
 
 
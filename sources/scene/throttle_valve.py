@@ -91,11 +91,7 @@ class ThrottleValve(CustomWidget):
         if value == (-100): #si Home afficher 0
             value = 0
         #change the value of the spinbox
-        for spin_box, spin_box_key, _, spin_box_kwargs in self.spin_boxes:
-            if spin_box_key == "goto_step":
-
-                spin_box.setValue(value)
-                break
+        self.get_spin_box("goto_step").setValue(value)
 
     def update_step(self, spin_box):
         self.set_position(spin_box.value())
@@ -1,13 +1,58 @@
-from PyQt5.QtWidgets import QMainWindow, QPushButton, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout, QWidget, QSpinBox
+from PyQt5.QtWidgets import QMainWindow, QPushButton, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout, QWidget, QSpinBox, QCheckBox
 from PyQt5.QtCore import QTimer, QDate, QDateTime
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
 from matplotlib.figure import Figure
+import numpy as np
 import csv
 import os
+import time
 
 from internal.logger import Logger
+from internal.ring_buffer import min_max_decimate
+
+
+class RunningStats:
+    """
+    Statistiques d'une série de durées (nombre, min, max, moyenne, dernière valeur), mises à jour en O(1) à chaque ajout.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Remet les statistiques à zéro.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, value):
+        """
+        Ajoute une durée.
+
+        Args:
+            value: Durée en secondes.
+        """
+        self.min = value if self.count == 0 else min(self.min, value)
+        self.max = value if self.count == 0 else max(self.max, value)
+        self.count += 1
+        self.total += value
+        self.last = value
+
+    def mean(self):
+        """
+        Renvoie la moyenne des durées (0 si la série est vide).
+        """
+        return self.total / self.count if self.count else 0.0
+
 
 class CycleGui(QMainWindow):
+    redraw_interval = 200 # ms, délai minimal entre deux mises à jour du graphique
+    max_cycles = 1000000
+    plot_capacity = 4096 # points par courbe ; au-delà, l'historique est réduit par décimation min/max
+
     def __init__(self, parent, state_up_key='ascent', state_down_key='descent'):
         """
         Constructeur de la classe CycleGui.
@@ -36,10 +81,19 @@ class CycleGui(QMainWindow):
         # Initialize timers
         self.timer = QTimer()
         self.timer.timeout.connect(self.on_timer)
-        self.sensor_check_timer = QTimer()
-        self.sensor_check_timer.timeout.connect(self.check_sensor)
+        self.redraw_timer = QTimer()
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.timeout.connect(self.refresh_graph)
         self.is_running = False
 
+        # Fronts horodatés des capteurs, reçus du DIWatcher
+        self.DI_watcher = self.main_parent.DI_watcher
+        self.DI_watcher.edge_detected.connect(self.on_edge)
+        self.is_subscribed = False
+        self.is_waiting_sensor = False
+        self.command_time = 0 # instant (time.monotonic) de la dernière commande du composant
+        self.reached_time = None # instant du front de fin de course depuis la dernière commande
+
         # Create widgets and layouts
         self.create_top_widgets()
         self.create_start_button()
@@ -48,10 +102,10 @@ class CycleGui(QMainWindow):
         self.create_pn_sn_widgets()
         self.create_main_layout()
 
-        # Initialize data list for the graph
-        self.time_data = []
-        self.component_state = []
-        self.cycle_durations = []
+        # State of the current run; the durations are streamed to the CSV file, only the graph points are kept
+        self.component_state = None  # position demanded by the last command (1: activated, 0: deactivated)
+        self.pending_duration = None  # first move of the current cycle, written with the second one
+        self.csv_file = None
 
 
         self.setCentralWidget(self.widget)
@@ -76,7 +130,7 @@ class CycleGui(QMainWindow):
         """
         self.labels['cycle'] = QLabel(self.parent.translator.translate('cycles'), self)
         self.edits['cycle'] = QSpinBox(self)
-        self.edits['cycle'].setRange(0, 100)
+        self.edits['cycle'].setRange(0, self.max_cycles)
         self.edits['cycle'].setValue(20)
 
         self.labels['status'] = QLabel(self.parent.translator.translate('status'), self)
@@ -96,6 +150,7 @@ class CycleGui(QMainWindow):
         self.start_button = QPushButton(self.parent.translator.translate('start'), self)
         self.start_button.clicked.connect(self.on_start_button)
         self.start_button.setEnabled(False)  # initially disabled until a CSV file name is defined
+        self.resume_checkbox = QCheckBox(self.parent.translator.translate('resume_run'), self)
 
     def create_max_min_widgets(self):
         """
@@ -127,6 +182,25 @@ class CycleGui(QMainWindow):
         self.figure.subplots_adjust(hspace=0.5)  # adjust vertical spacing between subplots
         self.toolbar = NavigationToolbar2QT(self.canvas, self)
 
+        # Persistent artists: the step lines are animated and blitted over a cached background
+        self.axes = {'ascent': self.ax1, 'descent': self.ax2}
+        self.lines = {}
+        self.limit_lines = []
+        self.stats = {'ascent': RunningStats(), 'descent': RunningStats()}
+        self.plot_x = {key: np.zeros(self.plot_capacity) for key in self.axes}
+        self.plot_y = {key: np.zeros(self.plot_capacity) for key in self.axes}
+        self.plot_count = {}
+        for key, ax in self.axes.items():
+            self.lines[key], = ax.plot([], [], drawstyle='steps-pre', animated=True)
+            self.limit_lines.append((ax.axhline(y=self.edits['max'].value(), color='r', linestyle='--'), 'max'))
+            self.limit_lines.append((ax.axhline(y=self.edits['min'].value(), color='r', linestyle='--'), 'min'))
+        self.clear_graph_data()
+        self.background = None
+        self.graph_needs_full_draw = False
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        for label in ['max', 'min']:
+            self.edits[label].valueChanged.connect(self.update_limit_lines)
+
 
         self.layouts['graph'] = QVBoxLayout()
         self.layouts['graph'].addWidget(self.toolbar)
@@ -194,6 +268,7 @@ class CycleGui(QMainWindow):
 
         self.layouts['left'].addLayout(self.layouts['top'])
         self.layouts['left'].addWidget(self.start_button)
+        self.layouts['left'].addWidget(self.resume_checkbox)
         self.layouts['left'].addLayout(self.layouts['max_min'])
 
         self.layouts['right'] = QHBoxLayout()
@@ -222,6 +297,7 @@ class CycleGui(QMainWindow):
         self.edits['cycle'].setEnabled(state)
         self.edits['max'].setEnabled(state)
         self.edits['min'].setEnabled(state)
+        self.resume_checkbox.setEnabled(state)
 
     def on_start_button(self):
         """
@@ -237,9 +313,16 @@ class CycleGui(QMainWindow):
             Logger.info(f"Starting the cycles with {self.edits['cycle'].value()} cycles, filename: {self.edits['CSV File'].text()}")
             self.cycle_count = 0  # initialize cycle counter
             self.starting_time = QDateTime.currentMSecsSinceEpoch()  # initialize starting time
-            self.time_data = []
-            self.component_state = []
-            self.cycle_durations = []
+            self.component_state = None
+            self.pending_duration = None
+            self.clear_graph_data()
+            self.open_csv(resume=self.resume_checkbox.isChecked())
+            self.update_graph_and_labels()
+            if self.cycle_count > self.edits['cycle'].value():
+                Logger.info("The resumed file already contains the requested number of cycles")
+                self.finish_cycles()
+                return
+            self.subscribe_sensor()
             self.start_button.setText(self.parent.translator.translate('stop'))
             self.edits['status'].setText('home')
             self.is_running = True  # set is_running to True to start the pre_start_cycle loop
@@ -251,7 +334,7 @@ class CycleGui(QMainWindow):
         Prépare le cycle en activant le composant et en attendant qu'il soit dans la position souhaitée par défaut.
         """
         self.activate_component()
-        if not self.is_sensor_reached():  # wait that the component is down
+        if not self.is_sensor_reached(self.DI_watcher.value(self.parent.cmd.Port)):  # wait that the component is down
             if self.is_running:  # check if the cycles are running
                 QTimer.singleShot(100, self.pre_start_cycle)
         else:
@@ -261,10 +344,9 @@ class CycleGui(QMainWindow):
         """
         Démarre un cycle en activant le composant et en commençant à vérifier le capteur.
         """
-        self.deactivate_component()  # activate component
-        self.component_state.append(0)
-        self.sensor_check_start_time = QDateTime.currentMSecsSinceEpoch()/1000 # initialize sensor check start time
-        self.sensor_check_timer.start(25)  # start checking the sensor every 25 ms
+        self.component_state = 0
+        self.move_component()
+        self.is_waiting_sensor = True  # the next edge reaching the sensor ends the move
 
 
     def stop_cycle(self):
@@ -273,11 +355,28 @@ class CycleGui(QMainWindow):
         """
         if self.timer.isActive():
             self.timer.stop()
-        if self.sensor_check_timer.isActive():
-            self.sensor_check_timer.stop()
+        self.is_waiting_sensor = False
+        self.unsubscribe_sensor()
+        self.close_csv()
         self.start_button.setText(self.parent.translator.translate('start'))
         self.is_running = False
 
+    def subscribe_sensor(self):
+        """
+        Demande au DIWatcher de surveiller le port des capteurs du composant.
+        """
+        if not self.is_subscribed:
+            self.DI_watcher.subscribe(self.parent.cmd.Port)
+            self.is_subscribed = True
+
+    def unsubscribe_sensor(self):
+        """
+        Arrête la surveillance du port des capteurs du composant.
+        """
+        if self.is_subscribed:
+            self.DI_watcher.unsubscribe(self.parent.cmd.Port)
+            self.is_subscribed = False
+
 
     def on_timer(self):
         """
@@ -285,89 +384,173 @@ class CycleGui(QMainWindow):
         """
         # This method is called when the 15-second timer expires
         self.timer.stop()  # stop the timer
-        self.sensor_check_timer.stop()  # stop checking the sensor
+        self.is_waiting_sensor = False  # stop waiting for the sensor
         self.start_button.setText(self.parent.translator.translate('start'))
         self.edits['status'].setText('error')  # update status to show that the sensor was not reached
 
         
 
-    def check_sensor(self):
+    def on_edge(self, port, previous, value, timestamp):
+        """
+        Reçoit les fronts du port des capteurs et enregistre l'instant où la position demandée est atteinte.
+
+        Args:
+            port: Port de DI.
+            previous: Valeur précédente du port.
+            value: Nouvelle valeur du port.
+            timestamp: Instant du front (time.monotonic), horodaté par le firmware.
+        """
+        if not self.is_running or port != self.parent.cmd.Port or self.reached_time is not None:
+            return
+        if self.component_state is not None and self.is_sensor_reached(value):
+            self.reached_time = timestamp
+            if self.is_waiting_sensor:
+                self.sensor_reached()
+
+    def sensor_reached(self):
         """
-        Vérifie périodiquement si le capteur a été atteint.
+        Enregistre la durée du mouvement terminé et lance le mouvement suivant.
         """
-        # This method is called every 25 ms to check the sensor
-        if self.is_sensor_reached():
-            self.sensor_check_timer.stop()  # stop checking the sensor
-            self.timer.stop()  # stop the 15-second timer
+        self.is_waiting_sensor = False
+        self.timer.stop()  # stop the 15-second timer
 
-            # Record the time the sensor was reached
-            sensor_reached_time = QDateTime.currentMSecsSinceEpoch()/1000
-            self.time_data.append(sensor_reached_time - self.sensor_check_start_time)  # record the time in seconds
+        # Record the time between the command and the sensor edge
+        cycle_duration = max(0.0, self.reached_time - self.command_time)
+        self.add_graph_point('ascent' if self.component_state == 0 else 'descent', cycle_duration)
 
-            # Calculate cycle duration
-            cycle_duration = sensor_reached_time - self.sensor_check_start_time
-            self.cycle_durations.append(cycle_duration)
+        # Add corresponding component state
+        if self.component_state == 1:  # if the component is up
+            self.component_state = 0
+            self.write_cycle(self.cycle_count, cycle_duration, self.pending_duration)
+            self.move_component()
+            QTimer.singleShot(self.tempo_low * 1000, self.start_sensor_check)  # wait for tempo_low seconds before starting sensor check
 
-            # Add corresponding component state
-            if self.component_state[-1] == 1:  # if the component is up
-                self.component_state.append(0)
-                self.deactivate_component()
-                QTimer.singleShot(self.tempo_low * 1000, self.start_sensor_check)  # wait for tempo_low seconds before starting sensor check
+        else:  # if the component is down
+            self.pending_duration = cycle_duration
+            self.component_state = 1
+            self.move_component()
+            self.cycle_count += 1  # increment cycle counter only after a complete ascent and descent
+            QTimer.singleShot(self.tempo_high * 1000, self.start_sensor_check)  # wait for tempo_high seconds before starting sensor check
 
-            else:  # if the component is down
-                self.component_state.append(1)
-                self.activate_component()
-                self.cycle_count += 1  # increment cycle counter only after a complete ascent and descent
-                QTimer.singleShot(self.tempo_high * 1000, self.start_sensor_check)  # wait for tempo_high seconds before starting sensor check
+        self.update_graph_and_labels()
 
-            self.update_graph_and_labels()
+        if self.cycle_count > self.edits['cycle'].value():
+            self.finish_cycles()
+        else:
+            self.edits['status'].setText(f'{self.cycle_count}')
 
-            if self.cycle_count > self.edits['cycle'].value():
-                self.finish_cycles()
+    def move_component(self):
+        """
+        Commande le composant vers la position du dernier état de component_state et note l'instant de la commande.
+        """
+        self.reached_time = None
+        self.command_time = time.monotonic()
+        if self.component_state == 1:
+            self.activate_component()
+        else:
+            self.deactivate_component()
+
+    def start_sensor_check(self):
+        """
+        Démarre l'attente du capteur pour le prochain cycle. Si le front est déjà arrivé pendant la temporisation,
+        le mouvement est terminé immédiatement avec l'instant du front.
+        """
+        if self.is_running and self.cycle_count <= self.edits['cycle'].value():
+            self.is_waiting_sensor = True
+            if self.reached_time is not None:
+                self.sensor_reached()
             else:
                 self.timer.start(15000)  # start a timer to stop the cycle if it takes more than 15 seconds
-                self.edits['status'].setText(f'{self.cycle_count}')
 
 
-    def start_sensor_check(self):
+
+    def clear_graph_data(self):
         """
-        Démarre la vérification du capteur pour le prochain cycle.
+        Vide les courbes et les statistiques.
         """
-        if self.cycle_count <= self.edits['cycle'].value():
-            self.sensor_check_start_time = QDateTime.currentMSecsSinceEpoch()/1000 # reset sensor check start time
-            self.sensor_check_timer.start(25)  # start checking the sensor every 25 ms
-            self.timer.start(15000)  # start a timer to stop the cycle if it takes more than 15 seconds
+        for key in self.axes:
+            self.plot_count[key] = 0
+            self.stats[key].clear()
+            self.axes[key].set_xlim(0, 10)
+            self.axes[key].set_ylim(0, max(1, self.edits['max'].value() * 1.2))
+        self.graph_needs_full_draw = True
 
+    def add_graph_point(self, key, duration):
+        """
+        Ajoute une durée à la courbe et aux statistiques de montée ('ascent') ou de descente ('descent').
 
+        Args:
+            key: 'ascent' ou 'descent'.
+            duration: Durée en secondes.
+        """
+        stats = self.stats[key]
+        stats.add(duration)
+        count = self.plot_count[key]
+        if count == self.plot_capacity:  # halve the points already plotted, keeping the min and max of each group of 4
+            x, y = min_max_decimate(self.plot_x[key], self.plot_y[key], self.plot_capacity // 4)
+            count = len(x)
+            self.plot_x[key][:count] = x
+            self.plot_y[key][:count] = y
+        self.plot_x[key][count] = stats.count
+        self.plot_y[key][count] = duration
+        self.plot_count[key] = count + 1
 
     def update_graph_and_labels(self):
         """
-        Met à jour le graphique et les labels de valeurs affichées.
-        """
-        # Update the graphs
-        self.ax1.clear()
-        self.ax2.clear()
-        self.ax1.set_title(self.parent.translator.translate('time', state=self.state_up_key))  # reset title after clearing
-        self.ax2.set_title(self.parent.translator.translate('time', state=self.state_down_key))  # reset title after clearing
-        self.ax1.step([i for i in range(len(self.cycle_durations[::2])+1)], [0]+[duration for duration in self.cycle_durations[::2]])  # plot ascent times in seconds
-        self.ax1.axhline(y=self.edits['max'].value(), color='r', linestyle='--')
-        self.ax1.axhline(y=self.edits['min'].value(), color='r', linestyle='--')
-        self.ax2.step([i for i in range(len(self.cycle_durations[1::2])+1)], [0]+[duration for duration in self.cycle_durations[1::2]])  # plot descent times in seconds
-        self.ax2.axhline(y=self.edits['max'].value(), color='r', linestyle='--')
-        self.ax2.axhline(y=self.edits['min'].value(), color='r', linestyle='--')
-
-        if self.cycle_durations[::2]:  # check if the list of ascent durations is not empty
-            self.labels['min_val_ascent'].setText(self.parent.translator.translate('min_val', state=self.state_up_key, value=f'{min(self.cycle_durations[::2]):.2f}'))
-            self.labels['max_val_ascent'].setText(self.parent.translator.translate('max_val', state=self.state_up_key, value=f'{max(self.cycle_durations[::2]):.2f}'))
-            self.labels['avg_val_ascent'].setText(self.parent.translator.translate('avg_val', state=self.state_up_key, value=f'{sum(self.cycle_durations[::2]) / len(self.cycle_durations[::2]):.2f}'))
-            self.labels['last_val_ascent'].setText(self.parent.translator.translate('last_val', state=self.state_up_key, value=f'{self.cycle_durations[::2][-1]:.2f}'))
-        if self.cycle_durations[1::2]:  # check if the list of descent durations is not empty
-            self.labels['min_val_descent'].setText(self.parent.translator.translate('min_val', state=self.state_down_key, value=f'{min(self.cycle_durations[1::2]):.2f}'))
-            self.labels['max_val_descent'].setText(self.parent.translator.translate('max_val', state=self.state_down_key, value=f'{max(self.cycle_durations[1::2]):.2f}'))
-            self.labels['avg_val_descent'].setText(self.parent.translator.translate('avg_val', state=self.state_down_key, value=f'{sum(self.cycle_durations[1::2]) / len(self.cycle_durations[1::2]):.2f}'))
-            self.labels['last_val_descent'].setText(self.parent.translator.translate('last_val', state=self.state_down_key, value=f'{self.cycle_durations[1::2][-1]:.2f}'))
-
-        self.canvas.draw()
+        Demande la mise à jour du graphique et des labels, au plus une fois par redraw_interval.
+        """
+        if not self.redraw_timer.isActive():
+            self.redraw_timer.start(self.redraw_interval)
+
+    def refresh_graph(self):
+        """
+        Met à jour les courbes avec set_data et les labels depuis les statistiques. Le graphique n'est entièrement
+        redessiné que si les limites des axes doivent changer ; sinon seules les courbes sont redessinées (blitting).
+        """
+        states = {'ascent': self.state_up_key, 'descent': self.state_down_key}
+        for key, ax in self.axes.items():
+            stats = self.stats[key]
+            self.lines[key].set_data(self.plot_x[key][:self.plot_count[key]], self.plot_y[key][:self.plot_count[key]])
+
+            # the limits grow by steps so that a full redraw stays rare
+            x_max = ax.get_xlim()[1]
+            if stats.count > x_max:
+                ax.set_xlim(0, max(10, 2 * stats.count))
+                self.graph_needs_full_draw = True
+            y_max = max(stats.max, self.edits['max'].value())
+            if y_max > ax.get_ylim()[1]:
+                ax.set_ylim(0, y_max * 1.5)
+                self.graph_needs_full_draw = True
+
+            if stats.count:
+                for label, value in [('min_val', stats.min), ('max_val', stats.max), ('avg_val', stats.mean()), ('last_val', stats.last)]:
+                    self.labels[f'{label}_{key}'].setText(self.parent.translator.translate(label, state=states[key], value=f'{value:.2f}'))
+
+        if self.graph_needs_full_draw or self.background is None:
+            self.graph_needs_full_draw = False
+            self.canvas.draw()  # on_draw caches the new background
+        else:
+            self.canvas.restore_region(self.background)
+            for key, ax in self.axes.items():
+                ax.draw_artist(self.lines[key])
+            self.canvas.blit(self.figure.bbox)
+
+    def on_draw(self, event):
+        """
+        Après un dessin complet (redimensionnement, zoom, changement d'échelle), garde le fond et redessine les courbes.
+        """
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for key, ax in self.axes.items():
+            ax.draw_artist(self.lines[key])
+
+    def update_limit_lines(self):
+        """
+        Déplace les lignes des limites max et min.
+        """
+        for line, label in self.limit_lines:
+            line.set_ydata([self.edits[label].value()] * 2)
+        self.graph_needs_full_draw = True
+        self.update_graph_and_labels()
 
     def finish_cycles(self):
         """
@@ -375,12 +558,13 @@ class CycleGui(QMainWindow):
         """
         # If the requested number of cycles is reached, stop everything
         self.start_button.setText(self.parent.translator.translate('start'))
-        self.save_to_csv(self.cycle_durations)
+        self.close_csv()
         self.deactivate_component()  # deactivate component
         self.change_widget_state(True)
         self.edits['status'].setText('finished')  # update status to show that the cycles are finished
         Logger.info("Cycles finished and saved to CSV file")
-        self.sensor_check_timer.stop()  # stop checking the sensor
+        self.is_waiting_sensor = False  # stop waiting for the sensor
+        self.unsubscribe_sensor()
         self.timer.stop()  # stop the 15-second timer
 
     def activate_component(self):
@@ -396,25 +580,22 @@ class CycleGui(QMainWindow):
         self.parent.update_DO(False)
 
 
-    def is_sensor_reached(self):
+    def is_sensor_reached(self, value):
         """
         Vérifie si le capteur a été atteint.
 
+        Args:
+            value: Valeur du port des capteurs, ou None si elle n'est pas encore connue.
+
         Returns:
             bool: True si le capteur est atteint, False sinon.
         """
-        if self.parent.serial_reader.busy == False:
-
-            self.parent.serial_reader.busy = True # tell to serial_reader that it will be busy for some time
-            self.parent.serial_reader.send_data(1,self.parent.cmd.Port)
-            data = self.parent.serial_reader.wait_and_read_data(1)
-            self.parent.serial_reader.busy = False # free the serial reader
-            if len(self.component_state) == 0 or self.component_state[-1] == 1:  # if the component is up
-                return not (data[0] & self.parent.cmd.Down)
-            else:  # if the component is down
-                return not (data[0] & self.parent.cmd.Up)
-        else:
+        if value is None:
             return False
+        if self.component_state is None or self.component_state == 1:  # if the component is up
+            return not (value & self.parent.cmd.Down)
+        else:  # if the component is down
+            return not (value & self.parent.cmd.Up)
 
         
     def update_csv_file(self):
@@ -432,28 +613,89 @@ class CycleGui(QMainWindow):
             self.edits['CSV File'].clear()
             self.start_button.setEnabled(False)
 
-    def save_to_csv(self, cycle_durations):
+    def csv_path(self):
+        """
+        Renvoie le chemin du fichier CSV et crée son dossier s'il n'existe pas.
+        """
+        filename = self.edits['CSV File'].text()
+        os.makedirs(f"data/{self.parent.key}", exist_ok=True)
+        return f"data/{self.parent.key}/{filename}"
+
+    def open_csv(self, resume=False):
         """
-        Enregistre les durées des cycles dans un fichier CSV.
+        Ouvre le fichier CSV dans lequel chaque cycle est écrit dès qu'il est terminé.
+
+        Les durées sont mesurées entre l'envoi de la commande et le front du capteur (horodaté par le firmware) :
+        c'est la durée du mouvement, indépendante de tempo_high et tempo_low. Les fichiers plus anciens mesuraient
+        la durée à partir de la fin de la temporisation qui suit la commande.
 
         Args:
-            cycle_durations: Liste des durées des cycles.
+            resume: True pour continuer un fichier existant : ses cycles sont rechargés dans le graphique
+                et les statistiques, et la numérotation reprend après le dernier cycle.
+        """
+        path = self.csv_path()
+        if resume and os.path.exists(path):
+            self.load_cycles(path)
+            self.csv_file = open(path, 'a', newline='')
+            self.csv_writer = csv.writer(self.csv_file, delimiter=';')
+            Logger.info(f"Resuming {path} after cycle {self.cycle_count}")
+        else:
+            self.csv_file = open(path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file, delimiter=';')
+            self.csv_writer.writerow(['Cycle Number', 'Ascent Time', 'Descent Time'])
+            self.csv_file.flush()
+
+    def load_cycles(self, path):
         """
-        filename = self.edits['CSV File'].text()
-        path = f"data/{self.parent.key}/{filename}"
+        Relit les cycles d'un fichier CSV existant, ligne par ligne. Une dernière ligne incomplète
+        (arrêt brutal pendant l'écriture) est supprimée du fichier.
 
-        #create data folder if it doesn't exist
-        os.makedirs("data",exist_ok= True)
-        os.makedirs(f"data/{self.parent.key}",exist_ok= True)
+        Args:
+            path: Chemin du fichier CSV.
+        """
+        with open(path, 'rb+') as file:
+            content_end = file.seek(0, os.SEEK_END)
+            if content_end > 0:
+                file.seek(content_end - 1)
+                if file.read(1) != b"\n":
+                    file.seek(0)
+                    file.truncate(file.read().rfind(b"\n") + 1)
+
+        with open(path, 'r', newline='') as file:
+            reader = csv.reader(file, delimiter=';')
+            next(reader, None)  # header
+            for row in reader:
+                try:
+                    number, ascent_time, descent_time = int(row[0]), float(row[1]), float(row[2])
+                except (ValueError, IndexError):
+                    continue
+                # same order as during the run: the first move of a cycle is saved in the 'Descent Time' column
+                self.add_graph_point('ascent', descent_time)
+                self.add_graph_point('descent', ascent_time)
+                self.cycle_count = number
+
+    def write_cycle(self, number, ascent_time, descent_time):
+        """
+        Ajoute un cycle terminé au fichier CSV et le force sur le disque : un arrêt brutal ne perd aucun cycle terminé.
 
+        Args:
+            number: Numéro du cycle.
+            ascent_time: Durée de montée en secondes.
+            descent_time: Durée de descente en secondes.
+        """
+        if self.csv_file is None:
+            return
+        self.csv_writer.writerow([number, round(ascent_time, 3), round(descent_time, 3)])
+        self.csv_file.flush()
+        os.fsync(self.csv_file.fileno())
 
-        with open(path, 'w', newline='') as file:
-            writer = csv.writer(file, delimiter=';')
-            writer.writerow(['Cycle Number', 'Ascent Time', 'Descent Time'])
-            ascent_times = cycle_durations[1::2]
-            descent_times = cycle_durations[::2]
-            for i in range(len(ascent_times)):
-                writer.writerow([i + 1, round(ascent_times[i],3), round(descent_times[i],3)])
+    def close_csv(self):
+        """
+        Ferme le fichier CSV.
+        """
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
 
     def closeEvent(self, event):
         """
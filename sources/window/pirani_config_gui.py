@@ -22,6 +22,8 @@ class NodeAddressWindow(QWidget):
         main_parent: l'objet principal (gui)
         address_spin: un QSpinBox pour entrer la nouvelle adresse
         confirm_button: un QPushButton pour confirmer la nouvelle adresse
+        scan_button: un QPushButton pour chercher les jauges présentes sur le bus
+        scan_result: un QLabel qui liste les jauges trouvées
     """
 
     def __init__(self, parent):
@@ -47,6 +49,11 @@ class NodeAddressWindow(QWidget):
         layout.addWidget(QLabel(self.main_parent.translator.translate("enter_new_address")))
         layout.addWidget(self.address_spin)
         layout.addWidget(self.confirm_button)
+        self.scan_button = QPushButton(self.main_parent.translator.translate("scan_bus"))
+        self.scan_button.clicked.connect(self.scan_bus)
+        self.scan_result = QLabel()
+        layout.addWidget(self.scan_button)
+        layout.addWidget(self.scan_result)
         self.setLayout(layout)
 
         self.setWindowIcon(self.main_parent.icon)
@@ -60,11 +67,38 @@ class NodeAddressWindow(QWidget):
         et ferme la fenêtre actuelle.
         """
         self.main_parent.config[self.key]["address"] = self.address_spin.value()
-        self.main_parent.RS485.pirani[self.key].update_address()
+        if self.parent.gauge is not None: # une jauge écartée au démarrage prend sa nouvelle adresse au prochain lancement
+            self.main_parent.serial_reader.run_async(self.parent.gauge.update_address)
         self.main_parent.config.save_config()
         self.parent.update_node_address_label()
         self.close()
 
+    def scan_bus(self):
+        """
+        Lance en arrière-plan la recherche des jauges présentes sur le bus RS485.
+        """
+        self.scan_button.setEnabled(False)
+        self.scan_result.setText(self.main_parent.translator.translate("scanning"))
+        self.main_parent.serial_reader.run_async(self.main_parent.RS485.scan, callback=self.scan_done)
+
+    def scan_done(self, future):
+        """
+        Ajoute les jauges trouvées au registre de la configuration et les affiche.
+
+        Args:
+            future: Future contenant le résultat de RS485.scan.
+        """
+        self.scan_button.setEnabled(True)
+        if future.exception() is not None:
+            self.scan_result.setText(self.main_parent.translator.translate("no_gauge_found"))
+            return
+        found = future.result()
+        self.main_parent.RS485.register(found)
+        lines = [self.main_parent.translator.translate("gauge_found", address=gauge["address"], sn=gauge["sn"], name=gauge["key"]) for gauge in found]
+        self.scan_result.setText("\n".join(lines) or self.main_parent.translator.translate("no_gauge_found"))
+        self.address_spin.setValue(self.main_parent.config[self.key]["address"])
+        self.parent.update_node_address_label()
+
         
 
 class PiraniConfigGui(QWidget):
@@ -78,6 +112,7 @@ class PiraniConfigGui(QWidget):
     Attributes:
         parent: Le widget parent.
         key: La clé pour la configuration de la jauge.
+        gauge: La jauge du registre RS485, ou None si elle a été écartée au démarrage (adresse invalide ou déjà utilisée).
         node_address_label: QLabel pour afficher l'adresse du nœud.
         node_address_button: QPushButton pour définir l'adresse du nœud.
         setpoint_high_spin: QDoubleSpinBox pour définir le point haut.
@@ -91,7 +126,7 @@ class PiraniConfigGui(QWidget):
         status_bits_button: QPushButton pour afficher les bits d'état.
         status_bits_menu: QMenu pour afficher les bits d'état.
         sn_label: QLabel pour afficher le numéro de série.
-        sn_value: QLabel pour afficher la valeur du numéro de série.
+        sn_value: QLabel pour afficher la valeur du numéro de série, lue en arrière-plan.
         confirm_button: QPushButton pour confirmer la configuration.
         current_unit: L'unité de pression actuelle.
         conversion_factor: Le facteur de conversion actuel.
@@ -106,6 +141,7 @@ class PiraniConfigGui(QWidget):
         """
         self.parent = parent
         self.key = key
+        self.gauge = self.parent.RS485.pirani.get(self.key)
         super(PiraniConfigGui, self).__init__(None)
 
         self.setWindowTitle(self.parent.translator.translate("pirani_config"))
@@ -185,7 +221,11 @@ class PiraniConfigGui(QWidget):
 
         # Gauge SN
         self.sn_label = QLabel(self.parent.translator.translate("gauge_sn"))
-        self.sn_value = QLabel(self.parent.RS485.pirani[self.key].read_SN())  # replace "SN Value" with the actual initial value
+        self.sn_value = QLabel("...")  # filled once the SN has been read, without blocking the window
+        if self.gauge is not None:
+            self.parent.serial_reader.run_async(self.gauge.read_SN, callback=self.update_SN)
+        else:
+            self.sn_value.setText("?")
         layout.addWidget(self.sn_label, 7, 0)
         layout.addWidget(self.sn_value, 7, 1)  # add this to the layout
 
@@ -195,6 +235,10 @@ class PiraniConfigGui(QWidget):
         self.confirm_button.clicked.connect(self.confirm)
         layout.addWidget(self.confirm_button, 8, 0, 1, 2)
 
+        # gauge rejected by RS485 : only its address can be changed
+        self.calibrate_button.setEnabled(self.gauge is not None)
+        self.confirm_button.setEnabled(self.gauge is not None)
+
         layout.setColumnMinimumWidth(1,180)
         self.setLayout(layout)
         self.setFixedSize(self.sizeHint())  # Limit the window size to the size hint
@@ -257,11 +301,20 @@ class PiraniConfigGui(QWidget):
         config["setpoint_low"] = self.setpoint_low_spin.value()
         config["gas_type"] = self.gas_type_combo.currentText()
         config["pressure_unit"] = self.pressure_unit_combo.currentText()
-        self.parent.RS485.pirani[self.key].update_config()
+        self.parent.serial_reader.run_async(self.gauge.update_config)
         self.parent.config.save_config()
         self.close()
         self = None
 
+    def update_SN(self, future):
+        """
+        Affiche le numéro de série lu en arrière-plan.
+
+        Args:
+            future: Future contenant le numéro de série.
+        """
+        self.sn_value.setText(future.result() if future.exception() is None else "?")
+
     def update_units(self):
         """
         Met à jour les unités d'affichage en fonction de l'unité de pression sélectionnée.
@@ -350,4 +403,4 @@ class PiraniConfigGui(QWidget):
         """
         Lance la calibration de la jauge.
         """
-        self.parent.RS485.pirani[self.key].calibrate()
\ No newline at end of file
+        self.parent.serial_reader.run_async(self.gauge.calibrate)
\ No newline at end of file
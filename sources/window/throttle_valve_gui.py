@@ -5,6 +5,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 from internal.logger import Logger
+from internal.rs485 import PiraniSample
 
 import csv
 import os
@@ -49,11 +50,7 @@ class ThrottleValveThread(QThread):
 
 
     def set_position(self, value):
-        while self.serial_reader.busy == True:
-            self.sleep_while_running(1)
-        self.serial_reader.busy = True # tell to serial_reader that it will be busy for some time
         self.parent.set_position(value)
-        self.serial_reader.busy = False # free the serial reader
 
     def move_position_and_wait(self,position):
         self.set_position(position)
@@ -70,7 +67,9 @@ class ThrottleValveThread(QThread):
             self.msleep(100)
 
     def read_pressure(self):
-        return self.main_parent.custom_widgets["chamber_pressure"].get_value()
+        gauge = self.main_parent.RS485.pirani.get("chamber_pressure") # None si la jauge a été écartée par RS485
+        sample = gauge.get_sample() if gauge is not None else None # relue sur le bus si trop ancienne
+        return sample.pressure if sample is not None else PiraniSample.overrange
 
 
     def wait_pressure_or_time(self,pressure,time):
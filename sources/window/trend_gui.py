@@ -0,0 +1,178 @@
+from PyQt5.QtWidgets import QMainWindow, QLabel, QVBoxLayout, QHBoxLayout, QWidget, QCheckBox, QComboBox
+from PyQt5.QtCore import QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
+from matplotlib.figure import Figure
+import numpy as np
+import time
+
+from internal.ring_buffer import RingBuffer, min_max_decimate
+
+
+class TrendGui(QMainWindow):
+    """
+    Fenêtre de tendances : courbes des valeurs des widgets (get_value) sur les dernières heures.
+
+    Les valeurs sont échantillonnées en continu, même fenêtre fermée, dans des tampons circulaires de taille fixe.
+    Le graphique n'est redessiné que lorsque la fenêtre est visible, avec au plus deux points (min et max)
+    par pixel de largeur, quelle que soit la durée affichée.
+
+    Attributes:
+        channels: Dictionnaire clé du widget -> axe ("pressure" en échelle log, "value" en échelle linéaire).
+        times: Instants des échantillons (time.monotonic).
+        buffers: Dictionnaire clé du widget -> valeurs des échantillons.
+
+    Methods:
+        __init__(self, parent):
+            Constructeur de la classe TrendGui.
+
+        sample(self):
+            Ajoute la valeur actuelle de chaque voie aux tampons.
+
+        redraw(self):
+            Met à jour les courbes affichées.
+    """
+    channels = {
+        "chamber_pressure": "pressure",
+        "pump_pressure": "pressure",
+        "baratron1": "pressure",
+        "baratron2": "pressure",
+        "MFC1": "value",
+        "MFC2": "value",
+        "generator1": "value",
+        "generator2": "value",
+        "throttle_valve": "value",
+    }
+    spans = [("1 min", 60), ("10 min", 600), ("1 h", 3600), ("trend_all", None)]
+
+    sample_interval = 100 # ms
+    redraw_interval = 500 # ms
+    history = 4 * 3600 # s
+
+    def __init__(self, parent):
+        """
+        Constructeur de la classe TrendGui.
+
+        Args:
+            parent: Fenêtre principale (fournit custom_widgets et translator).
+        """
+        super().__init__()
+        self.parent = parent
+        self.translator = parent.translator
+
+        capacity = self.history * 1000 // self.sample_interval
+        self.times = RingBuffer(capacity)
+        self.buffers = {key: RingBuffer(capacity, np.float32) for key in self.channels}
+
+        self.checkboxes = {}
+        self.lines = {}
+        self.create_widgets()
+        self.create_graph()
+
+        self.sample_timer = QTimer()
+        self.sample_timer.timeout.connect(self.sample)
+        self.sample_timer.start(self.sample_interval)
+        self.redraw_timer = QTimer()
+        self.redraw_timer.timeout.connect(self.redraw)
+
+        self.setWindowTitle(self.translator.translate("trend"))
+        self.setWindowIcon(parent.icon)
+        self.resize(1000, 700)
+
+    def create_widgets(self):
+        """
+        Crée les cases à cocher des voies et le choix de la durée affichée.
+        """
+        self.widget = QWidget()
+        layout = QVBoxLayout(self.widget)
+
+        options = QHBoxLayout()
+        for key in self.channels:
+            self.checkboxes[key] = QCheckBox(key, self)
+            self.checkboxes[key].setChecked(key in ["chamber_pressure", "MFC1"])
+            self.checkboxes[key].stateChanged.connect(self.redraw)
+            options.addWidget(self.checkboxes[key])
+        options.addStretch()
+        options.addWidget(QLabel(self.translator.translate("time_span"), self))
+        self.span_combo = QComboBox(self)
+        for name, _ in self.spans:
+            self.span_combo.addItem(self.translator.translate(name))
+        self.span_combo.currentIndexChanged.connect(self.redraw)
+        options.addWidget(self.span_combo)
+        layout.addLayout(options)
+
+        self.main_layout = layout
+        self.setCentralWidget(self.widget)
+
+    def create_graph(self):
+        """
+        Crée les deux graphiques (pressions en échelle log, autres valeurs en échelle linéaire) et une courbe par voie.
+        """
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.axes = {"pressure": self.figure.add_subplot(211), "value": self.figure.add_subplot(212)}
+        self.axes["pressure"].set_yscale("log")
+        self.axes["value"].set_xlabel("s")
+        for key, axis in self.channels.items():
+            self.lines[key], = self.axes[axis].plot([], [], label=key)
+        for axis in self.axes.values():
+            axis.grid(True)
+        self.figure.subplots_adjust(hspace=0.3)
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.main_layout.addWidget(self.toolbar)
+        self.main_layout.addWidget(self.canvas)
+
+    def sample(self):
+        """
+        Ajoute la valeur actuelle de chaque voie aux tampons (nan si le widget n'a pas encore de valeur).
+        """
+        self.times.append(time.monotonic())
+        for key, buffer in self.buffers.items():
+            try:
+                value = float(self.parent.custom_widgets[key].get_value())
+            except Exception:
+                value = np.nan
+            buffer.append(value)
+
+    def redraw(self):
+        """
+        Met à jour les courbes affichées avec les échantillons de la durée choisie, décimés à la largeur du graphique.
+        """
+        if not self.isVisible() or len(self.times) == 0:
+            return
+        times = self.times.values()
+        span = self.spans[self.span_combo.currentIndex()][1]
+        start = 0 if span is None else np.searchsorted(times, times[-1] - span)
+        x = times[start:] - times[-1]
+        bins = max(1, self.canvas.width())
+
+        for key, line in self.lines.items():
+            visible = self.checkboxes[key].isChecked()
+            line.set_visible(visible)
+            if visible:
+                line.set_data(*min_max_decimate(x, self.buffers[key].values()[start:], bins))
+            else:
+                line.set_data([], [])
+        for axis in self.axes.values():
+            axis.relim(visible_only=True)
+            axis.autoscale_view()
+            handles = [line for line in axis.get_lines() if line.get_visible()]
+            if handles:
+                axis.legend(handles=handles, loc="upper left")
+            elif axis.get_legend() is not None:
+                axis.get_legend().remove()
+        self.canvas.draw_idle()
+
+    def showEvent(self, event):
+        """
+        Redessine à intervalle régulier tant que la fenêtre est affichée.
+        """
+        self.redraw_timer.start(self.redraw_interval)
+        super().showEvent(event)
+        self.redraw()
+
+    def closeEvent(self, event):
+        """
+        Arrête le rafraîchissement du graphique ; l'échantillonnage continue.
+        """
+        self.redraw_timer.stop()
+        event.accept()